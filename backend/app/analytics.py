@@ -0,0 +1,166 @@
+# ============================== #
+# CineMind Analytics             #
+# Vectorized catalogue charts    #
+# ============================== #
+
+# The analytics endpoints aggregate over a columnar copy of the movies table (one NumPy column per
+# field, plus the movie/genre pairs) instead of shipping whole movie pages to the browser.
+# The snapshot is loaded once, then kept current by re-reading only the movies listed in the
+# movie_changes table (filled by database triggers) since the last refresh.
+
+# === Imports === #
+# pandas is imported by the functions that build frames, so importing this module (and the app) stays fast
+import threading
+import numpy as np
+
+# === Settings === #
+# Columns copied from the movies table (release_date is turned into a numeric release year)
+MOVIE_COLUMNS = ['id', 'title', 'release_date', 'budget', 'revenue', 'popularity', 'vote_average', 'vote_count', 'runtime', 'original_language']
+SORT_COLUMNS = ('popularity', 'vote_average', 'vote_count', 'runtime', 'release_year', 'title')
+
+FINANCIAL_METRICS = ('budget', 'revenue', 'profit', 'roi')
+ROI_MIN_BUDGET = 100_000  # Tiny budgets turn ROI into noise (same cut-off as the financial chart)
+PERCENTILES = (10, 25, 50, 75, 90)
+DEFAULT_BINS = 20
+
+# === Snapshot === #
+def movie_frame(rows):
+    """DataFrame indexed by movie id from (MOVIE_COLUMNS) rows."""
+    import pandas as pd
+    frame = pd.DataFrame.from_records(rows, columns=MOVIE_COLUMNS)
+    frame['release_year'] = pd.to_numeric(frame['release_date'].str[:4], errors='coerce')
+    for column in ('budget', 'revenue', 'popularity', 'vote_average', 'vote_count', 'runtime'):
+        frame[column] = pd.to_numeric(frame[column], errors='coerce').astype('float64')
+    return frame.drop(columns='release_date').set_index('id')
+
+def genre_frame(rows):
+    import pandas as pd
+    return pd.DataFrame.from_records(rows, columns=['movie_id', 'genre_id']).astype('int64')
+
+class CatalogueSnapshot:
+    """Columnar copy of the catalogue, refreshed in place as movies change."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.movies = None  # Frames from movie_frame() and genre_frame(), set by load()
+        self.genres = None
+        self.genre_names = {}
+        self.version = None  # Catalogue version the snapshot reflects
+        self.sequence = None  # Last movie_changes sequence applied; None until loaded
+
+    @property
+    def loaded(self):
+        return self.sequence is not None
+
+    def load(self, movie_rows, genre_rows, genre_names, sequence):
+        """Replace the whole snapshot."""
+        self.movies = movie_frame(movie_rows)
+        self.genres = genre_frame(genre_rows)
+        self.genre_names = dict(genre_names)
+        self.sequence = sequence
+
+    def apply_changes(self, changed_ids, movie_rows, genre_rows, genre_names, sequence):
+        """Swap in the current rows of `changed_ids`; ids without a row were deleted."""
+        import pandas as pd
+        changed = pd.Index(changed_ids, dtype='int64')
+        movies = self.movies[~self.movies.index.isin(changed)]
+        genres = self.genres[~self.genres['movie_id'].isin(changed)]
+        self.movies = pd.concat([movies, movie_frame(movie_rows)]) if movie_rows else movies
+        self.genres = pd.concat([genres, genre_frame(genre_rows)], ignore_index=True) if genre_rows else genres
+        self.genre_names = dict(genre_names)
+        self.sequence = sequence
+
+    def select(self, genre_ids=(), language=None, sort_by='popularity', order='desc', limit=None):
+        """Movies matching the filters, optionally only the first `limit` in the given order."""
+        movies = self.movies
+        if language:
+            movies = movies[movies['original_language'] == language]
+        if genre_ids:
+            # Movies that have every requested genre
+            matches = self.genres[self.genres['genre_id'].isin(genre_ids)].groupby('movie_id')['genre_id'].nunique()
+            movies = movies[movies.index.isin(matches.index[matches == len(set(genre_ids))])]
+        if limit:
+            column = sort_by if sort_by in SORT_COLUMNS else 'popularity'
+            # NULLs last when descending, first when ascending (as SQLite orders them)
+            movies = movies.sort_values(column, ascending=order == 'asc', na_position='first' if order == 'asc' else 'last', kind='stable')
+            movies = movies.head(limit)
+        return movies
+
+# === Aggregates === #
+def genre_distribution(snapshot, movies):
+    """Movie count and average rating per genre, most common first."""
+    pairs = snapshot.genres[snapshot.genres['movie_id'].isin(movies.index)]
+    ratings = movies['vote_average'].where(movies['vote_average'] > 0)  # Unrated movies do not pull the average down
+    pairs = pairs.assign(vote_average=ratings.reindex(pairs['movie_id']).to_numpy())
+
+    grouped = pairs.groupby('genre_id').agg(movies=('movie_id', 'size'), rating=('vote_average', 'mean'))
+    grouped = grouped.sort_values('movies', ascending=False, kind='stable')
+    return [
+        {
+            'id': int(genre_id),
+            'name': snapshot.genre_names.get(genre_id),
+            'count': int(count),
+            'average_rating': None if np.isnan(rating) else round(float(rating), 2),
+        }
+        for genre_id, count, rating in zip(grouped.index, grouped['movies'], grouped['rating'])
+    ]
+
+def year_distribution(movies, group='year'):
+    """Movies per release year (or per decade), oldest first."""
+    years = movies['release_year'].dropna().astype('int64')
+    if group == 'decade':
+        years = years // 10 * 10
+    counts = np.unique(years.to_numpy(), return_counts=True)
+    return [{'year': int(year), 'count': int(count)} for year, count in zip(*counts)]
+
+def financial_values(movies, metric):
+    """The metric for every movie where it is meaningful (known budget and/or revenue)."""
+    budget, revenue = movies['budget'], movies['revenue']
+    if metric == 'budget':
+        return budget[budget > 0]
+    if metric == 'revenue':
+        return revenue[revenue > 0]
+    if metric == 'profit':
+        known = (budget > 0) & (revenue > 0)
+        return (revenue - budget)[known]
+    known = (budget > ROI_MIN_BUDGET) & (revenue > 0)
+    return ((revenue - budget) / budget * 100)[known]
+
+def histogram(values, bins):
+    """Bin edges and counts; log-spaced for money amounts, which span several orders of magnitude."""
+    low, high = values.min(), values.max()
+    if low > 0 and high > low:
+        edges = np.geomspace(low, high, bins + 1)
+    else:
+        edges = np.linspace(low, high, bins + 1)
+    counts, edges = np.histogram(values, bins=edges)
+    return {'edges': [round(float(edge), 2) for edge in edges], 'counts': counts.tolist()}
+
+def financial_summary(movies, bins=DEFAULT_BINS):
+    """Totals, percentiles and a histogram of budget, revenue, profit and ROI (%)."""
+    summary = {}
+    for metric in FINANCIAL_METRICS:
+        values = financial_values(movies, metric).to_numpy()
+        if not len(values):
+            summary[metric] = {'count': 0}
+            continue
+        percentiles = np.percentile(values, PERCENTILES)
+        summary[metric] = {
+            'count': int(len(values)),
+            'total': round(float(values.sum()), 2),
+            'mean': round(float(values.mean()), 2),
+            'min': round(float(values.min()), 2),
+            'max': round(float(values.max()), 2),
+            'percentiles': {f'p{p}': round(float(value), 2) for p, value in zip(PERCENTILES, percentiles)},
+            'histogram': histogram(values, bins),
+        }
+    return summary
+
+def top_financial(movies, metric, limit):
+    """The `limit` movies with the highest value of `metric`."""
+    values = financial_values(movies, metric).nlargest(limit)
+    titles = movies['title'].reindex(values.index)
+    return [
+        {'id': int(movie_id), 'title': titles[movie_id], 'value': round(float(value), 2)}
+        for movie_id, value in values.items()
+    ]
@@ -4,15 +4,39 @@
 # ============================== #
 
 # === Imports === #
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, g, has_request_context, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.sql.expression import func
-from sqlalchemy import func
+from sqlalchemy import func, case, literal, null
+from sqlalchemy import cast as sql_cast  # `cast` names the movie cast throughout this file
 from flask_cors import CORS
 import os
-from google import genai  # Import the Gemini AI library
 from dotenv import load_dotenv
 from pathlib import Path
+import search_index  # SQLite FTS5 movie search
+import autocomplete  # In-memory title autocomplete
+import sentiment  # Gemini sentiment prompt and summary cache
+import http_cache  # ETags and rendered response cache
+import keyset  # Cursor pagination
+import instrumentation  # Per-request timings and Prometheus metrics
+import analytics  # Vectorized aggregates for the analytics charts
+import columnar  # Memory-mapped snapshot answering /results filters
+import similarity  # Content-based similar movies
+import sampling  # O(k) random movies for /explore
+import facet_index  # Inverted index of genres, keywords, cast, countries and languages
+import review_store  # Compressed review text
+from datetime import datetime, timezone
+import click
+import functools
+import hashlib
+import json
+import tempfile
+import threading
+import time
+from sqlalchemy.exc import OperationalError
+from sqlalchemy import event
+from contextlib import nullcontext
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 # === App Setup === #
 app = Flask(__name__)
@@ -23,12 +47,48 @@ basedir = os.path.abspath(os.path.dirname(__file__)) # Path to existing cinemind
 #db_path = os.path.join(os.path.dirname(basedir), 'models', 'cinemind.db')
 db_path = os.path.join(os.path.dirname(basedir), '..', 'migration_project', 'cinema_migrations.db')
 
-app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', f'sqlite:///{db_path}')  # DATABASE_URL overrides, e.g. for benchmarks
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Connections kept open per process; a threaded server wants one per thread (gunicorn.conf.py sets it)
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_size': int(os.getenv('DB_POOL_SIZE', '5'))}
+# The few writes made while serving (stored documents, sentiment summaries) go through this bind when
+# API connections are read-only; one connection, since SQLite takes one writer at a time anyway
+app.config['SQLALCHEMY_BINDS'] = {'writer': {'url': app.config['SQLALCHEMY_DATABASE_URI'], 'pool_size': 1, 'max_overflow': 0}}
+
+# SQLite settings applied to every new connection (see configure_connection)
+app.config['SQLITE_MMAP_SIZE'] = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))  # Bytes of the file read through mmap
+app.config['SQLITE_CACHE_SIZE'] = int(os.getenv('SQLITE_CACHE_SIZE', 64 * 1024))  # Page cache per connection, in KiB
+app.config['SQLITE_READ_ONLY'] = os.getenv('SQLITE_READ_ONLY', '0') != '0'  # create_app() turns it on by default
+
 # Initialize the database connection
 db = SQLAlchemy(app)
 
+def configure_connection(dbapi_connection, read_only):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA mmap_size = {app.config['SQLITE_MMAP_SIZE']}")
+    cursor.execute(f"PRAGMA cache_size = -{app.config['SQLITE_CACHE_SIZE']}")  # Negative = KiB rather than pages
+    if read_only and app.config['SQLITE_READ_ONLY']:
+        cursor.execute("PRAGMA query_only = ON")
+    cursor.close()
+
+with app.app_context():
+    if db.engine.dialect.name == 'sqlite':
+        event.listen(db.engine, 'connect', lambda dbapi_connection, _: configure_connection(dbapi_connection, read_only=True))
+        event.listen(db.engines['writer'], 'connect', lambda dbapi_connection, _: configure_connection(dbapi_connection, read_only=False))
+
+def execute_write(statement):
+    """Execute and commit a write made while serving requests.
+
+    API connections are read-only under create_app(), so the write then goes through the writer bind.
+    """
+    if app.config['SQLITE_READ_ONLY']:
+        with db.engines['writer'].begin() as connection:
+            connection.execute(statement)
+    else:
+        db.session.execute(statement)
+        db.session.commit()
+
 # === Environment Variable Loader === #
 def load_environment():
     """Load environment variables from multiple possible locations"""
@@ -55,13 +115,29 @@ def load_environment():
         print(f"- {path.absolute()}")
     return False
 
-# Ensure environment variables are loaded
-if not load_environment():
-    raise EnvironmentError("Failed to load GEMINI_API_KEY from .env file")
-
-# Now use the API key
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-client = genai.Client(api_key=GEMINI_API_KEY)
+# === Gemini Client === #
+# Created on the first sentiment request rather than at import, so the app starts without probing for
+# .env files or loading the Gemini library. Without an API key the app runs in degraded mode: every
+# endpoint works, and /movies/<id>/sentiment serves stored summaries but cannot generate new ones.
+app.config['GEMINI_API_KEY'] = os.getenv("GEMINI_API_KEY")  # None: looked up in the .env files on first use
+
+_gemini_client = None
+_gemini_checked = False
+_gemini_lock = threading.Lock()
+
+def gemini_client():
+    """The Gemini client, created on first use; None when no API key is configured."""
+    global _gemini_client, _gemini_checked
+    with _gemini_lock:
+        if not _gemini_checked:
+            _gemini_checked = True
+            api_key = app.config['GEMINI_API_KEY']
+            if not api_key and load_environment():
+                api_key = os.getenv("GEMINI_API_KEY")
+            if api_key:
+                from google import genai  # Import the Gemini AI library
+                _gemini_client = genai.Client(api_key=api_key)
+        return _gemini_client
 
 # === Models === #
 # Each model maps to a table in the SQLite database
@@ -104,10 +180,15 @@ class Movie(db.Model):
     poster_url = db.Column(db.Text)
     backdrop_url = db.Column(db.Text)
     video_url = db.Column(db.Text)
-    reviews = db.Column(db.Text)
     keyposter_url = db.Column(db.Text)
     keyvideo_url = db.Column(db.Text)
 
+class MovieReview(db.Model):
+    __tablename__ = 'movie_reviews'
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), primary_key=True)  # Only movies with review text have a row
+    body = db.Column(db.LargeBinary, nullable=False)  # The reviews text, compressed by review_store
+    reviews_hash = db.Column(db.String(64), nullable=False)  # sentiment.reviews_hash of the text
+
 # === Join Tables === #
 class MovieGenre(db.Model):
     __tablename__ = 'movie_genre'
@@ -152,271 +233,1045 @@ class MovieCast(db.Model):
     actor_id = db.Column(db.Integer, db.ForeignKey('cast.actor_id'), primary_key=True)
     character_id = db.Column(db.Integer, db.ForeignKey('characters.character_id'), primary_key=True)
 
+# === Cached Data === #
+class SentimentSummary(db.Model):
+    __tablename__ = 'sentiment_summaries'
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), primary_key=True)
+    reviews_hash = db.Column(db.String(64), nullable=False)  # MovieReview.reviews_hash the summary was made from
+    prompt_version = db.Column(db.String(64), nullable=False)  # sentiment.PROMPT_VERSION at generation time
+    summary = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime)
+
+class MovieDocument(db.Model):
+    __tablename__ = 'movie_documents'
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), primary_key=True)
+    shape = db.Column(db.String(20), primary_key=True)  # One of DOCUMENT_SHAPES
+    body = db.Column(db.Text, nullable=False)  # The movie serialized as JSON in that shape
+    built_at = db.Column(db.DateTime)
+
+class CatalogueVersion(db.Model):
+    __tablename__ = 'catalogue_version'
+    id = db.Column(db.Integer, primary_key=True)  # Single row, id 1
+    version = db.Column(db.Integer, nullable=False)  # Bumped by triggers on every catalogue write
+    updated_at = db.Column(db.DateTime)
+
+class MovieChange(db.Model):
+    __tablename__ = 'movie_changes'
+    movie_id = db.Column(db.Integer, primary_key=True)  # No foreign key: deleted movies stay listed
+    sequence = db.Column(db.Integer, nullable=False)  # Increases with every change, filled by triggers
+
+class SimilarMovie(db.Model):
+    __tablename__ = 'similar_movies'
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True)  # 0 = most similar
+    similar_id = db.Column(db.Integer, db.ForeignKey('movies.id'), nullable=False)
+    score = db.Column(db.Float, nullable=False)  # Cosine similarity of the two movies' feature vectors
+
+class SimilarityBuild(db.Model):
+    __tablename__ = 'similarity_builds'
+    id = db.Column(db.Integer, primary_key=True)  # Single row, id 1
+    sequence = db.Column(db.Integer, nullable=False)  # Last movie_changes sequence included in similar_movies
+    movies = db.Column(db.Integer, nullable=False)
+    built_at = db.Column(db.DateTime)
+
+# === Relationship Loaders === #
+# Fetch join-table data for a whole batch of movies with one query per relation,
+# so the number of queries stays the same no matter how many movies or cast members there are
+RELATION_CHUNK_SIZE = 500  # Keep IN (...) lists well under SQLite's bound parameter limit
+
+# relation name -> (join table model, join table foreign key, lookup table key, lookup table name column)
+NAME_RELATIONS = {
+    'genres': (MovieGenre, MovieGenre.genre_id, Genres.genre_id, Genres.genre_name),
+    'keywords': (MovieKeywords, MovieKeywords.keyword_id, Keywords.keyword_id, Keywords.keyword_name),
+    'production_countries': (MovieProductionCountries, MovieProductionCountries.country_id, ProductionCountries.country_id, ProductionCountries.country_name),
+    'spoken_languages': (MovieSpokenLanguages, MovieSpokenLanguages.language_id, SpokenLanguages.language_id, SpokenLanguages.language_name),
+}
+
+def chunked(values, size=RELATION_CHUNK_SIZE):
+    """Split a list into consecutive chunks of at most `size` items."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def load_related_names(relation, movie_ids):
+    """Return {movie_id: [names]} for one of the NAME_RELATIONS."""
+    join_model, join_key, lookup_key, name_column = NAME_RELATIONS[relation]
+    names = {movie_id: [] for movie_id in movie_ids}
+
+    for chunk in chunked(list(names)):
+        rows = (db.session.query(join_model.movie_id, name_column)
+                .join(lookup_key.class_, lookup_key == join_key)
+                .filter(join_model.movie_id.in_(chunk))
+                .order_by(join_model.movie_id, join_key)
+                .all())
+        for movie_id, name in rows:
+            names[movie_id].append(name)
+
+    return names
+
+def load_cast(movie_ids):
+    """Return {movie_id: [(Cast, character_name)]}, most popular actors first."""
+    cast = {movie_id: [] for movie_id in movie_ids}
+    seen = set()
+
+    for chunk in chunked(list(cast)):
+        rows = (db.session.query(MovieCast.movie_id, Cast, Characters.name)
+                .join(Cast, Cast.actor_id == MovieCast.actor_id)
+                .outerjoin(Characters, Characters.character_id == MovieCast.character_id)
+                .filter(MovieCast.movie_id.in_(chunk))
+                .order_by(Cast.popularity.desc().nullslast(), MovieCast.movie_id, MovieCast.character_id)
+                .all())
+        for movie_id, actor, character_name in rows:
+            # An actor can be linked to several characters in one movie; keep the first one
+            if (movie_id, actor.actor_id) in seen:
+                continue
+            seen.add((movie_id, actor.actor_id))
+            cast[movie_id].append((actor, character_name))
+
+    return cast
+
+def load_reviews(movie_ids):
+    """Return {movie_id: reviews text}, decompressed; movies without reviews are left out."""
+    reviews = {}
+    for chunk in chunked(list(movie_ids)):
+        rows = MovieReview.query.with_entities(MovieReview.movie_id, MovieReview.body).filter(MovieReview.movie_id.in_(chunk))
+        reviews.update((movie_id, review_store.decompress(body)) for movie_id, body in rows)
+    return reviews
+
+def load_movie_relations(movie_ids, relations):
+    """Batch-load the requested relations ('cast', 'reviews' or any of NAME_RELATIONS) for a list of movie IDs.
+
+    Returns {relation: {movie_id: [...]}} ({movie_id: text} for reviews).
+    """
+    loaded = {}
+    for relation in relations:
+        if relation == 'cast':
+            loaded[relation] = load_cast(movie_ids)
+        elif relation == 'reviews':
+            loaded[relation] = load_reviews(movie_ids)
+        else:
+            loaded[relation] = load_related_names(relation, movie_ids)
+    return loaded
+
+# === Title Autocomplete === #
+# In-memory prefix index used by /movies/suggest, so typing in the search bar does not hit SQLite.
+# Built by the first suggest request, or in the background at startup under create_app()
+title_autocomplete = autocomplete.TitleAutocomplete()
+AUTOCOMPLETE_REFRESH_SECONDS = 60  # How often suggest requests check the movies table for changes
+
+_autocomplete_lock = threading.Lock()
+_autocomplete_checked_at = 0.0
+_autocomplete_fingerprint = None
+
+def autocomplete_rows(movie_ids=None):
+    query = Movie.query.with_entities(Movie.id, Movie.title, Movie.popularity)
+    if movie_ids is None:
+        return query.all()
+    return [row for chunk in chunked(movie_ids) for row in query.filter(Movie.id.in_(chunk)).all()]
+
+def sync_title_autocomplete(force=False):
+    """Bring the title index up to date with the movies table.
+
+    The latest movie_changes sequence (stamped by triggers on every insert, update and delete of a
+    movie) is compared at most every AUTOCOMPLETE_REFRESH_SECONDS. When it moved on, only the movies
+    changed since the last sync are re-read: the ones still present are added or replaced, the
+    others removed. Without the change log (not migrated yet), a fingerprint of the movies table is
+    compared instead and any change rebuilds the whole index.
+    """
+    global _autocomplete_checked_at, _autocomplete_fingerprint
+
+    if not force and time.monotonic() - _autocomplete_checked_at < AUTOCOMPLETE_REFRESH_SECONDS:
+        return
+    if not _autocomplete_lock.acquire(blocking=force):
+        return  # Another request is already syncing
+
+    try:
+        _autocomplete_checked_at = time.monotonic()
+        try:
+            fingerprint = ('sequence', db.session.query(func.coalesce(func.max(MovieChange.sequence), 0)).scalar())
+        except OperationalError:
+            db.session.rollback()  # Change log not migrated yet
+            fingerprint = ('table', *db.session.query(func.count(Movie.id), func.max(Movie.id), func.total(Movie.popularity),
+                                                      func.total(func.length(Movie.title))).one())
+        if fingerprint == _autocomplete_fingerprint:
+            return
+
+        changed_ids = None
+        if _autocomplete_fingerprint and _autocomplete_fingerprint[0] == fingerprint[0] == 'sequence':
+            changed_ids = [row.movie_id for row in MovieChange.query.with_entities(MovieChange.movie_id)
+                           .filter(MovieChange.sequence > _autocomplete_fingerprint[1])]
+
+        # Rebuilding is cheaper than patching when a large part of the catalogue changed
+        if changed_ids is None or len(changed_ids) > len(title_autocomplete) // 2:
+            title_autocomplete.build(autocomplete_rows())
+        else:
+            rows = autocomplete_rows(changed_ids)
+            title_autocomplete.remove(set(changed_ids) - {row.id for row in rows})
+            title_autocomplete.add(rows)
+
+        _autocomplete_fingerprint = fingerprint
+    finally:
+        _autocomplete_lock.release()
+
+# === Movie Documents === #
+# The JSON each endpoint returns for a movie is serialized once and stored in movie_documents.
+# Endpoints only query the ids they need and splice the stored JSON into the response.
+# Database triggers delete a movie's documents whenever its data changes; missing documents
+# are built on the next read (and all of them by `flask build-documents`).
+
+def movie_card(movie, relations):
+    """Card used by the /movies list."""
+    return {
+        'id': movie.id,
+        'title': movie.title,
+        'vote_average': movie.vote_average,
+        'release_date': movie.release_date,
+        'original_language': movie.original_language,
+        'runtime': movie.runtime,
+        'popularity': movie.popularity,
+        'homepage': movie.homepage,
+        'status': movie.status,
+        'poster_url': movie.poster_url,
+        'backdrop_url': movie.backdrop_url,
+        'video_url': movie.video_url,
+        'production_countries': relations['production_countries'][movie.id],
+        'spoken_languages': relations['spoken_languages'][movie.id],
+        'keyposter_url': movie.keyposter_url,
+        'keyvideo_url': movie.keyvideo_url,
+    }
+
+def result_card(movie, relations):
+    """Card used by the /results movie grid."""
+    return {
+        'id': movie.id,
+        'title': movie.title,
+        'vote_average': movie.vote_average,
+        'release_date': movie.release_date,
+        'original_language': movie.original_language,
+        'runtime': movie.runtime,
+        'popularity': movie.popularity,
+        'homepage': movie.homepage,
+        'status': movie.status,
+        'poster_url': movie.poster_url,
+        'backdrop_url': movie.backdrop_url,
+        'video_url': movie.video_url,
+        'keyposter_url': movie.keyposter_url,
+        'keyvideo_url': movie.keyvideo_url,
+        'genres': relations['genres'][movie.id],
+        'budget': movie.budget,
+        'revenue': movie.revenue,
+    }
+
+def featured_card(movie, relations):
+    """Card used by the homepage hero (/featured)."""
+    return {
+        'id': movie.id,
+        'title': movie.title,
+        'vote_average': movie.vote_average,
+        'release_date': movie.release_date,
+        'overview': movie.overview,
+        'original_language': movie.original_language,
+        'runtime': movie.runtime,
+        'popularity': movie.popularity,
+        'homepage': movie.homepage,
+        'video_url': movie.video_url,
+        'keyvideo_url': movie.keyvideo_url,
+        'genres': relations['genres'][movie.id],
+    }
+
+def poster_card(movie, relations):
+    """Small poster card used by the homepage sliders (/popular, /explore)."""
+    return {
+        'id': movie.id,
+        'title': movie.title,
+        'release_date': movie.release_date,
+        'vote_average': movie.vote_average,
+        'poster_url': movie.poster_url,
+        'keyposter_url': movie.keyposter_url,
+    }
+
+def movie_detail(movie, relations):
+    """Full movie page (/movies/<id>)."""
+    cast_members = relations['cast'][movie.id]
+
+    # Create detailed cast information incl. profile images and character names
+    cast_details = []
+    for cast, character_name in cast_members:
+        cast_details.append({
+            'id': cast.actor_id,
+            'name': cast.name,
+            'character': character_name,
+            'gender': cast.gender,
+            'popularity': cast.popularity,
+            'profile_path': cast.profile_path,
+            'biography': (cast.biography[:150] + '...') if cast.biography else None
+        })
+
+    # Simple cast names list (for backward compatibility)
+    cast_names = [cast.name for cast, _ in cast_members]
+
+    return {
+        'id': movie.id,
+        'title': movie.title,
+        'overview': movie.overview,
+        'release_date': movie.release_date,
+        'original_title': movie.original_title,
+        'genres': relations['genres'][movie.id],
+        'keywords': relations['keywords'][movie.id],
+        'cast': cast_names,
+        'cast_details': cast_details,
+        'budget': movie.budget,
+        'revenue': movie.revenue,
+        'runtime': movie.runtime,
+        'status': movie.status,
+        'tagline': movie.tagline,
+        'popularity': movie.popularity,
+        'vote_average': movie.vote_average,
+        'vote_count': movie.vote_count,
+        'original_language': movie.original_language,
+        'homepage': movie.homepage,
+        'production_countries': relations['production_countries'][movie.id],
+        'spoken_languages': relations['spoken_languages'][movie.id],
+        'poster_url': movie.poster_url,
+        'backdrop_url': movie.backdrop_url,
+        'video_url': movie.video_url,
+        'reviews': relations['reviews'].get(movie.id),
+        'keyposter_url': movie.keyposter_url,
+        'keyvideo_url': movie.keyvideo_url,
+    }
+
+# shape name -> (relations the shape needs, builder)
+DOCUMENT_SHAPES = {
+    'card': (('production_countries', 'spoken_languages'), movie_card),
+    'result': (('genres',), result_card),
+    'featured': (('genres',), featured_card),
+    'poster': ((), poster_card),
+    'detail': (('genres', 'keywords', 'cast', 'production_countries', 'spoken_languages', 'reviews'), movie_detail),
+}
+
+DOCUMENTS_PLACEHOLDER = '__movie_documents__'
+
+def build_documents(movies, shape):
+    """Serialize Movie objects in one shape; returns {movie_id: json}."""
+    relation_names, builder = DOCUMENT_SHAPES[shape]
+    relations = load_movie_relations([movie.id for movie in movies], relation_names)
+    return {movie.id: app.json.dumps(builder(movie, relations)) for movie in movies}
+
+def store_documents(shape, documents):
+    """Upsert built documents; skipped (with a warning) when the table is not migrated yet."""
+    if not documents:
+        return
+    built_at = datetime.now(timezone.utc)
+    rows = [{'movie_id': movie_id, 'shape': shape, 'body': body, 'built_at': built_at} for movie_id, body in documents.items()]
+    statement = sqlite_insert(MovieDocument).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[MovieDocument.movie_id, MovieDocument.shape],
+        set_={'body': statement.excluded.body, 'built_at': statement.excluded.built_at},
+    )
+    try:
+        execute_write(statement)
+    except OperationalError as e:
+        db.session.rollback()
+        print(f"⚠ Could not store {shape} documents: {e}")
+
+def get_documents(movie_ids, shape):
+    """Return the JSON documents of `movie_ids` in one shape, in the given order.
+
+    Stored documents are read in one query per chunk; missing ones are built and stored.
+    Ids without a movie are skipped.
+    """
+    documents = load_documents(movie_ids, shape)
+    return [documents[movie_id] for movie_id in movie_ids if movie_id in documents]
+
+def load_documents(movie_ids, shape):
+    """Like get_documents, as a movie id -> document dict."""
+    fields = requested_fields()
+    if fields is not None:
+        return project_documents(movie_ids, shape, fields)
+
+    documents = {}
+    try:
+        for chunk in chunked(list(movie_ids)):
+            rows = (MovieDocument.query.with_entities(MovieDocument.movie_id, MovieDocument.body)
+                    .filter(MovieDocument.shape == shape, MovieDocument.movie_id.in_(chunk)))
+            documents.update(rows)
+    except OperationalError:  # movie_documents table not migrated yet
+        db.session.rollback()
+
+    missing = [movie_id for movie_id in movie_ids if movie_id not in documents]
+    for chunk in chunked(missing):
+        built = build_documents(Movie.query.filter(Movie.id.in_(chunk)).all(), shape)
+        store_documents(shape, built)
+        documents.update(built)
+
+    return documents
+
+def json_response(body):
+    """Response for an already serialized JSON body."""
+    return app.response_class(f"{body}\n", mimetype=app.json.mimetype)
+
+def documents_response(documents, envelope=None, key='movies'):
+    """JSON response made from stored documents: a plain list, or the list placed under `key` of `envelope`."""
+    items = '[' + ','.join(documents) + ']'
+    if envelope is None:
+        body = items
+    else:
+        body = app.json.dumps({**envelope, key: DOCUMENTS_PLACEHOLDER}).replace(f'"{DOCUMENTS_PLACEHOLDER}"', items, 1)
+    return json_response(body)
+
+@app.cli.command('build-documents')
+@click.option('--shape', 'shapes', multiple=True, type=click.Choice(list(DOCUMENT_SHAPES)), help='Only build these shapes (default: all).')
+@click.option('--rebuild', is_flag=True, help='Rebuild every document, not just missing ones.')
+def build_documents_command(shapes, rebuild):
+    """Serialize every movie into the stored JSON documents used by the API."""
+    movie_ids = [row.id for row in Movie.query.with_entities(Movie.id).order_by(Movie.id)]
+
+    for shape in shapes or DOCUMENT_SHAPES:
+        built = 0
+        for chunk in chunked(movie_ids):
+            if not rebuild:
+                stored = {row.movie_id for row in MovieDocument.query.with_entities(MovieDocument.movie_id)
+                          .filter(MovieDocument.shape == shape, MovieDocument.movie_id.in_(chunk))}
+                chunk = [movie_id for movie_id in chunk if movie_id not in stored]
+            if not chunk:
+                continue
+            documents = build_documents(Movie.query.filter(Movie.id.in_(chunk)).all(), shape)
+            store_documents(shape, documents)
+            built += len(documents)
+        print(f"✓ {shape}: built {built} documents")
+
+# === Field Projection === #
+# Every movie endpoint accepts ?fields=title,poster_url,... to return only those keys of each movie
+# (the id is always included). Only the requested columns are selected and only the requested
+# relations loaded, so large unused columns and relations (e.g. reviews) are never read from disk or encoded.
+# Projected documents are built per request with the shape's own builder instead of read from movie_documents.
+
+MOVIE_COLUMNS = {column.name: column for column in Movie.__table__.columns}
+
+# Document keys filled from a relation rather than a movies column
+FIELD_RELATIONS = {
+    'genres': 'genres',
+    'keywords': 'keywords',
+    'production_countries': 'production_countries',
+    'spoken_languages': 'spoken_languages',
+    'cast': 'cast',
+    'cast_details': 'cast',
+    'reviews': 'reviews',
+}
+
+class PartialMovie:
+    """A row of selected movie columns that document builders can read like a Movie; other columns read as None."""
+
+    def __init__(self, row):
+        self.__dict__.update(row._mapping)
+
+    def __getattr__(self, name):
+        return None
+
+def requested_fields():
+    """Fields named by the request's ?fields= parameter, or None for whole documents."""
+    if not has_request_context() or not request.args.get('fields'):
+        return None
+    return {'id'} | {field.strip() for field in request.args['fields'].split(',') if field.strip()}
+
+def project_documents(movie_ids, shape, fields):
+    """Serialize only `fields` of each movie in one shape; returns {movie_id: json}."""
+    relation_names, builder = DOCUMENT_SHAPES[shape]
+    columns = [MOVIE_COLUMNS[field] for field in sorted(fields) if field in MOVIE_COLUMNS and field != 'id']
+    needed = [name for name in relation_names if any(FIELD_RELATIONS.get(field) == name for field in fields)]
+
+    documents = {}
+    for chunk in chunked(list(movie_ids)):
+        rows = db.session.query(Movie.id, *columns).filter(Movie.id.in_(chunk)).all()
+        found = [row.id for row in rows]
+        relations = load_movie_relations(found, needed)
+        relations.update({name: {movie_id: [] for movie_id in found} for name in relation_names if name not in needed})
+        for row in rows:
+            document = builder(PartialMovie(row), relations)
+            documents[row.id] = app.json.dumps({key: value for key, value in document.items() if key in fields})
+    return documents
+
+# === Instrumentation === #
+# Each request records its SQL queries, SQL time, JSON serialization time and Gemini time.
+# They are returned in a Server-Timing header, aggregated at /metrics (Prometheus format)
+# and, above SLOW_REQUEST_MS, printed to the slow-request log.
+
+app.config['SERVER_TIMING'] = os.getenv('SERVER_TIMING', '1') != '0'
+app.config['SLOW_REQUEST_MS'] = float(os.getenv('SLOW_REQUEST_MS', '0'))  # 0 = slow-request log off
+
+metrics = instrumentation.Metrics()
+
+def current_stats():
+    """RequestStats of the request being handled, or None outside requests (e.g. CLI commands)."""
+    return g.get('request_stats') if has_request_context() else None
+
+def timed(activity):
+    """Context manager adding the time of its block to `activity` in the current request's stats."""
+    stats = current_stats()
+    return stats.timed(activity) if stats else nullcontext()
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, timing serialization for the request stats."""
+
+    def dumps(self, obj, **kwargs):
+        with timed('json'):
+            return super().dumps(obj, **kwargs)
+
+app.json = TimedJSONProvider(app)
+
+# The start time lives on the statement's execution context, which is discarded with it even when the
+# statement fails and after_cursor_execute never runs
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - context._query_started
+    stats = current_stats()
+    if stats:
+        stats.add_query(statement, duration)
+
+with app.app_context():
+    for engine in db.engines.values():
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+
+@app.before_request
+def start_request_stats():
+    g.request_stats = instrumentation.RequestStats()
+
+@app.after_request
+def record_request_stats(response):
+    stats = current_stats()
+    if stats is None:
+        return response
+
+    total = stats.elapsed()
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    slow = bool(app.config['SLOW_REQUEST_MS']) and total * 1000 >= app.config['SLOW_REQUEST_MS']
+
+    if app.config['SERVER_TIMING']:
+        response.headers['Server-Timing'] = stats.server_timing(total)
+    metrics.record(endpoint, request.method, response.status_code, total, stats, slow)
+
+    if slow:
+        slowest_duration, slowest_statement = stats.slowest_statement
+        message = (f"⚠ Slow request: {request.method} {request.full_path.rstrip('?')} took {total * 1000:.1f} ms "
+                   f"({stats.queries} queries, {stats.timings['db'] * 1000:.1f} ms SQL)")
+        if slowest_statement:
+            message += f"; slowest query {slowest_duration * 1000:.1f} ms: {slowest_statement}"
+        print(message)
+    return response
+
+# Request metrics in the Prometheus text format
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# === Response Caching === #
+# Catalogue responses carry a strong ETag derived from the catalogue version and the URL, so
+# clients revalidate with If-None-Match and get an empty 304 while nothing has changed.
+# Rendered bodies are also kept in memory per URL until the version moves on.
+
+# Set RESPONSE_CACHE_SIZE=0 to only answer conditional requests, without keeping rendered bodies
+app.config['RESPONSE_CACHE_SIZE'] = int(os.getenv('RESPONSE_CACHE_SIZE', http_cache.DEFAULT_MAX_ENTRIES))
+response_cache = http_cache.ResponseCache(app.config['RESPONSE_CACHE_SIZE'])
+
+def catalogue_version():
+    """Return (version, updated_at) of the catalogue, or None when the table is not migrated yet."""
+    try:
+        row = CatalogueVersion.query.with_entities(CatalogueVersion.version, CatalogueVersion.updated_at).filter_by(id=1).first()
+    except OperationalError:
+        db.session.rollback()
+        return None
+    return tuple(row) if row else None
+
+def cached_response(view):
+    """Add ETag/Last-Modified validation and the in-memory response cache to a catalogue GET endpoint.
+
+    Only successful responses are cached; errors (e.g. 404) are passed through untouched.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        current = catalogue_version()
+        if current is None:
+            return view(*args, **kwargs)
+
+        version, updated_at = current
+        key = http_cache.request_key(request.path, request.args)
+        etag = http_cache.make_etag(version, key)
+
+        if etag in request.if_none_match:
+            response = app.response_class(status=304)
+        else:
+            cached = response_cache.get(key, version)
+            if cached:
+                body, mimetype = cached
+                response = app.response_class(body, mimetype=mimetype)
+            else:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                response_cache.put(key, version, response.get_data(), response.mimetype)
+
+        response.set_etag(etag)
+        if updated_at:
+            response.last_modified = updated_at.replace(tzinfo=timezone.utc)
+        response.cache_control.no_cache = True  # Always revalidate; unchanged data costs a 304
+        return response.make_conditional(request)
+
+    return wrapper
+
+# === Keyset Pagination === #
+# Pass ?cursor= (empty for the first page) to /movies or /results to page with cursors instead of
+# page numbers; each response carries the next_cursor. Add count=none to skip the total count.
+
+def keyset_page(query, keys, sort_key, per_page):
+    """Return the envelope of one cursor page of `query` ordered by `keys` ([(column, descending)]).
+
+    Raises ValueError for a malformed cursor or one made for a different sort.
+    """
+    cursor = request.args.get('cursor', '')
+    count = request.args.get('count', 'exact')
+    query = query.order_by(None)
+
+    envelope = {'per_page': per_page}
+    if count != 'none':
+        envelope['total'] = query.with_entities(Movie.id).count()
+
+    page_query = query.with_entities(Movie.id, *[column for column, _ in keys])
+    if cursor:
+        page_query = page_query.filter(keyset.after_condition(keys, keyset.decode_cursor(cursor, sort_key)))
+
+    # One extra row tells whether there is a next page
+    rows = page_query.order_by(*keyset.order_by(keys)).limit(per_page + 1).all()
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+
+    envelope['has_next'] = has_next
+    envelope['next_cursor'] = keyset.encode_cursor(sort_key, rows[-1][1:]) if has_next else None
+    return [row[0] for row in rows], envelope
+
+# === Columnar Results === #
+# With RESULTS_ENGINE=columnar, /results page requests without a title search are answered from a
+# memory-mapped columnar snapshot (see columnar.py) instead of SQL. A snapshot only serves the catalogue
+# version it was built from: when the version moves on, requests go to SQL while one background
+# thread builds the next snapshot, which the other worker processes then pick up from disk.
+
+app.config['RESULTS_ENGINE'] = os.getenv('RESULTS_ENGINE', 'sql')
+app.config['RESULTS_SNAPSHOT_DIR'] = os.getenv('RESULTS_SNAPSHOT_DIR', os.path.join(
+    tempfile.gettempdir(), 'cinemind_results',
+    hashlib.sha1(app.config['SQLALCHEMY_DATABASE_URI'].encode('utf-8')).hexdigest()[:12],  # One directory per database
+))
+
+_results_snapshot = None
+_results_build_lock = threading.Lock()
+
+def build_results_snapshot():
+    """Build and publish a snapshot of the current catalogue; returns its path."""
+    # The version is read before the rows, so a write made in between makes the snapshot look stale (and get rebuilt)
+    # rather than letting it claim a version whose changes it misses
+    current = catalogue_version()
+    rows = db.session.query(*[getattr(Movie, column) for column in columnar.ROW_COLUMNS]).order_by(Movie.id).all()
+    genre_rows = db.session.query(MovieGenre.movie_id, MovieGenre.genre_id).all()
+    os.makedirs(app.config['RESULTS_SNAPSHOT_DIR'], exist_ok=True)
+    return columnar.build(app.config['RESULTS_SNAPSHOT_DIR'], current[0] if current else None, rows, genre_rows)
+
+def build_results_snapshot_in_background():
+    if not _results_build_lock.acquire(blocking=False):
+        return  # Already building
+
+    def run():
+        try:
+            with app.app_context():
+                build_results_snapshot()
+        except Exception as e:
+            print(f"⚠ Results snapshot build failed: {e}")
+        finally:
+            _results_build_lock.release()
+
+    threading.Thread(target=run, daemon=True).start()
+
+def current_results_snapshot():
+    """The snapshot of the current catalogue version, or None when /results must use SQL."""
+    global _results_snapshot
+    current = catalogue_version()
+    if current is None:
+        return None
+    if _results_snapshot is not None and _results_snapshot.version == current[0]:
+        return _results_snapshot
+
+    path = columnar.current_path(app.config['RESULTS_SNAPSHOT_DIR'])
+    if path and (_results_snapshot is None or path != _results_snapshot.path):
+        snapshot = columnar.ResultsSnapshot(path)
+        if snapshot.version == current[0]:
+            _results_snapshot = snapshot  # Built by this or another worker
+            return snapshot
+    build_results_snapshot_in_background()
+    return None
+
+@app.cli.command('build-results-snapshot')
+def build_results_snapshot_command():
+    """Build the columnar /results snapshot now instead of on the first request."""
+    path = build_results_snapshot()
+    print(f"✓ Results snapshot written to {path}")
+
+def page_envelope(page, per_page, total):
+    """Pagination fields as Flask-SQLAlchemy's paginate() reports them."""
+    page_number = max(page, 1)
+    page_size = per_page if per_page >= 1 else 20
+    total_pages = -(-total // page_size) if total else 0
+    return {
+        'total': total,
+        'page': page,
+        'per_page': per_page,
+        'total_pages': total_pages,
+        'has_next': page_number < total_pages,
+        'has_prev': page_number > 1,
+    }
+
+# === Random Sampling === #
+# /explore draws its movies from an in-memory copy of the catalogue's ids (see sampling.py), reloaded
+# when the catalogue version moves on. Options: limit, filter (repeatable, see SAMPLING_FILTERS),
+# weighted=1 to favour popular movies, and seed=N to get the same movies again.
+
+movie_sampler = sampling.MovieSampler()
+DEFAULT_EXPLORE_SIZE = 10
+MAX_EXPLORE_SIZE = 100
+
+# filter name -> column a movie must have filled in
+SAMPLING_FILTERS = {
+    'poster': Movie.poster_url,
+    'backdrop': Movie.backdrop_url,
+    'trailer': Movie.video_url,
+}
+
+def sync_movie_sampler():
+    """Reload the sampler if the catalogue changed since it was loaded."""
+    current = catalogue_version()
+    version = current[0] if current else None
+    if movie_sampler.loaded and version == movie_sampler.version:
+        return
+    if not movie_sampler.lock.acquire(blocking=not movie_sampler.loaded):
+        return  # Another request is reloading; sample from the previous copy meanwhile
+
+    try:
+        if movie_sampler.loaded and version == movie_sampler.version:
+            return
+        flags = [func.coalesce(column, '') != '' for column in SAMPLING_FILTERS.values()]
+        rows = db.session.query(Movie.id, Movie.popularity, *flags).order_by(Movie.id).all()
+        columns = list(zip(*rows)) or [()] * (2 + len(flags))
+        movie_sampler.load(columns[0], columns[1], dict(zip(SAMPLING_FILTERS, columns[2:])), version)
+    finally:
+        movie_sampler.lock.release()
+
+# === Facet Index === #
+# The /movies/genre|keyword|actor|country|language/<id> lookups and the combined /movies/facets filter
+# read posting lists from an inverted index of the join tables (see facet_index.py) instead of joining
+# in SQL. Like the columnar snapshot, the index is saved to disk per catalogue version, so other worker
+# processes load it instead of building their own; `flask build-facet-index` builds it ahead of time.
+
+app.config['FACET_INDEX_DIR'] = os.getenv('FACET_INDEX_DIR', os.path.join(
+    tempfile.gettempdir(), 'cinemind_facets',
+    hashlib.sha1(app.config['SQLALCHEMY_DATABASE_URI'].encode('utf-8')).hexdigest()[:12],  # One directory per database
+))
+
+# facet -> (movie id column, facet id column) of its join table
+FACET_COLUMNS = {
+    'genre': (MovieGenre.movie_id, MovieGenre.genre_id),
+    'keyword': (MovieKeywords.movie_id, MovieKeywords.keyword_id),
+    'actor': (MovieCast.movie_id, MovieCast.actor_id),
+    'country': (MovieProductionCountries.movie_id, MovieProductionCountries.country_id),
+    'language': (MovieSpokenLanguages.movie_id, MovieSpokenLanguages.language_id),
+}
+
+_facet_index = None
+_facet_index_lock = threading.Lock()
+
+def build_facet_index():
+    """Build and publish the index of the current catalogue; returns its path."""
+    current = catalogue_version()  # Read before the rows, as for the columnar snapshot
+    ranked_ids = [row.id for row in Movie.query.with_entities(Movie.id).order_by(Movie.popularity.desc(), Movie.id.desc())]
+    # Millions of join rows: read through the DBAPI cursor, as plain tuples (ORM rows take several times longer)
+    cursor = db.session.connection().connection.cursor()
+    pairs = {}
+    for facet, (movie_column, facet_column) in FACET_COLUMNS.items():
+        pairs[facet] = cursor.execute(
+            f"SELECT {movie_column.name}, {facet_column.name} FROM {movie_column.table.name}"
+        ).fetchall()
+    cursor.close()
+    os.makedirs(app.config['FACET_INDEX_DIR'], exist_ok=True)
+    return facet_index.build(app.config['FACET_INDEX_DIR'], current[0] if current else None, ranked_ids, pairs)
+
+def current_facet_index():
+    """The index of the current catalogue version, loaded from disk or built now."""
+    global _facet_index
+    current = catalogue_version()
+    version = current[0] if current else None
+    if _facet_index is not None and _facet_index.version == version:
+        return _facet_index
+
+    with _facet_index_lock:
+        if _facet_index is None or _facet_index.version != version:
+            path = columnar.current_path(app.config['FACET_INDEX_DIR'])
+            index = facet_index.FacetIndex(path) if path else None
+            if index is None or index.version != version:
+                index = facet_index.FacetIndex(build_facet_index())
+            _facet_index = index
+    return _facet_index
+
+def facet_movie_titles(facet, key):
+    """[{'id', 'title'}] of the movies having one facet id, by movie id."""
+    index = current_facet_index()
+    movie_ids = sorted(index.movie_ids(index.posting(facet, key)))
+    titles = {}
+    for chunk in chunked(movie_ids):
+        titles.update(Movie.query.with_entities(Movie.id, Movie.title).filter(Movie.id.in_(chunk)))
+    return [{'id': movie_id, 'title': titles[movie_id]} for movie_id in movie_ids if movie_id in titles]
+
+@app.cli.command('build-facet-index')
+def build_facet_index_command():
+    """Build the facet index now instead of on the first facet request."""
+    path = build_facet_index()
+    print(f"✓ Facet index written to {path}")
+
+# === Facet Counts === #
+# /results?facets=1 adds how many of the matching movies fall in each genre, original language and
+# release decade, so the filter UI can show a count next to every option without one request per
+# option. All counts come from a single statement: the matching movies are computed once (a CTE) and
+# grouped by (language, decade) and, through movie_genre, by genre; the totals are summed up here.
+
+def release_decade():
+    """SQL expression for a movie's release decade (1990 for '1994-06-10'); NULL without a year."""
+    year = func.substr(Movie.release_date, 1, 4)
+    return case((year.op('GLOB')('[0-9][0-9][0-9][0-9]'), sql_cast(year, db.Integer) // 10 * 10), else_=null())
+
+def results_facet_counts(filtered_query):
+    """{'genre': {genre_id: n}, 'language': {language: n}, 'decade': {decade: n}} over a filtered Movie query."""
+    matching = filtered_query.with_entities(
+        Movie.id.label('movie_id'), Movie.original_language.label('language'), release_decade().label('decade'),
+    ).cte('matching')
+    by_language_and_decade = (db.session.query(literal('movie'), matching.c.language, matching.c.decade, func.count())
+                              .group_by(matching.c.language, matching.c.decade))
+    by_genre = (db.session.query(literal('genre'), MovieGenre.genre_id, null(), func.count())
+                .join(matching, matching.c.movie_id == MovieGenre.movie_id)
+                .group_by(MovieGenre.genre_id))
+
+    counts = {'genre': {}, 'language': {}, 'decade': {}}
+    for kind, key, decade, total in by_language_and_decade.union_all(by_genre):
+        if kind == 'genre':
+            counts['genre'][key] = total
+            continue
+        if key is not None:
+            counts['language'][key] = counts['language'].get(key, 0) + total
+        if decade is not None:
+            counts['decade'][decade] = counts['decade'].get(decade, 0) + total
+    return counts
+
+def facet_counts_json(counts):
+    """Counts as lists for the response, largest first."""
+    def ranked(values):
+        return sorted(values.items(), key=lambda item: (-item[1], item[0]))
+
+    genre_names = dict(db.session.query(Genres.genre_id, Genres.genre_name))
+    return {
+        'genre': [{'genre_id': genre_id, 'genre_name': genre_names.get(genre_id), 'count': total}
+                  for genre_id, total in ranked(counts['genre'])],
+        'language': [{'language': language, 'count': total} for language, total in ranked(counts['language'])],
+        'decade': [{'decade': decade, 'count': total} for decade, total in ranked(counts['decade'])],
+    }
+
 # === Endpoints === #
+# Lookups done with db.get_or_404 answer in the same JSON shape as the endpoints' own errors
+@app.errorhandler(404)
+def not_found(e):
+    return jsonify({'error': e.description}), 404
+
 @app.route('/movies', methods=['GET'])
+@cached_response
 def get_movies():
     # Pagination parameters from query string, with default values
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
 
-    # Paginate the query
-    pagination = Movie.query.order_by(Movie.popularity.desc()).paginate(page=page, per_page=per_page, error_out=False)
-    movies = pagination.items
+    if 'cursor' in request.args:
+        keys = [(Movie.popularity, True), (Movie.id, True)]
+        try:
+            movie_ids, envelope = keyset_page(Movie.query, keys, 'popularity:desc', per_page)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return documents_response(get_documents(movie_ids, 'card'), envelope)
 
-    movie_data = []
-    
-    for movie in movies:
-        # Query the production countries
-        countries = ProductionCountries.query.join(MovieProductionCountries).filter(MovieProductionCountries.movie_id == movie.id).all()
-        country_names = [country.country_name for country in countries]
-
-        # Query the spoken languages
-        languages = SpokenLanguages.query.join(MovieSpokenLanguages).filter(MovieSpokenLanguages.movie_id == movie.id).all()
-        language_names = [language.language_name for language in languages]
-
-
-        movie_data.append({
-            'id': movie.id,
-            'title': movie.title,
-            'vote_average': movie.vote_average,
-            'release_date': movie.release_date,
-            'original_language': movie.original_language,
-            'runtime': movie.runtime,
-            'popularity': movie.popularity,
-            'homepage': movie.homepage,
-            'status': movie.status,
-            'poster_url': movie.poster_url,
-            'backdrop_url': movie.backdrop_url,
-            'video_url': movie.video_url,
-            'production_countries': country_names,  
-            'spoken_languages': language_names,
-            'reviews': movie.reviews,
-            'keyposter_url': movie.keyposter_url,  
-            'keyvideo_url': movie.keyvideo_url, 
-        })
+    # Paginate the query (ids only; the movies themselves come from the stored documents)
+    pagination = Movie.query.with_entities(Movie.id).order_by(Movie.popularity.desc()).paginate(page=page, per_page=per_page, error_out=False)
+    movie_data = get_documents([movie.id for movie in pagination.items], 'card')
 
-    return jsonify({
+    return documents_response(movie_data, {
         'total': pagination.total,
         'page': page,
         'per_page': per_page,
         'total_pages': pagination.pages,
         'has_next': pagination.has_next,
         'has_prev': pagination.has_prev,
-        'movies': movie_data
     })
 
 
 
 @app.route('/genres', methods=['GET'])
+@cached_response
 def get_genres():
     genres = Genres.query.all()
     return jsonify([{'id': genre.genre_id, 'name': genre.genre_name} for genre in genres])
 
 @app.route('/cast', methods=['GET'])
+@cached_response
 def get_cast():
     cast_list = Cast.query.all()
     return jsonify([{'id': cast.actor_id, 'name': cast.name, 'gender': cast.gender} for cast in cast_list])
 
 @app.route('/keywords', methods=['GET'])
+@cached_response
 def get_keywords():
     keywords = Keywords.query.all()
     return jsonify([{'id': keyword.keyword_id, 'name': keyword.keyword_name} for keyword in keywords])
 
 @app.route('/production_countries', methods=['GET'])
+@cached_response
 def get_production_countries():
     countries = ProductionCountries.query.all()
     return jsonify([{'id': country.country_id, 'name': country.country_name, 'iso_code': country.iso_code} for country in countries])
 
 @app.route('/spoken_languages', methods=['GET'])
+@cached_response
 def get_spoken_languages():
     languages = SpokenLanguages.query.all()
     return jsonify([{'id': language.language_id, 'name': language.language_name, 'iso_code': language.iso_code} for language in languages])
 
 # === Enhanced Endpoints: makes use of the Relationship tables to link table information ===#
 @app.route('/featured', methods=['GET'])
+@cached_response
 def get_featured():
 
     # Get the top 3 movies based on popularity
-    movies = Movie.query.order_by(Movie.popularity.desc()).limit(3).all()
-
-    featured_movies = []
-
-    # Loop through the movies
-    for movie in movies:
-
-        genres = Genres.query.join(MovieGenre).filter(MovieGenre.movie_id == movie.id).all()
-        genre_names = [genre.genre_name for genre in genres]
-
-        featured_movies.append({
-            'id': movie.id,
-            'title': movie.title,
-            'vote_average': movie.vote_average,
-            'release_date': movie.release_date,
-            'overview' : movie.overview,
-            'original_language': movie.original_language,
-            'runtime': movie.runtime,
-            'popularity': movie.popularity,
-            'homepage': movie.homepage,
-            'video_url': movie.video_url,
-            'keyvideo_url': movie.keyvideo_url,
-            'genres': genre_names
-        })
-
-    return jsonify(featured_movies)
+    movies = Movie.query.with_entities(Movie.id).order_by(Movie.popularity.desc()).limit(3).all()
+    return documents_response(get_documents([movie.id for movie in movies], 'featured'))
 
 # Get the top 10 movies based on vote average   
 @app.route('/popular', methods=['GET'])
+@cached_response
 def get_popular():
-    movies = Movie.query.order_by(Movie.popularity.desc()).offset(3).limit(10).all()
-    popular_movies = []
-    for movie in movies:
-        popular_movies.append({
-            'id': movie.id,
-            'title': movie.title,
-            'release_date': movie.release_date,
-            'vote_average': movie.vote_average,
-            'poster_url': movie.poster_url,
-            'keyposter_url': movie.keyposter_url,
-        })
-    return jsonify(popular_movies)
+    movies = Movie.query.with_entities(Movie.id).order_by(Movie.popularity.desc()).offset(3).limit(10).all()
+    return documents_response(get_documents([movie.id for movie in movies], 'poster'))
 
 @app.route('/explore', methods=['GET'])
 def get_explore():
-    movies = Movie.query.order_by(func.random()).limit(10).all()
-    explore_movies = []
-    for movie in movies:
-        explore_movies.append({
-            'id': movie.id,
-            'title': movie.title,
-            'release_date': movie.release_date,
-            'vote_average': movie.vote_average,
-            'poster_url': movie.poster_url,
-            'keyposter_url': movie.keyposter_url,
-        })
-    return jsonify(explore_movies)
+    limit = min(max(request.args.get('limit', DEFAULT_EXPLORE_SIZE, type=int), 1), MAX_EXPLORE_SIZE)
+    filters = request.args.getlist('filter')
+    weighted = request.args.get('weighted', '0') not in ('0', 'false', '')
+    seed = request.args.get('seed', type=int)
+    if 'seed' in request.args and (seed is None or seed < 0):
+        return jsonify({'error': 'seed must be a non-negative integer'}), 400
+
+    sync_movie_sampler()
+    try:
+        movie_ids = movie_sampler.sample(limit, filters, weighted, seed)
+    except ValueError as e:
+        return jsonify({'error': f"{e} (expected {', '.join(SAMPLING_FILTERS)})"}), 400
+    return documents_response(get_documents(movie_ids, 'poster'))
 
     
 @app.route('/movies/<int:id>', methods=['GET'])
+@cached_response
 def get_movie_by_id(id):
     print(f"Received request for movie with ID {id}")  # Debugging statement
-    movie = Movie.query.get(id)
+    documents = get_documents([id], 'detail')
 
-    if not movie:
+    if not documents:
         return jsonify({'error': f'Movie with ID {id} not found'}), 404
-    
-    # Query the genres of the movie
-    genres = Genres.query.join(MovieGenre).filter(MovieGenre.movie_id == movie.id).all()
-    genre_names = [genre.genre_name for genre in genres]
-
-    # Query the keywords of the movie
-    keywords = Keywords.query.join(MovieKeywords).filter(MovieKeywords.movie_id == movie.id).all()
-    keyword_names = [keyword.keyword_name for keyword in keywords]
 
-    # Query enhanced cast details with profile images and more information
-    cast_members = Cast.query.join(MovieCast).filter(MovieCast.movie_id == movie.id).order_by(Cast.popularity.desc().nullslast()).all()
-
-    # Create detailed cast information incl. profile images and character names
-    cast_details = []
-    for cast in cast_members:
-        # Get the character name from MovieCast and Characters tables
-        movie_cast = MovieCast.query.filter_by(movie_id=movie.id, actor_id=cast.actor_id).first()
-        character_name = None
-        if movie_cast and movie_cast.character_id:
-            character = Characters.query.get(movie_cast.character_id)
-            if character:
-                character_name = character.name  # Changed from character.character_name to character.name
-    
-        cast_details.append({
-            'id': cast.actor_id,
-            'name': cast.name,
-            'character': character_name,
-            'gender': cast.gender, 
-            'popularity': cast.popularity,
-            'profile_path': cast.profile_path if hasattr(cast, 'profile_path') else None,
-            'biography': (cast.biography[:150] + '...') if hasattr(cast, 'biography') and cast.biography else None
-        })
-
-    # Simple cast names list (for backward compatibility)
-    cast_names = [cast.name for cast in cast_members]
-
-    # Query the production countries of the movie
-    countries = ProductionCountries.query.join(MovieProductionCountries).filter(MovieProductionCountries.movie_id == movie.id).all()
-    country_names = [country.country_name for country in countries]
-
-    # Query the spoken languages using MovieSpokenLanguages association with `join`
-    languages = SpokenLanguages.query.join(MovieSpokenLanguages).filter(MovieSpokenLanguages.movie_id == movie.id).all()
-    language_names = [language.language_name for language in languages]
-
-    movie_data = {
-        'id': movie.id,
-        'title': movie.title,
-        'overview': movie.overview,
-        'release_date': movie.release_date,
-        'original_title': movie.original_title,
-        'genres': genre_names,
-        'keywords': keyword_names,
-        'cast': cast_names,
-        'cast_details': cast_details,
-        'budget': movie.budget,
-        'revenue': movie.revenue,
-        'runtime': movie.runtime,
-        'status': movie.status,
-        'tagline': movie.tagline,
-        'popularity': movie.popularity,
-        'vote_average': movie.vote_average,
-        'vote_count': movie.vote_count,
-        'original_language': movie.original_language,
-        'homepage': movie.homepage,
-        'production_countries': country_names,
-        'spoken_languages': language_names,
-        'poster_url': movie.poster_url,
-        'backdrop_url': movie.backdrop_url,
-        'video_url': movie.video_url,
-        'reviews': movie.reviews,
-        'keyposter_url': movie.keyposter_url,
-        'keyvideo_url': movie.keyvideo_url,
-    }
-
-    return jsonify(movie_data)
+    return json_response(documents[0])
 
 @app.route('/movies/ids', methods=['GET'])
+@cached_response
 def get_movie_ids():
-    movie_ids = Movie.query.with_entities(Movie.id).all()
+    movie_ids = Movie.query.with_entities(Movie.id).order_by(Movie.id).all()
     return jsonify([{'id': m.id} for m in movie_ids])
 
 
 @app.route('/movies/genre/<int:genre_id>', methods=['GET'])
+@cached_response
 def get_movies_by_genre(genre_id):
-    genre = Genres.query.get(genre_id)
-    movies = Movie.query.join(MovieGenre).filter(MovieGenre.genre_id == genre_id).all()
-    return jsonify({'genre': genre.genre_name, 'movies': [{'id': movie.id, 'title': movie.title} for movie in movies]})
+    genre = db.get_or_404(Genres, genre_id, description=f'Genre with ID {genre_id} not found')
+    return jsonify({'genre': genre.genre_name, 'movies': facet_movie_titles('genre', genre_id)})
 
 @app.route('/movies/keyword/<int:keyword_id>', methods=['GET'])
+@cached_response
 def get_movies_by_keyword(keyword_id):
-    keyword = Keywords.query.get(keyword_id)
-    movies = Movie.query.join(MovieKeywords).filter(MovieKeywords.keyword_id == keyword_id).all()
-    return jsonify({'keyword': keyword.keyword_name, 'movies': [{'id': movie.id, 'title': movie.title} for movie in movies]})
+    keyword = db.get_or_404(Keywords, keyword_id, description=f'Keyword with ID {keyword_id} not found')
+    return jsonify({'keyword': keyword.keyword_name, 'movies': facet_movie_titles('keyword', keyword_id)})
 
 @app.route('/movies/actor/<int:actor_id>', methods=['GET'])
+@cached_response
 def get_movies_by_actor(actor_id):
-    actor = Cast.query.get(actor_id)
-    movies = Movie.query.join(MovieCast).filter(MovieCast.actor_id == actor_id).all()
-    return jsonify({'actor': actor.name, 'movies': [{'id': movie.id, 'title': movie.title} for movie in movies]})
+    actor = db.get_or_404(Cast, actor_id, description=f'Actor with ID {actor_id} not found')
+    return jsonify({'actor': actor.name, 'movies': facet_movie_titles('actor', actor_id)})
 
 @app.route('/movies/country/<int:country_id>', methods=['GET'])
+@cached_response
 def get_movies_by_country(country_id):
-    country = ProductionCountries.query.get(country_id)
-    movies = Movie.query.join(MovieProductionCountries).filter(MovieProductionCountries.country_id == country_id).all()
-    return jsonify({'country': country.country_name, 'movies': [{'id': movie.id, 'title': movie.title} for movie in movies]})
+    country = db.get_or_404(ProductionCountries, country_id, description=f'Country with ID {country_id} not found')
+    return jsonify({'country': country.country_name, 'movies': facet_movie_titles('country', country_id)})
 
 @app.route('/movies/language/<int:language_id>', methods=['GET'])
+@cached_response
 def get_movies_by_language(language_id):
-    language = SpokenLanguages.query.get(language_id)
-    movies = Movie.query.join(MovieSpokenLanguages).filter(MovieSpokenLanguages.language_id == language_id).all()
-    return jsonify({'language': language.language_name, 'movies': [{'id': movie.id, 'title': movie.title} for movie in movies]})
+    language = db.get_or_404(SpokenLanguages, language_id, description=f'Language with ID {language_id} not found')
+    return jsonify({'language': language.language_name, 'movies': facet_movie_titles('language', language_id)})
+
+# Combined facet filter, e.g. /movies/facets?actor=31&keyword=9715&country=5
+# Each parameter is a facet (genre, keyword, actor, country, language); repeated parameters must all
+# match (AND), a comma-separated value matches any of its ids (OR) and a leading "-" excludes them (NOT):
+#   /movies/facets?genre=28,12&genre=-27&language=7   action or adventure, not horror, spoken language 7
+# Results are paged like /results, most popular first.
+@app.route('/movies/facets', methods=['GET'])
+@cached_response
+def get_movies_by_facets():
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+
+    clauses = []
+    for facet in facet_index.FACETS:
+        for value in request.args.getlist(facet):
+            negated = value.startswith('-')
+            try:
+                keys = [int(key) for key in value.lstrip('-').split(',')]
+            except ValueError:
+                return jsonify({'error': f"{facet} must be a comma-separated list of ids, optionally prefixed with '-'"}), 400
+            clauses.append((facet, keys, negated))
+    if not clauses:
+        return jsonify({'error': f"Expected at least one of: {', '.join(facet_index.FACETS)}"}), 400
+
+    index = current_facet_index()
+    ranks = index.evaluate(clauses)
+    start = (page - 1) * per_page
+    movie_ids = index.movie_ids(ranks[start:start + per_page])
+    return documents_response(get_documents(movie_ids, 'result'), page_envelope(page, per_page, len(ranks)))
 
 # Search Bar Endpoints:
+def apply_text_search(query, search_text):
+    """Filter a Movie query by free text.
+
+    Uses the FTS5 index (title, original title, overview, tagline, keywords) when it exists and
+    returns its relevance score column; otherwise falls back to a title LIKE filter and returns None.
+    """
+    if search_index.is_available(db.session):
+        expression = search_index.build_match_expression(search_text)
+        if expression:
+            matches = search_index.ranked_matches(expression)
+            return query.join(matches, matches.c.movie_id == Movie.id), matches.c.score
+
+    return query.filter(Movie.title.ilike(f"%{search_text}%")), None
+
 @app.route('/movies/search', methods=['GET'])
+@cached_response
 def search_movies():
     query = Movie.query
 
@@ -425,7 +1280,9 @@ def search_movies():
     language_id = request.args.get('language_id')
 
     if title:
-        query = query.filter(Movie.title.ilike(f"%{title}%"))
+        query, relevance = apply_text_search(query, title)
+        if relevance is not None:
+            query = query.order_by(relevance)
     if genre_id:
         query = query.join(MovieGenre).filter(MovieGenre.genre_id == genre_id)
     if language_id:
@@ -441,25 +1298,50 @@ def search_movies():
 @app.route('/movies/suggest', methods=['GET'])
 def suggest_movies():
     query = request.args.get('query', '')
+
+    # Most popular titles with a word starting with the query, from memory
+    sync_title_autocomplete()
+    suggestions = title_autocomplete.suggest(query, limit=5)
+    if suggestions:
+        return jsonify([{"id": movie_id, "title": title} for movie_id, title in suggestions])
+
+    # Answer straight from the search index when it exists (prefix match, best titles first)
+    if query and search_index.is_available(db.session):
+        suggestions = search_index.suggest_titles(db.session, query, limit=5)
+        return jsonify([{"id": movie_id, "title": title} for movie_id, title in suggestions])
+
     movies = Movie.query.filter(Movie.title.ilike(f"%{query}%")).limit(5).all()
     return jsonify([{"id": movie.id, "title": movie.title} for movie in movies])
 
 # Endpoint made to create results when user searches for movies to display on the movie grid
 @app.route('/results', methods=['GET'])
+@cached_response
 def results_movies():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
     query = request.args.get('query', '')
-    genre_ids = request.args.getlist('genre')
+    genre_ids = list(map(int, request.args.getlist('genre')))
     language = request.args.get('language', '')
     sort_by = request.args.get('sort_by', 'popularity')
     order = request.args.get('order', 'desc')
+    with_facets = request.args.get('facets', '0') not in ('0', 'false', '')
+
+    # Columnar engine (page numbers, no title search); same results as the SQL below
+    if app.config['RESULTS_ENGINE'] == 'columnar' and not query and 'cursor' not in request.args:
+        snapshot = current_results_snapshot()
+        if snapshot is not None:
+            movie_ids, total = snapshot.query(genre_ids, language, sort_by, order, max(page, 1), per_page if per_page >= 1 else 20)
+            envelope = page_envelope(page, per_page, total)
+            if with_facets:
+                envelope['facets'] = facet_counts_json(snapshot.facet_counts(genre_ids, language))
+            return documents_response(get_documents(movie_ids, 'result'), envelope)
 
     base_query = Movie.query
+    relevance = None
 
-    # Filter by title
+    # Filter by title (full-text search when the index exists)
     if query:
-        base_query = base_query.filter(Movie.title.ilike(f"%{query}%"))
+        base_query, relevance = apply_text_search(base_query, query)
 
     # Filter by original language
     if language:
@@ -467,9 +1349,15 @@ def results_movies():
 
     # AND-filter by genres (must match all)
     if genre_ids:
-        genre_ids = list(map(int, genre_ids))
-        base_query = base_query.join(MovieGenre).filter(MovieGenre.genre_id.in_(genre_ids))
-        base_query = base_query.group_by(Movie.id).having(func.count(MovieGenre.genre_id) == len(genre_ids))
+        # Grouped inside movie_genre, so the genre index is used instead of grouping the whole movies table
+        matching_ids = (db.session.query(MovieGenre.movie_id)
+                        .filter(MovieGenre.genre_id.in_(genre_ids))
+                        .group_by(MovieGenre.movie_id)
+                        .having(func.count(MovieGenre.genre_id) == len(genre_ids)))
+        base_query = base_query.filter(Movie.id.in_(matching_ids))
+
+    # Counts per genre, language and decade over every match (not just this page)
+    facets = facet_counts_json(results_facet_counts(base_query)) if with_facets else None
 
     # Sorting
     sortable_columns = {
@@ -481,88 +1369,590 @@ def results_movies():
         "title": Movie.title,
     }
     sort_column = sortable_columns.get(sort_by, Movie.popularity)
-    if order == "asc":
-        base_query = base_query.order_by(sort_column.asc())
+    if sort_by == "relevance" and relevance is not None:
+        # Best matches first; `order` does not apply to relevance
+        base_query = base_query.order_by(relevance, Movie.popularity.desc())
+    elif order == "asc":
+        base_query = base_query.order_by(sort_column.asc(), Movie.id.asc())  # Id breaks ties, so pages are stable
     else:
-        base_query = base_query.order_by(sort_column.desc())
+        base_query = base_query.order_by(sort_column.desc(), Movie.id.desc())
 
     # === Pagination === #
-    pagination = base_query.paginate(page=page, per_page=per_page, error_out=False)
-    movies = pagination.items
-
-    movie_data = []
-    for movie in movies:
-        # Get genres for this movie
-        genres = Genres.query.join(MovieGenre).filter(MovieGenre.movie_id == movie.id).all()
-        genre_names = [genre.genre_name for genre in genres]
-        
-        movie_data.append({
-            'id': movie.id,
-            'title': movie.title,
-            'vote_average': movie.vote_average,
-            'release_date': movie.release_date,
-            'original_language': movie.original_language,
-            'runtime': movie.runtime,
-            'popularity': movie.popularity,
-            'homepage': movie.homepage,
-            'status': movie.status,
-            'poster_url': movie.poster_url,
-            'backdrop_url': movie.backdrop_url,
-            'video_url': movie.video_url,
-            'reviews': movie.reviews,
-            'keyposter_url': movie.keyposter_url,
-            'keyvideo_url': movie.keyvideo_url,
-            'genres': genre_names,  
-            'budget': movie.budget, 
-            'revenue': movie.revenue  
-        })
-
-    return jsonify({
+    if 'cursor' in request.args:
+        # Same order as above, with the movie id as the final tie-breaker
+        if sort_by == "relevance" and relevance is not None:
+            keys = [(relevance, False), (Movie.popularity, True), (Movie.id, False)]
+        else:
+            descending = order != "asc"
+            keys = [(sort_column, descending), (Movie.id, descending)]
+        try:
+            movie_ids, envelope = keyset_page(base_query, keys, f"{sort_by}:{order}", per_page)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if facets is not None:
+            envelope['facets'] = facets
+        return documents_response(get_documents(movie_ids, 'result'), envelope)
+
+    pagination = base_query.with_entities(Movie.id).paginate(page=page, per_page=per_page, error_out=False)
+    movie_data = get_documents([movie.id for movie in pagination.items], 'result')
+
+    envelope = {
         'total': pagination.total,
         'page': page,
         'per_page': per_page,
         'total_pages': pagination.pages,
         'has_next': pagination.has_next,
         'has_prev': pagination.has_prev,
-        'movies': movie_data
+    }
+    if facets is not None:
+        envelope['facets'] = facets
+    return documents_response(movie_data, envelope)
+
+# === Analytics === #
+# Genre, year and financial aggregates for the analytics charts, computed over an in-memory columnar
+# snapshot of the catalogue. The snapshot is refreshed when the catalogue version moves on, re-reading
+# only the movies listed in movie_changes since the previous refresh.
+# Every endpoint accepts the /results filters (genre, language) and top=N to aggregate only the first
+# N movies by sort_by/order, e.g. /analytics/genres?top=1000&sort_by=vote_average.
+
+analytics_snapshot = analytics.CatalogueSnapshot()
+MAX_ANALYTICS_BINS = 100
+
+def analytics_movie_rows(movie_ids=None):
+    query = db.session.query(*[getattr(Movie, column) for column in analytics.MOVIE_COLUMNS])
+    if movie_ids is None:
+        return query.all()
+    return [row for chunk in chunked(movie_ids) for row in query.filter(Movie.id.in_(chunk)).all()]
+
+def analytics_genre_rows(movie_ids=None):
+    query = db.session.query(MovieGenre.movie_id, MovieGenre.genre_id)
+    if movie_ids is None:
+        return query.all()
+    return [row for chunk in chunked(movie_ids) for row in query.filter(MovieGenre.movie_id.in_(chunk)).all()]
+
+def refresh_analytics():
+    """Bring the analytics snapshot up to date with the catalogue. Call with the snapshot lock held."""
+    snapshot = analytics_snapshot
+    current = catalogue_version()
+    version = current[0] if current else None
+    if snapshot.loaded and version is not None and version == snapshot.version:
+        return
+
+    genre_names = db.session.query(Genres.genre_id, Genres.genre_name).all()
+    changed_ids = None
+    try:
+        sequence = db.session.query(func.coalesce(func.max(MovieChange.sequence), 0)).scalar()
+        if snapshot.loaded:
+            changed_ids = [row.movie_id for row in MovieChange.query.with_entities(MovieChange.movie_id)
+                           .filter(MovieChange.sequence > snapshot.sequence)]
+    except OperationalError:
+        db.session.rollback()  # Change log not migrated yet: reload everything
+        sequence = 0
+
+    # Reloading is cheaper than patching when a large part of the catalogue changed
+    if changed_ids is None or len(changed_ids) > len(snapshot.movies) // 2:
+        snapshot.load(analytics_movie_rows(), analytics_genre_rows(), genre_names, sequence)
+    elif changed_ids:
+        snapshot.apply_changes(changed_ids, analytics_movie_rows(changed_ids), analytics_genre_rows(changed_ids), genre_names, sequence)
+    else:
+        snapshot.genre_names = dict(genre_names)
+    snapshot.version = version
+
+def analytics_response(aggregate):
+    """Apply the request's filters to the snapshot and return {'movies': count, **aggregate(snapshot, movies)}."""
+    genre_ids = request.args.getlist('genre', type=int)
+    language = request.args.get('language', '')
+    top = request.args.get('top', type=int)
+    sort_by = request.args.get('sort_by', 'popularity')
+    order = request.args.get('order', 'desc')
+    if sort_by == 'release_date':
+        sort_by = 'release_year'
+
+    with analytics_snapshot.lock:
+        refresh_analytics()
+        movies = analytics_snapshot.select(genre_ids, language, sort_by, order, top)
+        result = aggregate(analytics_snapshot, movies)
+    return jsonify({'movies': len(movies), **result})
+
+@app.route('/analytics/genres', methods=['GET'])
+@cached_response
+def analytics_genres():
+    return analytics_response(lambda snapshot, movies: {'genres': analytics.genre_distribution(snapshot, movies)})
+
+@app.route('/analytics/years', methods=['GET'])
+@cached_response
+def analytics_years():
+    group = request.args.get('group', 'year')
+    if group not in ('year', 'decade'):
+        return jsonify({'error': "group must be 'year' or 'decade'"}), 400
+    return analytics_response(lambda snapshot, movies: {'group': group, 'years': analytics.year_distribution(movies, group)})
+
+@app.route('/analytics/financials', methods=['GET'])
+@cached_response
+def analytics_financials():
+    bins = min(max(request.args.get('bins', analytics.DEFAULT_BINS, type=int), 1), MAX_ANALYTICS_BINS)
+    return analytics_response(lambda snapshot, movies: analytics.financial_summary(movies, bins))
+
+@app.route('/analytics/financials/top', methods=['GET'])
+@cached_response
+def analytics_top_financials():
+    metric = request.args.get('metric', 'revenue')
+    limit = min(max(request.args.get('limit', 15, type=int), 1), 100)
+    if metric not in analytics.FINANCIAL_METRICS:
+        return jsonify({'error': f"metric must be one of {', '.join(analytics.FINANCIAL_METRICS)}"}), 400
+    return analytics_response(lambda snapshot, movies: {'metric': metric, 'top': analytics.top_financial(movies, metric, limit)})
+
+# === Similar Movies === #
+# /movies/<id>/similar reads the precomputed neighbours of a movie (see similarity.py).
+# `flask build-similar` computes them: the first run (or --full) covers every movie, later runs only
+# the movies listed in movie_changes since the previous run, e.g. films added by an ingestion.
+SIMILAR_INSERT_CHUNK = 5000
+
+def similarity_features():
+    """Feature matrix of the whole catalogue."""
+    movie_ids = [row.id for row in Movie.query.with_entities(Movie.id)]
+    groups = {
+        'keywords': db.session.query(MovieKeywords.movie_id, MovieKeywords.keyword_id).all(),
+        'genres': db.session.query(MovieGenre.movie_id, MovieGenre.genre_id).all(),
+        'cast': db.session.query(MovieCast.movie_id, MovieCast.actor_id).distinct().all(),
+    }
+    return similarity.FeatureMatrix(movie_ids, groups)
+
+def stored_neighbours():
+    """Every stored neighbour list, movie id -> [(similar_id, score)] best first."""
+    lists = {}
+    for row in SimilarMovie.query.order_by(SimilarMovie.movie_id, SimilarMovie.rank):
+        lists.setdefault(row.movie_id, []).append((row.similar_id, row.score))
+    return lists
+
+def write_neighbours(lists):
+    """Insert (movie_id, [(similar_id, score)]) lists; returns the number of movies written."""
+    written = 0
+    rows = []
+    for movie_id, neighbours in lists:
+        rows += [{'movie_id': movie_id, 'rank': rank, 'similar_id': similar_id, 'score': score}
+                 for rank, (similar_id, score) in enumerate(neighbours)]
+        written += 1
+        if len(rows) >= SIMILAR_INSERT_CHUNK:
+            db.session.execute(db.insert(SimilarMovie), rows)
+            rows = []
+    if rows:
+        db.session.execute(db.insert(SimilarMovie), rows)
+    return written
+
+@app.cli.command('build-similar')
+@click.option('--full', is_flag=True, help='Recompute every movie, not just the ones changed since the last run.')
+@click.option('--neighbours', default=similarity.DEFAULT_NEIGHBOURS, show_default=True, help='Similar movies stored per movie.')
+@click.option('--batch-size', default=similarity.DEFAULT_BATCH_SIZE, show_default=True, help='Movies compared against the catalogue at once.')
+def build_similar_command(full, neighbours, batch_size):
+    """Precompute the similar movies of every movie."""
+    build = db.session.get(SimilarityBuild, 1)
+    # Read before the features, so changes made during the build are picked up by the next run
+    sequence = db.session.query(func.coalesce(func.max(MovieChange.sequence), 0)).scalar()
+    matrix = similarity_features()
+    print(f"Feature matrix: {matrix.vectors.shape[0]} movies x {matrix.vectors.shape[1]} features")
+
+    if full or build is None:
+        SimilarMovie.query.delete()
+        written = write_neighbours(similarity.neighbour_lists(matrix, matrix.ids.tolist(), neighbours, batch_size))
+        deleted = 0
+    else:
+        changed_ids = [row.movie_id for row in MovieChange.query.with_entities(MovieChange.movie_id)
+                       .filter(MovieChange.sequence > build.sequence)]
+        lists = similarity.incremental_update(matrix, changed_ids, stored_neighbours(), neighbours, batch_size)
+        deleted_ids = [movie_id for movie_id in changed_ids if movie_id not in matrix.positions]
+        for chunk in chunked(list(lists) + deleted_ids):
+            SimilarMovie.query.filter(SimilarMovie.movie_id.in_(chunk)).delete(synchronize_session=False)
+        written = write_neighbours(lists.items())
+        deleted = len(deleted_ids)
+
+    if build is None:
+        build = SimilarityBuild(id=1)
+        db.session.add(build)
+    build.sequence = sequence
+    build.movies = len(matrix.ids)
+    build.built_at = datetime.now(timezone.utc)
+    # similar_movies is not a catalogue table, so bump the version by hand to expire cached /similar responses
+    CatalogueVersion.query.filter_by(id=1).update({'version': CatalogueVersion.version + 1, 'updated_at': datetime.now(timezone.utc)})
+    db.session.commit()
+
+    print("\n=== Summary ===")
+    print(f"Neighbour lists written: {written}")
+    print(f"Deleted movies removed: {deleted}")
+
+@app.route('/movies/<int:id>/similar', methods=['GET'])
+@cached_response
+def get_similar_movies(id):
+    limit = min(max(request.args.get('limit', 10, type=int), 1), similarity.DEFAULT_NEIGHBOURS)
+    if Movie.query.with_entities(Movie.id).filter_by(id=id).first() is None:
+        return jsonify({'error': f'Movie with ID {id} not found'}), 404
+
+    neighbours = (SimilarMovie.query.with_entities(SimilarMovie.similar_id, SimilarMovie.score)
+                  .filter_by(movie_id=id).order_by(SimilarMovie.rank).limit(limit).all())
+    documents = get_documents([row.similar_id for row in neighbours], 'card')
+    return documents_response(documents, {
+        'movie_id': id,
+        'scores': {str(row.similar_id): round(row.score, 4) for row in neighbours},
     })
 
+# === Sentiment Cache === #
+# Summaries are generated once per (reviews, prompt version) and then served from memory or the sentiment_summaries table
+sentiment_cache = sentiment.SummaryCache()
+
+# Set SENTIMENT_ON_DEMAND=0 to make /movies/<id>/sentiment a pure read of precomputed summaries
+app.config['SENTIMENT_ON_DEMAND'] = os.getenv('SENTIMENT_ON_DEMAND', '1') != '0'
+
+# Summaries generated on demand: concurrent requests for a movie share one Gemini call, and requests
+# beyond the limits below get a 503 with Retry-After rather than waiting on a busy server
+app.config['SENTIMENT_MAX_GENERATING'] = int(os.getenv('SENTIMENT_MAX_GENERATING', sentiment.DEFAULT_MAX_GENERATING))
+app.config['SENTIMENT_MAX_QUEUED'] = int(os.getenv('SENTIMENT_MAX_QUEUED', sentiment.DEFAULT_MAX_QUEUED))
+app.config['SENTIMENT_DEADLINE'] = float(os.getenv('SENTIMENT_DEADLINE', sentiment.DEFAULT_DEADLINE_SECONDS))  # Seconds
+summary_generator = sentiment.SummaryGenerator(app.config['SENTIMENT_MAX_GENERATING'], app.config['SENTIMENT_MAX_QUEUED'])
+
+def get_cached_sentiment(movie_id, content_hash):
+    """Return a stored summary that is still valid for these reviews and prompt, or None."""
+    summary = sentiment_cache.get(movie_id, content_hash)
+    if summary is not None:
+        return summary
+
+    try:
+        stored = db.session.get(SentimentSummary, movie_id)
+    except OperationalError:  # sentiment_summaries table not migrated yet
+        db.session.rollback()
+        stored = None
+
+    if stored and stored.reviews_hash == content_hash and stored.prompt_version == sentiment.PROMPT_VERSION:
+        sentiment_cache.count('store_hits')
+        sentiment_cache.put(movie_id, content_hash, stored.summary)
+        return stored.summary
+
+    sentiment_cache.count('misses')
+    return None
+
+def store_sentiment(movie_id, content_hash, summary):
+    """Save a freshly generated summary, replacing any outdated one for the movie."""
+    sentiment_cache.put(movie_id, content_hash, summary)
+    statement = sqlite_insert(SentimentSummary).values(
+        movie_id=movie_id,
+        reviews_hash=content_hash,
+        prompt_version=sentiment.PROMPT_VERSION,
+        summary=summary,
+        created_at=datetime.now(timezone.utc),
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[SentimentSummary.movie_id],
+        set_={column: statement.excluded[column] for column in ('reviews_hash', 'prompt_version', 'summary', 'created_at')},
+    )
+    try:
+        execute_write(statement)
+    except OperationalError as e:
+        # Still served from memory; only persistence is lost
+        db.session.rollback()
+        print(f"⚠ Could not store sentiment summary for movie {movie_id}: {e}")
+
+def start_sentiment(client, movie_id, content_hash, deadline):
+    """The Flight generating this movie's summary, joining one already in progress."""
+    def generate():
+        try:
+            with app.app_context():  # Runs on a generator thread; only the first request's call reads the text
+                reviews = review_store.decompress(db.session.get(MovieReview, movie_id).body)
+            yield from sentiment.summarize_stream(client, reviews)
+        except Exception:
+            sentiment_cache.count('errors')
+            raise
+
+    def on_summary(summary):
+        sentiment_cache.count('generated')
+        with app.app_context():
+            store_sentiment(movie_id, content_hash, summary)
+
+    return summary_generator.submit((movie_id, content_hash), generate, deadline, on_summary)
+
+def server_sent_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def sentiment_events(movie, summary=None, flight=None, deadline=None):
+    """Stream a summary as server-sent events.
+
+    'chunk' events carry the text as Gemini produces it, then a 'done' event carries the same body
+    as the JSON response; failures end the stream with an 'error' event instead.
+    """
+    def events():
+        text = summary
+        try:
+            if flight is None:
+                yield server_sent_event('chunk', {'text': text})
+            else:
+                for chunk in flight.stream(deadline):
+                    yield server_sent_event('chunk', {'text': chunk})
+                text = flight.summary
+        except sentiment.DeadlineExceeded as e:
+            yield server_sent_event('error', {'error': f'{e}; try again shortly', 'status': 504})
+            return
+        except Exception as e:
+            yield server_sent_event('error', {'error': f'Failed to analyze sentiment: {str(e)}', 'status': 500})
+            return
+        yield server_sent_event('done', {'movie_id': movie.id, 'title': movie.title, 'sentiment_analysis': text})
+
+    return app.response_class(events(), mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})  # No proxy buffering
+
 # Endpoint to analyze movie sentiment using Gemini AI
+# With stream=1 the summary is sent as server-sent events while it is generated (see sentiment_events)
 @app.route('/movies/<int:id>/sentiment', methods=['GET'])
 def analyze_movie_sentiment(id):
-    movie = Movie.query.get(id)
+    # The stored hash is enough to find a valid summary; the text is only loaded to generate one
+    movie = (Movie.query.with_entities(Movie.id, Movie.title, MovieReview.reviews_hash)
+             .outerjoin(MovieReview, MovieReview.movie_id == Movie.id).filter(Movie.id == id).first())
 
     if not movie:
         return jsonify({'error': f'Movie with ID {id} not found'}), 404
 
-    if not movie.reviews:
+    if movie.reviews_hash is None:
         return jsonify({'error': 'No reviews available for this movie'}), 400
 
-    try:
-        response = client.models.generate_content(
-            model="gemini-2.0-flash-lite",  # Replace with the specific model name
-            contents=(
-                "Analyze the sentiment of the following movie reviews and provide a single plain-text summary of the overall sentiment. "
-                "Do not include any titles, headings, author names, or individual review analysis. Focus only on the overall sentiment "
-                "and key points expressed collectively in the reviews:\n\n"
-                f"{movie.reviews}"
-            )
-        )
-        sentiment_analysis = response.text.strip()
-        return jsonify({
-            'movie_id': movie.id,
-            'title': movie.title,
-            'sentiment_analysis': sentiment_analysis
-        })
-    except Exception as e:
-        return jsonify({'error': f'Failed to analyze sentiment: {str(e)}'}), 500
-    
+    stream = request.args.get('stream', '0') not in ('0', 'false', '')
+    content_hash = movie.reviews_hash
+    sentiment_analysis = get_cached_sentiment(movie.id, content_hash)
+
+    if sentiment_analysis is None and not app.config['SENTIMENT_ON_DEMAND']:
+        # Summaries are only produced by the precompute-sentiment job
+        return jsonify({'error': 'Sentiment analysis has not been generated for this movie yet'}), 404
+
+    if sentiment_analysis is None:
+        client = gemini_client()
+        if client is None:
+            return jsonify({'error': 'Sentiment analysis is unavailable: GEMINI_API_KEY is not configured'}), 503
+
+        db.session.close()  # Hand the pooled connection back while waiting; the generator thread needs one
+        deadline = time.monotonic() + app.config['SENTIMENT_DEADLINE']
+        try:
+            flight = start_sentiment(client, movie.id, content_hash, deadline)
+        except sentiment.Overloaded as e:
+            return jsonify({'error': str(e)}), 503, {'Retry-After': str(round(app.config['SENTIMENT_DEADLINE']))}
+
+        if stream:
+            return sentiment_events(movie, flight=flight, deadline=deadline)
+        try:
+            with timed('gemini'):
+                sentiment_analysis = flight.result(deadline)
+        except sentiment.DeadlineExceeded as e:
+            # The call carries on and stores the summary, so a retry is likely to find it
+            return jsonify({'error': f'{e}; try again shortly'}), 504
+        except Exception as e:
+            return jsonify({'error': f'Failed to analyze sentiment: {str(e)}'}), 500
+
+    if stream:
+        return sentiment_events(movie, summary=sentiment_analysis)
+    return jsonify({
+        'movie_id': movie.id,
+        'title': movie.title,
+        'sentiment_analysis': sentiment_analysis
+    })
 
+def stale_sentiment_jobs(limit=None):
+    """Yield (movie_id, reviews) for movies whose summary is missing or out of date.
+
+    Movies are checked in chunks by their stored reviews hash, so only the reviews of stale movies are decompressed.
+    """
+    movie_ids = [row.movie_id for row in MovieReview.query.with_entities(MovieReview.movie_id).order_by(MovieReview.movie_id)]
+    yielded = 0
+
+    for chunk in chunked(movie_ids, 200):
+        stored = {
+            row.movie_id: (row.reviews_hash, row.prompt_version)
+            for row in SentimentSummary.query.with_entities(SentimentSummary.movie_id, SentimentSummary.reviews_hash, SentimentSummary.prompt_version)
+            .filter(SentimentSummary.movie_id.in_(chunk))
+        }
+        rows = (MovieReview.query.with_entities(MovieReview.movie_id, MovieReview.reviews_hash, MovieReview.body)
+                .filter(MovieReview.movie_id.in_(chunk)).order_by(MovieReview.movie_id).all())
+        db.session.commit()  # End the read transaction; results are written between chunks
+
+        for movie_id, content_hash, body in rows:
+            if stored.get(movie_id) == (content_hash, sentiment.PROMPT_VERSION):
+                continue
+            yield movie_id, review_store.decompress(body)
+            yielded += 1
+            if limit is not None and yielded >= limit:
+                return
+
+@app.cli.command('precompute-sentiment')
+@click.option('--workers', default=sentiment.DEFAULT_WORKERS, show_default=True, help='Concurrent Gemini requests.')
+@click.option('--rpm', default=sentiment.DEFAULT_REQUESTS_PER_MINUTE, show_default=True, help='Maximum Gemini requests per minute (0 = no limit).')
+@click.option('--max-attempts', default=sentiment.DEFAULT_MAX_ATTEMPTS, show_default=True, help='Attempts per movie before giving up.')
+@click.option('--limit', default=None, type=int, help='Only process this many movies.')
+def precompute_sentiment_command(workers, rpm, max_attempts, limit):
+    """Generate and store sentiment summaries for every movie whose summary is missing or stale.
+
+    Safe to interrupt: each summary is saved as soon as it arrives, and the next run skips it.
+    """
+    client = gemini_client()
+    if client is None:
+        print("⚠ GEMINI_API_KEY is not configured; no summaries generated")
+        return
+
+    generated = 0
+    failed = 0
+
+    print(f"Precomputing sentiment summaries (prompt version {sentiment.PROMPT_VERSION})...\n")
+    jobs = stale_sentiment_jobs(limit)
+    results = sentiment.generate_summaries(client, jobs, workers=workers, requests_per_minute=rpm, max_attempts=max_attempts)
+
+    for movie_id, content_hash, summary, error in results:
+        if error:
+            failed += 1
+            print(f"⚠ Failed to summarize movie ID {movie_id}: {error}")
+            continue
+        store_sentiment(movie_id, content_hash, summary)
+        generated += 1
+        print(f"✓ Stored summary for movie ID {movie_id}")
+
+    print("\n=== Summary ===")
+    print(f"Summaries generated: {generated}")
+    print(f"Movies failed: {failed}")
+
+# Hit/miss counters of the sentiment summary cache, and of on-demand generation
+@app.route('/sentiment/cache/stats', methods=['GET'])
+def sentiment_cache_stats():
+    return jsonify({**sentiment_cache.snapshot(), 'generation': summary_generator.snapshot()})
+
+# === Bulk Export === #
+# For static-site builds: /movies/export streams every movie's detail document as NDJSON (one JSON
+# object per line), and POST /movies/batch returns the detail documents of a list of ids.
+# With sentiment=1 (export) or "sentiment": true (batch), stored summaries that are still valid are
+# included; these endpoints never call Gemini, so movies without one get null.
+EXPORT_CHUNK_SIZE = 200  # Movies read per query while streaming
+MAX_BATCH_IDS = 1000
+
+def cached_sentiments(movie_ids):
+    """Valid stored summaries of `movie_ids`, movie id -> summary."""
+    try:
+        rows = (db.session.query(SentimentSummary.movie_id, SentimentSummary.summary)
+                .join(MovieReview, MovieReview.movie_id == SentimentSummary.movie_id)
+                .filter(SentimentSummary.movie_id.in_(movie_ids),
+                        SentimentSummary.reviews_hash == MovieReview.reviews_hash,
+                        SentimentSummary.prompt_version == sentiment.PROMPT_VERSION)
+                .all())
+    except OperationalError:  # sentiment_summaries table not migrated yet
+        db.session.rollback()
+        return {}
+    return dict(rows)
+
+def export_lines(include_sentiment):
+    """Yield NDJSON lines of every movie, walking the ids in chunks so memory stays flat."""
+    last_id = 0
+    while True:
+        chunk = [row.id for row in Movie.query.with_entities(Movie.id).filter(Movie.id > last_id)
+                 .order_by(Movie.id).limit(EXPORT_CHUNK_SIZE)]
+        if not chunk:
+            return
+        last_id = chunk[-1]
+
+        documents = load_documents(chunk, 'detail')
+        if include_sentiment:
+            summaries = cached_sentiments(chunk)
+            documents = {movie_id: f'{{"movie":{document},"sentiment_analysis":{json.dumps(summaries.get(movie_id))}}}'
+                         for movie_id, document in documents.items()}
+        documents = [documents[movie_id] for movie_id in chunk if movie_id in documents]
+        yield ''.join(f'{document}\n' for document in documents)
+        db.session.remove()  # Release the chunk's objects and connection between chunks
+
+@app.route('/movies/export', methods=['GET'])
+def export_movies():
+    include_sentiment = request.args.get('sentiment', '0') not in ('0', 'false', '')
+    return app.response_class(stream_with_context(export_lines(include_sentiment)), mimetype='application/x-ndjson')
+
+@app.route('/movies/batch', methods=['POST'])
+def get_movies_batch():
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not all(isinstance(movie_id, int) for movie_id in ids):
+        return jsonify({'error': 'Expected a JSON body with a list of integer "ids"'}), 400
+    if len(ids) > MAX_BATCH_IDS:
+        return jsonify({'error': f'At most {MAX_BATCH_IDS} ids per batch'}), 400
+
+    movie_ids = list(dict.fromkeys(ids))  # Drop repeats, keep the order
+    found = set()
+    for chunk in chunked(movie_ids):
+        found.update(row.id for row in Movie.query.with_entities(Movie.id).filter(Movie.id.in_(chunk)))
+    movie_ids = [movie_id for movie_id in movie_ids if movie_id in found]
+
+    envelope = {'missing': [movie_id for movie_id in dict.fromkeys(ids) if movie_id not in found]}
+    if data.get('sentiment'):
+        summaries = {}
+        for chunk in chunked(movie_ids):
+            summaries.update(cached_sentiments(chunk))
+        envelope['sentiment'] = {str(movie_id): summaries.get(movie_id) for movie_id in movie_ids}
+    return documents_response(get_documents(movie_ids, 'detail'), envelope)
 
 # default message to test API is connected
 @app.route('/')
 def index():
     return jsonify({'message': 'Connected to CineMind Flask API'})
 
+# === Production Serving === #
+# `flask run` and `python app.py` start the single-threaded development server. In production, run
+# gunicorn from backend/app with the settings in gunicorn.conf.py (a worker process per core):
+#   gunicorn "app:create_app()"
+# create_app() switches the database to WAL journal mode, so readers never wait for a writer, and
+# makes the API's connections read-only (SQLITE_READ_ONLY=0 keeps them writable).
+# Importing the app does no slow work: the Gemini client is created on the first sentiment request
+# and the title index is built in the background, so a worker answers requests as soon as it starts.
+
+def warm_title_autocomplete():
+    def run():
+        with app.app_context():
+            try:
+                sync_title_autocomplete(force=True)
+            except OperationalError as e:
+                print(f"⚠ Title autocomplete not built (database not ready): {e}")
+
+    threading.Thread(target=run, daemon=True).start()
+
+# Settings consumed while this module is imported (engines, response cache, sentiment generator)
+IMPORT_TIME_SETTINGS = ('SQLALCHEMY_DATABASE_URI', 'SQLALCHEMY_ENGINE_OPTIONS', 'SQLALCHEMY_BINDS',
+                        'RESPONSE_CACHE_SIZE', 'SENTIMENT_MAX_GENERATING', 'SENTIMENT_MAX_QUEUED')
+
+_app_prepared = False
+_app_prepare_lock = threading.Lock()
+
+def create_app(config=None):
+    """Prepare the module's app for a production server and return it.
+
+    Not a factory: the app, its database engines and their listeners are created when this module
+    is imported, from the environment (DATABASE_URL, DB_POOL_SIZE, RESPONSE_CACHE_SIZE, ...).
+    `config` can only override settings read per request or per new connection, e.g.
+    {'RESULTS_ENGINE': 'columnar'} or {'GEMINI_API_KEY': ...}; IMPORT_TIME_SETTINGS raise ValueError.
+    The WAL switch, connection reset and autocomplete warm-up run on the first call only; later
+    calls just apply `config`.
+    """
+    fixed = sorted(set(config or {}) & set(IMPORT_TIME_SETTINGS))
+    if fixed:
+        raise ValueError(f"{', '.join(fixed)} must be set through the environment before app is imported")
+
+    global _app_prepared
+    with _app_prepare_lock:
+        if _app_prepared:
+            app.config.update(config or {})
+            return app
+        _app_prepared = True
+
+        app.config['SQLITE_READ_ONLY'] = os.getenv('SQLITE_READ_ONLY', '1') != '0'
+        app.config.update(config or {})
+
+        with app.app_context():
+            if db.engine.dialect.name == 'sqlite':
+                try:
+                    with db.engines['writer'].connect() as connection:
+                        journal_mode = connection.exec_driver_sql("PRAGMA journal_mode = WAL").scalar()
+                    print(f"✓ SQLite journal mode: {journal_mode}")
+                except OperationalError as e:
+                    print(f"⚠ Could not switch the database to WAL mode: {e}")
+            # Connections opened while the app was imported predate these settings
+            for engine in db.engines.values():
+                engine.dispose()
+        warm_title_autocomplete()
+    return app
+
 if __name__ == '__main__':
     app.run(debug=True)
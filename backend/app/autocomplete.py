@@ -0,0 +1,154 @@
+# ============================== #
+# CineMind Title Autocomplete    #
+# In-memory type-ahead index     #
+# ============================== #
+
+# Movie titles are normalized (accents folded, case folded, punctuation dropped) and every
+# word-start suffix of a title is stored in one sorted list, so a prefix lookup is a bisection:
+#   "Star Wars: Episode IV" -> "star wars episode iv", "wars episode iv", "episode iv", "iv"
+# Very short prefixes match a large slice of the catalogue, so their top results are precomputed.
+
+# === Imports === #
+import bisect
+import heapq
+import re
+import threading
+import unicodedata
+
+# === Settings === #
+SHORT_PREFIX_LENGTH = 3   # prefixes up to this length are answered from precomputed lists
+SHORT_PREFIX_DEPTH = 20   # how many results are kept per precomputed prefix
+
+NON_WORD_PATTERN = re.compile(r'[\W_]+', re.UNICODE)
+
+# === Helpers === #
+def normalize(text):
+    """Fold accents and case and collapse punctuation to single spaces: "Amélie!" -> "amelie"."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return NON_WORD_PATTERN.sub(' ', stripped.casefold()).strip()
+
+def title_keys(title):
+    """All word-start suffixes of a normalized title."""
+    words = normalize(title).split()
+    return [' '.join(words[start:]) for start in range(len(words))]
+
+def ranking(movies):
+    """Sort key for movie ids: most popular first, ties broken by lowest id."""
+    return lambda movie_id: (movies[movie_id][1] or 0.0, -movie_id)
+
+def short_prefixes(keys):
+    """Every distinct prefix of up to SHORT_PREFIX_LENGTH characters of the given keys."""
+    return {key[:length] for key in keys for length in range(1, min(SHORT_PREFIX_LENGTH, len(key)) + 1)}
+
+# === Index === #
+class TitleAutocomplete:
+    """Popularity-ranked prefix completion over movie titles.
+
+    The index state is replaced as a whole on every change, so lookups never need a lock;
+    only writers (build/add/remove) are serialized.
+    """
+
+    def __init__(self):
+        self._write_lock = threading.Lock()
+        self._state = {'movies': {}, 'keys': [], 'key_ids': [], 'short_prefixes': {}}
+
+    # --- building --- #
+    @staticmethod
+    def _entries(movies):
+        return sorted((key, movie_id) for movie_id, (title, _) in movies.items() for key in set(title_keys(title)))
+
+    @staticmethod
+    def _top_ids(state, prefix, limit):
+        """The `limit` most popular movies with a key starting with `prefix` (bisects the sorted keys)."""
+        keys, key_ids = state['keys'], state['key_ids']
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + '\uffff', lo=start)
+        return heapq.nlargest(limit, set(key_ids[start:end]), key=ranking(state['movies']))
+
+    def _replace_state(self, movies, entries, changed_prefixes=None):
+        """Swap in a new state; only the precomputed lists of `changed_prefixes` are recomputed (all when None)."""
+        keys = [key for key, _ in entries]
+        state = {'movies': movies, 'keys': keys, 'key_ids': [movie_id for _, movie_id in entries]}
+
+        if changed_prefixes is None:
+            state['short_prefixes'] = {}
+            changed_prefixes = short_prefixes(keys)
+        else:
+            state['short_prefixes'] = dict(self._state['short_prefixes'])
+
+        for prefix in changed_prefixes:
+            top_ids = self._top_ids(state, prefix, SHORT_PREFIX_DEPTH)
+            if top_ids:
+                state['short_prefixes'][prefix] = top_ids
+            else:
+                state['short_prefixes'].pop(prefix, None)
+
+        self._state = state
+
+    def build(self, rows):
+        """Rebuild the whole index from (id, title, popularity) rows."""
+        movies = {movie_id: (title, popularity) for movie_id, title, popularity in rows}
+        entries = self._entries(movies)
+        with self._write_lock:
+            self._replace_state(movies, entries)
+
+    def add(self, rows):
+        """Add new movies, or replace existing ones, from (id, title, popularity) rows.
+
+        New entries are sorted on their own and merged into the existing list, and only the
+        precomputed short prefixes they touch are recomputed, so no full re-sort is needed.
+        """
+        added = {movie_id: (title, popularity) for movie_id, title, popularity in rows}
+        if not added:
+            return
+
+        with self._write_lock:
+            state = self._state
+            replaced = {movie_id: state['movies'][movie_id] for movie_id in added if movie_id in state['movies']}
+            movies = dict(state['movies'])
+            movies.update(added)
+
+            new_entries = self._entries(added)
+            kept = ((key, movie_id) for key, movie_id in zip(state['keys'], state['key_ids']) if movie_id not in added)
+            entries = list(heapq.merge(kept, new_entries))
+
+            changed_keys = [key for key, _ in new_entries] + [key for key, _ in self._entries(replaced)]
+            self._replace_state(movies, entries, short_prefixes(changed_keys))
+
+    def remove(self, movie_ids):
+        """Drop movies from the index."""
+        with self._write_lock:
+            state = self._state
+            removed = {movie_id: state['movies'][movie_id] for movie_id in movie_ids if movie_id in state['movies']}
+            if not removed:
+                return
+
+            movies = {movie_id: value for movie_id, value in state['movies'].items() if movie_id not in removed}
+            entries = [(key, movie_id) for key, movie_id in zip(state['keys'], state['key_ids']) if movie_id not in removed]
+            self._replace_state(movies, entries, short_prefixes(key for key, _ in self._entries(removed)))
+
+    # --- lookups --- #
+    def __len__(self):
+        return len(self._state['movies'])
+
+    def __contains__(self, movie_id):
+        return movie_id in self._state['movies']
+
+    def movie_ids(self):
+        return set(self._state['movies'])
+
+    def suggest(self, query, limit=5):
+        """Return up to `limit` [(id, title)] whose title has a word starting with `query`, most popular first."""
+        state = self._state
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        if len(prefix) <= SHORT_PREFIX_LENGTH and limit <= SHORT_PREFIX_DEPTH:
+            ids = state['short_prefixes'].get(prefix, [])[:limit]
+        else:
+            ids = self._top_ids(state, prefix, limit)
+
+        movies = state['movies']
+        return [(movie_id, movies[movie_id][0]) for movie_id in ids]
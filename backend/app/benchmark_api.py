@@ -0,0 +1,202 @@
+# ============================== #
+# CineMind API Benchmark         #
+# Latency / queries / payload    #
+# ============================== #
+
+# Runs every endpoint of check_query_plans.ENDPOINTS against a synthetic catalogue through the
+# Flask test client and reports p50/p95/p99 latency, SQL queries per request and payload size.
+# Results are saved as JSON (with the git commit and the database file size) so two runs can be compared.
+#
+# Usage (from backend/app):
+#   python benchmark_api.py --movies 100000 --out bench_100k.json
+#   python benchmark_api.py --db /tmp/my_catalogue.db --iterations 50 --out bench.json
+#   python benchmark_api.py --results-engine columnar --out bench_columnar.json
+#   python benchmark_api.py --compare bench_before.json bench_after.json
+
+# === Imports === #
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import synthetic_catalogue
+
+# === Settings === #
+DEFAULT_ITERATIONS = 30
+DEFAULT_WARMUP = 2  # Untimed requests per endpoint first (builds stored documents, warms SQLite's page cache)
+REGRESSION_THRESHOLD = 1.25  # --compare flags endpoints whose p95 got this much slower
+
+# === Helpers === #
+def percentile(values, percent):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def catalogue_path(movies, seed):
+    """Benchmark databases are cached in the temp directory, one per (size, seed)."""
+    return os.path.join(tempfile.gettempdir(), "cinemind_benchmarks", f"catalogue_{movies}_seed{seed}.db")
+
+def prepare_catalogue(args):
+    """Return the database to benchmark, generating it when needed."""
+    if args.db:
+        return args.db
+    path = catalogue_path(args.movies, args.seed)
+    if os.path.exists(path):
+        synthetic_catalogue.create_schema(path)  # Apply migrations added since it was generated
+        print(f"Reusing {path}")
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        synthetic_catalogue.generate(path, args.movies, args.seed)
+    return path
+
+# === Benchmark === #
+def run(db_path, iterations, warmup, response_cache, results_engine='sql'):
+    # The app reads these at import time
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.abspath(db_path)}"
+    os.environ['SENTIMENT_ON_DEMAND'] = '0'  # Never call Gemini from a benchmark
+    os.environ['RESPONSE_CACHE_SIZE'] = os.environ.get('RESPONSE_CACHE_SIZE', '512') if response_cache else '0'
+    os.environ['RESULTS_ENGINE'] = results_engine
+
+    from sqlalchemy import event
+    from check_query_plans import ENDPOINTS, sample_ids
+    from app import app, db, build_results_snapshot
+
+    client = app.test_client()
+    query_count = [0]
+
+    def count_query(*_):
+        query_count[0] += 1
+
+    results = {}
+    with app.app_context():
+        ids = sample_ids()
+        if results_engine == 'columnar':
+            build_results_snapshot()  # Otherwise the first requests fall back to SQL while it builds
+        event.listen(db.engine, 'before_cursor_execute', count_query)
+
+    for url_template, _ in ENDPOINTS:
+        url = url_template.format(**ids)
+        for _ in range(warmup):
+            client.get(url)
+
+        timings, queries, sizes, status = [], [], [], None
+        for _ in range(iterations):
+            query_count[0] = 0
+            started = time.perf_counter()
+            response = client.get(url)
+            body = response.get_data()
+            timings.append((time.perf_counter() - started) * 1000)
+            queries.append(query_count[0])
+            sizes.append(len(body))
+            status = response.status_code
+
+        results[url_template] = {
+            'url': url,
+            'status': status,
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'p99_ms': round(percentile(timings, 99), 3),
+            'mean_ms': round(sum(timings) / len(timings), 3),
+            'queries': round(sum(queries) / len(queries), 2),
+            'bytes': round(sum(sizes) / len(sizes)),
+        }
+        print(f"{'✓' if status < 500 else '⚠'} {url:<70} p50 {results[url_template]['p50_ms']:>8.2f} ms   "
+              f"p95 {results[url_template]['p95_ms']:>8.2f} ms   {results[url_template]['queries']:>5} queries   "
+              f"{results[url_template]['bytes']:>9} B")
+
+    return results
+
+def catalogue_size(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT count(*) FROM movies").fetchone()[0]
+    finally:
+        conn.close()
+
+# === Compare === #
+def compare(before_path, after_path, threshold=REGRESSION_THRESHOLD):
+    """Print p50/p95 changes between two result files; returns the number of regressions."""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    print(f"Before: {before['meta'].get('commit')} ({before['meta']['movies']} movies)")
+    print(f"After:  {after['meta'].get('commit')} ({after['meta']['movies']} movies)")
+    if before['meta'].get('db_bytes') and after['meta'].get('db_bytes'):
+        print(f"Database: {before['meta']['db_bytes'] / 1e6:.1f} MB -> {after['meta']['db_bytes'] / 1e6:.1f} MB")
+    print()
+
+    regressions = 0
+    for endpoint, new in after['endpoints'].items():
+        old = before['endpoints'].get(endpoint)
+        if old is None:
+            print(f"  {endpoint:<70} (new endpoint)")
+            continue
+        ratio = new['p95_ms'] / old['p95_ms'] if old['p95_ms'] else 1.0
+        flag = '⚠' if ratio > threshold else ' '
+        regressions += ratio > threshold
+        print(f"{flag} {endpoint:<70} p50 {old['p50_ms']:>8.2f} -> {new['p50_ms']:>8.2f} ms   "
+              f"p95 {old['p95_ms']:>8.2f} -> {new['p95_ms']:>8.2f} ms ({ratio:.2f}x)   "
+              f"queries {old['queries']} -> {new['queries']}")
+
+    print("\n=== Summary ===")
+    print(f"Endpoints compared: {len(after['endpoints'])}")
+    print(f"Regressions (p95 > {threshold}x): {regressions}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CineMind API against a synthetic catalogue.")
+    parser.add_argument("--movies", type=int, default=10_000, help="Size of the generated catalogue (e.g. 10000, 100000, 1000000)")
+    parser.add_argument("--seed", type=int, default=synthetic_catalogue.DEFAULT_SEED)
+    parser.add_argument("--db", help="Benchmark this database instead of a generated one")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="Timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--response-cache", action="store_true", help="Keep the in-memory response cache enabled")
+    parser.add_argument("--results-engine", choices=("sql", "columnar"), default="sql", help="Engine answering /results filters")
+    parser.add_argument("--out", help="Write the results to this JSON file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+
+    db_path = prepare_catalogue(args)
+    endpoints = run(db_path, args.iterations, args.warmup, args.response_cache, args.results_engine)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'movies': catalogue_size(db_path),
+            'db_bytes': os.path.getsize(db_path),
+            'seed': None if args.db else args.seed,
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+            'response_cache': args.response_cache,
+            'results_engine': args.results_engine,
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+        },
+        'endpoints': endpoints,
+    }
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Results saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
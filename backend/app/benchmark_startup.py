@@ -0,0 +1,152 @@
+# ============================== #
+# CineMind Startup Benchmark     #
+# Import time / first responses  #
+# ============================== #
+
+# Starts fresh Python processes that import the app and time it, then time the first request to a
+# few endpoints through the Flask test client. The processes run without GEMINI_API_KEY and outside
+# the directories searched for .env files, so this also checks that the app boots in degraded mode
+# (sentiment generation answers 503, everything else works).
+#
+# Usage (from backend/app):
+#   python benchmark_startup.py --movies 100000 --out startup_100k.json
+#   python benchmark_startup.py --db /tmp/my_catalogue.db --runs 10 --imports
+
+# === Imports === #
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+import synthetic_catalogue
+from benchmark_api import catalogue_size, git_commit, percentile, prepare_catalogue
+
+# === Settings === #
+DEFAULT_RUNS = 5
+TOP_IMPORTS = 15  # Slowest imports listed by --imports
+
+# First requests timed in every process; {movie_id} is a movie with reviews
+ENDPOINTS = [
+    '/',
+    '/movies',
+    '/results?genre=1',
+    '/movies/suggest?query=the',  # Builds the title index
+    '/movies/{movie_id}/sentiment',  # 503 without an API key, unless a summary is stored
+]
+
+# Run in each fresh process: prints the timings as JSON
+CHILD_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+import app
+timings = {'import_ms': (time.perf_counter() - started) * 1000}
+client = app.app.test_client()
+for url in sys.argv[1:]:
+    request_started = time.perf_counter()
+    status = client.get(url).status_code
+    timings[url] = {'ms': (time.perf_counter() - request_started) * 1000, 'status': status}
+print(json.dumps(timings))
+'''
+
+# === Helpers === #
+def child_env(db_path):
+    env = {key: value for key, value in os.environ.items() if key != 'GEMINI_API_KEY'}
+    env['DATABASE_URL'] = f"sqlite:///{os.path.abspath(db_path)}"
+    env['PYTHONPATH'] = os.path.dirname(os.path.abspath(__file__))
+    env['RESPONSE_CACHE_SIZE'] = '0'
+    return env
+
+def sample_movie_id(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute("SELECT movie_id FROM movie_reviews ORDER BY movie_id LIMIT 1").fetchone()
+        return row[0] if row else 1
+    finally:
+        conn.close()
+
+def slowest_imports(db_path, workdir, limit=TOP_IMPORTS):
+    """(module, cumulative ms) of the slowest top-level imports of the app, from python -X importtime."""
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=workdir,
+                             env=child_env(db_path), capture_output=True, text=True, check=True)
+    imports = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.startswith('   ') and not name.startswith('    '):  # Imported by app itself (one level deep)
+            imports.append((name.strip(), int(cumulative) / 1000))
+    return sorted(imports, key=lambda item: -item[1])[:limit]
+
+def answered(url, status):
+    """Whether a first request worked; sentiment generation may only be unavailable (503)."""
+    return status < 500 or (url.endswith('/sentiment') and status == 503)
+
+# === Benchmark === #
+def run(db_path, runs):
+    urls = [url.format(movie_id=sample_movie_id(db_path)) for url in ENDPOINTS]
+    samples = []
+    with tempfile.TemporaryDirectory() as workdir:  # No .env in any of the searched locations
+        for _ in range(runs):
+            process = subprocess.run([sys.executable, '-c', CHILD_SCRIPT, *urls], cwd=workdir,
+                                     env=child_env(db_path), capture_output=True, text=True, check=True)
+            samples.append(json.loads(process.stdout.strip().splitlines()[-1]))
+        imports = slowest_imports(db_path, workdir)
+
+    import_times = [sample['import_ms'] for sample in samples]
+    results = {'import': {'p50_ms': round(percentile(import_times, 50), 1), 'max_ms': round(max(import_times), 1)}}
+    print(f"  {'import app':<40} p50 {results['import']['p50_ms']:>8.1f} ms   max {results['import']['max_ms']:>8.1f} ms")
+    for url in urls:
+        times = [sample[url]['ms'] for sample in samples]
+        status = samples[-1][url]['status']
+        results[url] = {'status': status, 'p50_ms': round(percentile(times, 50), 1), 'max_ms': round(max(times), 1)}
+        print(f"{'✓' if answered(url, status) else '⚠'} {url:<40} p50 {results[url]['p50_ms']:>8.1f} ms   "
+              f"max {results[url]['max_ms']:>8.1f} ms   ({status}, first request)")
+    return results, imports
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how long the CineMind API takes to import and answer its first requests.")
+    parser.add_argument("--movies", type=int, default=10_000, help="Size of the generated catalogue")
+    parser.add_argument("--seed", type=int, default=synthetic_catalogue.DEFAULT_SEED)
+    parser.add_argument("--db", help="Use this database instead of a generated one")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Fresh processes started")
+    parser.add_argument("--imports", action="store_true", help="Also list the slowest imports")
+    parser.add_argument("--out", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    db_path = prepare_catalogue(args)
+    print(f"Starting the app {args.runs} times against {db_path} (no GEMINI_API_KEY)\n")
+    results, imports = run(db_path, args.runs)
+
+    if args.imports:
+        print("\nSlowest imports:")
+        for name, ms in imports:
+            print(f"  {name:<40} {ms:>8.1f} ms")
+
+    print("\n=== Summary ===")
+    print(f"Import time (p50): {results['import']['p50_ms']} ms")
+    working = all(answered(url, result['status']) for url, result in results.items() if url != 'import')
+    print(f"Degraded mode (no API key): {'all endpoints answered' if working else 'some endpoints failed'}")
+
+    if args.out:
+        report = {
+            'meta': {
+                'commit': git_commit(),
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'movies': catalogue_size(db_path),
+                'runs': args.runs,
+                'python': platform.python_version(),
+            },
+            'startup': results,
+            'imports': [{'module': name, 'ms': round(ms, 1)} for name, ms in imports],
+        }
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Results saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
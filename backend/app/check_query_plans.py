@@ -0,0 +1,163 @@
+# ============================== #
+# CineMind Query Plan Check      #
+# EXPLAIN every endpoint's SQL   #
+# ============================== #
+
+# Calls the API endpoints through the Flask test client, records every SQL statement they run
+# and asks SQLite for its plan. A statement that scans a whole table without an index fails the
+# check, unless the endpoint is meant to read that whole table (e.g. /genres lists every genre).
+#
+# Usage (from backend/app, against the migrated database):
+#   python check_query_plans.py        # exit code 1 when any query falls back to a full table scan
+#   python check_query_plans.py -v     # also print the plan of every statement
+
+# === Imports === #
+import argparse
+import os
+import re
+import sys
+
+os.environ.setdefault('RESPONSE_CACHE_SIZE', '0')  # Every request must reach the database
+
+from sqlalchemy import event, text
+from app import app, db
+
+# === Endpoints === #
+# (URL, tables the endpoint is expected to read in full)
+# {movie_id}, {genre_id}, ... are filled in with ids that exist in the database, {title_word} with a word of a title
+ENDPOINTS = [
+    ('/movies', ()),
+    ('/movies?page=5&per_page=20', ()),
+    ('/movies?cursor=&per_page=20', ()),
+    ('/genres', ('genres',)),
+    ('/cast', ('cast',)),
+    ('/keywords', ('keywords',)),
+    ('/production_countries', ('production_countries',)),
+    ('/spoken_languages', ('spoken_languages',)),
+    ('/featured', ()),
+    ('/popular', ()),
+    ('/explore', ('movies',)),  # The first request loads the random sampler
+    ('/movies/{movie_id}', ()),
+    ('/movies/ids', ('movies',)),
+    # The first facet request builds the facet index
+    ('/movies/genre/{genre_id}', ('movie_genre', 'movie_keywords', 'movie_production_countries', 'movie_spoken_languages')),
+    ('/movies/keyword/{keyword_id}', ()),
+    ('/movies/actor/{actor_id}', ()),
+    ('/movies/country/{country_id}', ()),
+    ('/movies/language/{language_id}', ()),
+    ('/movies/facets?actor={actor_id}&genre={genre_id}', ()),
+    ('/movies/facets?genre={genre_id},1&country=-{country_id}&page=2', ()),
+    ('/movies/search?title={title_word}', ()),
+    ('/movies/search?title={title_word}&genre_id={genre_id}&language_id={language_id}', ()),
+    ('/movies/suggest?query={title_word}', ('movies',)),  # The first request builds the title index
+    ('/results', ()),
+    ('/results?page=3&sort_by=vote_average&order=asc', ()),
+    ('/results?sort_by=vote_count', ()),
+    ('/results?sort_by=runtime', ()),
+    ('/results?sort_by=release_date', ()),
+    ('/results?sort_by=title&order=asc', ()),
+    ('/results?language=en', ()),
+    ('/results?language=en&sort_by=release_date', ()),
+    ('/results?genre={genre_id}', ()),
+    ('/results?genre={genre_id}&language=en&sort_by=vote_average', ()),
+    ('/results?query={title_word}&sort_by=relevance', ()),
+    ('/results?cursor=&sort_by=release_date', ()),
+    ('/results?genre={genre_id}&language=en&facets=1', ('genres',)),  # Genre names for the counts
+    ('/movies/{movie_id}/sentiment', ()),
+    ('/movies/{movie_id}/similar', ()),
+    ('/analytics/genres', ('movies', 'movie_genre', 'genres')),  # The first request loads the analytics snapshot
+    ('/analytics/years?group=decade', ()),
+    ('/analytics/financials', ()),
+    ('/analytics/financials/top?metric=roi&top=1000&sort_by=vote_average', ()),
+]
+
+# Plan lines of a full scan: "SCAN movies" or "SCAN movies AS m" (an index scan reads "SCAN movies USING INDEX ...")
+FULL_SCAN_PATTERN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+
+# === Helpers === #
+def sample_ids():
+    """An existing id (or title word) for each URL placeholder."""
+    queries = {
+        'movie_id': "SELECT id FROM movies ORDER BY popularity DESC LIMIT 1",
+        'genre_id': "SELECT genre_id FROM movie_genre LIMIT 1",
+        'keyword_id': "SELECT keyword_id FROM movie_keywords LIMIT 1",
+        'actor_id': "SELECT actor_id FROM movies_cast LIMIT 1",
+        'country_id': "SELECT country_id FROM movie_production_countries LIMIT 1",
+        'language_id': "SELECT language_id FROM movie_spoken_languages LIMIT 1",
+        'title_word': "SELECT title FROM movies ORDER BY popularity DESC LIMIT 1",
+    }
+    ids = {name: db.session.execute(text(sql)).scalar() for name, sql in queries.items()}
+    ids['title_word'] = (ids['title_word'] or 'the').split()[0].lower()  # A search term that matches something
+    return ids
+
+def table_names():
+    return {row[0] for row in db.session.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+
+def explain(connection, statement, parameters):
+    """Plan lines for one recorded statement."""
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[-1] for row in rows]
+
+def full_scans(plan, tables):
+    """Tables read in full by a plan (CTEs and subqueries are not tables, so they are ignored)."""
+    scanned = []
+    for line in plan:
+        match = FULL_SCAN_PATTERN.match(line.strip())
+        if match and match.group(1) in tables:
+            scanned.append(match.group(1))
+    return scanned
+
+# === Check === #
+def check(verbose=False):
+    """Run every endpoint and return the list of (url, statement, plan, tables) that scan unexpectedly."""
+    client = app.test_client()
+    failures = []
+
+    with app.app_context():
+        ids = sample_ids()
+        tables = table_names()
+        connection = db.engine.connect()
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT') and not executemany:
+                statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            for url_template, expected_scans in ENDPOINTS:
+                url = url_template.format(**ids)
+                statements.clear()
+                status = client.get(url).status_code
+                print(f"{'✓' if status < 500 else '⚠'} {url} ({status}, {len(statements)} queries)")
+
+                for statement, parameters in list(statements):
+                    plan = explain(connection, statement, parameters)
+                    scanned = [table for table in full_scans(plan, tables) if table not in expected_scans]
+                    if verbose or scanned:
+                        print('    ' + ' '.join(statement.split())[:160])
+                        for line in plan:
+                            print(f"      {line}")
+                    if scanned:
+                        print(f"    ⚠ Full scan of {', '.join(scanned)}")
+                        failures.append((url, statement, plan, scanned))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+            connection.close()
+
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail when an API query falls back to a full table scan.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print the plan of every statement")
+    args = parser.parse_args()
+
+    failures = check(args.verbose)
+    print("\n=== Summary ===")
+    print(f"Endpoints checked: {len(ENDPOINTS)}")
+    print(f"Queries with unexpected full scans: {len(failures)}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# ============================== #
+# CineMind Columnar Snapshot     #
+# Filter/sort /results in NumPy  #
+# ============================== #
+
+# A read-only copy of the columns /results filters and sorts on, saved as .npy files so every worker
+# process memory-maps the same copy (the OS page cache holds it once). Filters are bitsets (one per
+# genre and per original language) ANDed together; sorts use the order computed when the snapshot
+# was built, so a page is one pass over the matching rows instead of a sort. Facet counts AND every
+# genre and language bitset with the filter in one operation and count the set bits.
+#
+# Ordering follows SQLite exactly: NULLs first when ascending, text compared byte-wise, and ties
+# broken by movie id in the same direction, so results match the SQL path row for row.
+
+# === Imports === #
+import json
+import os
+import shutil
+import uuid
+import numpy as np
+
+# === Settings === #
+NUMERIC_COLUMNS = ('popularity', 'vote_average', 'vote_count', 'runtime', 'release_year', 'budget', 'revenue')
+TEXT_SORT_COLUMNS = ('release_date', 'title')
+SORT_COLUMNS = ('popularity', 'vote_average', 'vote_count', 'runtime') + TEXT_SORT_COLUMNS
+
+# Order of the rows read by build(): (id, popularity, vote_average, vote_count, runtime, release_date, title, budget, revenue, original_language)
+ROW_COLUMNS = ('id', 'popularity', 'vote_average', 'vote_count', 'runtime', 'release_date', 'title', 'budget', 'revenue', 'original_language')
+
+CURRENT_FILE = 'CURRENT'  # Names the snapshot directory in use, replaced atomically when a new one is built
+
+# === Build === #
+def sqlite_order(values, ids):
+    """Row positions in SQLite's ascending order of `values` (NULLs first), ties by id."""
+    if values.dtype == object:
+        return np.array(sorted(range(len(values)), key=lambda i: (values[i] is not None, values[i] or '', ids[i])), dtype=np.int32)
+    known = ~np.isnan(values)
+    return np.lexsort((ids, np.where(known, values, 0.0), known)).astype(np.int32)
+
+def bitsets(keys, values):
+    """One packed bitset per key over the rows where `values` equals it."""
+    if not len(keys):
+        return np.zeros((0, (len(values) + 7) // 8), dtype=np.uint8)
+    return np.stack([np.packbits(values == key) for key in keys])
+
+def build(root, version, movie_rows, genre_rows):
+    """Write a snapshot of `movie_rows` (ROW_COLUMNS) and (movie_id, genre_id) `genre_rows`, publish it and return its path."""
+    columns = dict(zip(ROW_COLUMNS, zip(*movie_rows))) if movie_rows else {name: () for name in ROW_COLUMNS}
+    ids = np.array(columns['id'], dtype=np.int64)
+
+    arrays = {'ids': ids}
+    for name in ('popularity', 'vote_average', 'vote_count', 'runtime', 'budget', 'revenue'):
+        arrays[name] = np.array([np.nan if value is None else value for value in columns[name]], dtype=np.float64)
+    release_dates = np.array(columns['release_date'], dtype=object)
+    arrays['release_year'] = np.array([float(date[:4]) if date and date[:4].isdigit() else np.nan for date in release_dates], dtype=np.float64)
+
+    for name in SORT_COLUMNS:
+        values = np.array(columns[name], dtype=object) if name in TEXT_SORT_COLUMNS else arrays[name]
+        arrays[f'order_{name}'] = sqlite_order(values, ids)
+
+    # Genre and language bitsets, one row per genre id / language, bit i set when row i matches
+    positions = {movie_id: position for position, movie_id in enumerate(ids.tolist())}
+    genre_ids = sorted({genre_id for _, genre_id in genre_rows})
+    genre_index = {genre_id: row for row, genre_id in enumerate(genre_ids)}
+    genre_matrix = np.zeros((len(genre_ids), len(ids)), dtype=bool)
+    for movie_id, genre_id in genre_rows:
+        if movie_id in positions:
+            genre_matrix[genre_index[genre_id], positions[movie_id]] = True
+    arrays['genre_bits'] = np.packbits(genre_matrix, axis=1) if len(genre_ids) else bitsets([], ids)
+
+    languages = np.array(columns['original_language'], dtype=object)
+    language_keys = sorted({language for language in languages if language is not None})
+    arrays['language_bits'] = bitsets(language_keys, languages)
+
+    path = os.path.join(root, f'snapshot-{version}-{uuid.uuid4().hex[:8]}')
+    os.makedirs(path)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f'{name}.npy'), array)
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump({'version': version, 'movies': len(ids), 'genre_ids': genre_ids, 'languages': language_keys}, f)
+
+    publish(root, path)
+    return path
+
+def publish(root, path):
+    """Point CURRENT at `path` and remove older snapshots (workers still mapping them keep their copy)."""
+    pointer = os.path.join(root, f'{CURRENT_FILE}.{uuid.uuid4().hex[:8]}')
+    with open(pointer, 'w') as f:
+        f.write(os.path.basename(path))
+    os.replace(pointer, os.path.join(root, CURRENT_FILE))
+
+    for name in os.listdir(root):
+        if name.startswith('snapshot-') and name != os.path.basename(path):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+def current_path(root):
+    """Directory of the published snapshot, or None."""
+    try:
+        with open(os.path.join(root, CURRENT_FILE)) as f:
+            path = os.path.join(root, f.read().strip())
+    except OSError:
+        return None
+    return path if os.path.isdir(path) else None
+
+# === Query === #
+class ResultsSnapshot:
+    """A published snapshot, memory-mapped read-only."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        self.version = meta['version']
+        self.size = meta['movies']
+        self.genre_rows = {genre_id: row for row, genre_id in enumerate(meta['genre_ids'])}
+        self.language_rows = {language: row for row, language in enumerate(meta['languages'])}
+        self.arrays = {
+            name[:-len('.npy')]: np.load(os.path.join(path, name), mmap_mode='r')
+            for name in os.listdir(path) if name.endswith('.npy')
+        }
+
+    def bits(self, genre_ids, language):
+        """Packed bitset of the matching rows, None for no filter; False when nothing can match."""
+        rows = []
+        if language:
+            if language not in self.language_rows:
+                return False
+            rows.append(self.arrays['language_bits'][self.language_rows[language]])
+        if genre_ids:
+            # The SQL filter requires a movie to have len(genre_ids) matching genres, so a repeated id matches nothing
+            if len(set(genre_ids)) != len(genre_ids) or any(genre_id not in self.genre_rows for genre_id in genre_ids):
+                return False
+            rows += [self.arrays['genre_bits'][self.genre_rows[genre_id]] for genre_id in genre_ids]
+        if not rows:
+            return None
+        return np.bitwise_and.reduce(rows)
+
+    def mask(self, genre_ids, language):
+        """Boolean mask of the matching rows, None for no filter; False when nothing can match."""
+        bits = self.bits(genre_ids, language)
+        if bits is None or bits is False:
+            return bits
+        return np.unpackbits(bits, count=self.size).view(bool)
+
+    def facet_counts(self, genre_ids, language):
+        """{'genre': {genre_id: n}, 'language': {language: n}, 'decade': {decade: n}} over the matching rows."""
+        bits = self.bits(genre_ids, language)
+        if bits is False:
+            return {'genre': {}, 'language': {}, 'decade': {}}
+
+        counts = {}
+        for facet, rows in (('genre', self.genre_rows), ('language', self.language_rows)):
+            matrix = self.arrays[f'{facet}_bits']
+            if bits is not None:
+                matrix = matrix & bits  # Every genre's (language's) bitset ANDed with the filter at once
+            totals = np.bitwise_count(matrix).sum(axis=1, dtype=np.int64)
+            counts[facet] = {key: int(totals[row]) for key, row in rows.items() if totals[row]}
+
+        years = np.asarray(self.arrays['release_year'])
+        if bits is not None:
+            years = years[np.unpackbits(bits, count=self.size).view(bool)]
+        decades, totals = np.unique(years[~np.isnan(years)] // 10 * 10, return_counts=True)
+        counts['decade'] = {int(decade): int(total) for decade, total in zip(decades, totals)}
+        return counts
+
+    def query(self, genre_ids, language, sort_by, order, page, per_page):
+        """Movie ids of one page and the total number of matches."""
+        mask = self.mask(genre_ids, language)
+        if mask is False:
+            return [], 0
+
+        ordered = self.arrays[f'order_{sort_by if sort_by in SORT_COLUMNS else "popularity"}']
+        if order != 'asc':
+            ordered = ordered[::-1]
+        if mask is not None:
+            ordered = ordered[mask[ordered]]
+
+        start = (page - 1) * per_page
+        return self.arrays['ids'][ordered[start:start + per_page]].tolist(), len(ordered)
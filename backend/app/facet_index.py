@@ -0,0 +1,130 @@
+# ============================== #
+# CineMind Facet Index           #
+# Inverted index over join rows  #
+# ============================== #
+
+# Maps every genre, keyword, actor, production country and spoken language id to a posting list of
+# the movies that have it, so facet lookups and their combinations never join tables in SQL.
+#
+# Movies are numbered by popularity (rank 0 = most popular) and posting lists hold sorted ranks:
+# dense small integers, so AND/OR/NOT run in linear time over boolean masks, and a result comes out
+# already in popularity order. Each facet is stored CSR-style (sorted keys, offsets into one array of
+# postings) as .npy files that every worker process memory-maps, published like the columnar snapshot.
+
+# === Imports === #
+import itertools
+import json
+import os
+import uuid
+import numpy as np
+
+import columnar  # Snapshot publishing (CURRENT pointer)
+
+# === Settings === #
+FACETS = ('genre', 'keyword', 'actor', 'country', 'language')
+
+# === Build === #
+def first_of_runs(values):
+    """Boolean mask of the elements of a sorted array that differ from the previous one."""
+    mask = np.ones(len(values), dtype=bool)
+    mask[1:] = values[1:] != values[:-1]
+    return mask
+
+def postings(ranks, keys):
+    """(sorted unique keys, offsets, ranks grouped by key and sorted) for parallel rank/key arrays."""
+    combined = np.sort((keys.astype(np.int64) << 32) | ranks.astype(np.int64))  # By key, then rank
+    combined = combined[first_of_runs(combined)]  # Repeated join rows count once
+    grouped_keys = combined >> 32
+    starts = np.flatnonzero(first_of_runs(grouped_keys))
+    unique_keys = grouped_keys[starts]
+    offsets = np.append(starts, len(combined)).astype(np.int64)
+    return unique_keys, offsets, (combined & 0xFFFFFFFF).astype(np.int32)
+
+def build(root, version, ranked_ids, pairs):
+    """Write an index, publish it and return its path.
+
+    `ranked_ids` are all movie ids, most popular first; `pairs` maps each facet to its
+    (movie_id, facet_id) join rows. Rows of movies missing from `ranked_ids` are ignored.
+    """
+    ids = np.asarray(ranked_ids, dtype=np.int64)
+    sorter = np.argsort(ids)
+    arrays = {'ids': ids}
+
+    for facet in FACETS:
+        # Flattened first: np.asarray on a list of result rows inspects every row object and is far slower
+        rows = np.fromiter(itertools.chain.from_iterable(pairs.get(facet, ())), dtype=np.int64).reshape(-1, 2)
+        positions = np.searchsorted(ids, rows[:, 0], sorter=sorter) if len(ids) else np.zeros(len(rows), dtype=np.int64)
+        positions = np.minimum(positions, max(len(ids) - 1, 0))
+        known = ids[sorter[positions]] == rows[:, 0] if len(ids) else np.zeros(len(rows), dtype=bool)
+        keys, offsets, ranks = postings(sorter[positions[known]], rows[known, 1])
+        arrays[f'{facet}_keys'], arrays[f'{facet}_offsets'], arrays[f'{facet}_postings'] = keys, offsets, ranks
+
+    path = os.path.join(root, f'snapshot-{version}-{uuid.uuid4().hex[:8]}')
+    os.makedirs(path)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f'{name}.npy'), array)
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump({'version': version, 'movies': len(ids)}, f)
+
+    columnar.publish(root, path)
+    return path
+
+# === Query === #
+class FacetIndex:
+    """A published index, memory-mapped read-only."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        self.version = meta['version']
+        self.size = meta['movies']
+        self.arrays = {
+            name[:-len('.npy')]: np.load(os.path.join(path, name), mmap_mode='r')
+            for name in os.listdir(path) if name.endswith('.npy')
+        }
+
+    def posting(self, facet, key):
+        """Sorted ranks of the movies having `key`."""
+        keys = self.arrays[f'{facet}_keys']
+        position = int(np.searchsorted(keys, key))
+        if position == len(keys) or keys[position] != key:
+            return np.zeros(0, dtype=np.int32)
+        offsets = self.arrays[f'{facet}_offsets']
+        return self.arrays[f'{facet}_postings'][offsets[position]:offsets[position + 1]]
+
+    def any_of(self, facet, keys):
+        """Sorted ranks of the movies having at least one of `keys`."""
+        lists = [self.posting(facet, key) for key in set(keys)]
+        if len(lists) == 1:
+            return lists[0]
+        mask = np.zeros(self.size, dtype=bool)
+        for ranks in lists:
+            mask[ranks] = True
+        return np.flatnonzero(mask)
+
+    def evaluate(self, clauses):
+        """Ranks matching every (facet, keys, negated) clause, most popular first.
+
+        A clause matches movies having any of its keys, or, when negated, none of them.
+        """
+        included = sorted((self.any_of(facet, keys) for facet, keys, negated in clauses if not negated), key=len)
+        excluded = [self.any_of(facet, keys) for facet, keys, negated in clauses if negated]
+
+        result = included[0] if included else np.arange(self.size)
+        mask = np.zeros(self.size, dtype=bool)
+        for ranks in included[1:]:
+            if not len(result):
+                break
+            mask[:] = False
+            mask[ranks] = True
+            result = result[mask[result]]
+        if excluded and len(result):
+            mask[:] = False
+            for ranks in excluded:
+                mask[ranks] = True
+            result = result[~mask[result]]
+        return result
+
+    def movie_ids(self, ranks):
+        return self.arrays['ids'][ranks].tolist()
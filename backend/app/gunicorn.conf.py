@@ -0,0 +1,39 @@
+# ============================== #
+# CineMind Gunicorn Config       #
+# Production server settings     #
+# ============================== #
+
+# Picked up automatically when gunicorn is started from backend/app:
+#   gunicorn "app:create_app()"
+# One worker process per core, each with a few threads and its own pool of SQLite connections.
+# The environment variables below (or gunicorn's command line options) override the defaults.
+
+# === Imports === #
+import multiprocessing
+import os
+import sys
+
+# === Settings === #
+bind = os.getenv('BIND', '127.0.0.1:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = 120  # Sentiment requests can wait on Gemini for a while
+keepalive = 5
+max_requests = 10_000  # Recycle workers now and then; the jitter keeps them from restarting together
+max_requests_jitter = 1_000
+accesslog = os.getenv('ACCESS_LOG')  # e.g. '-' for stdout; off by default
+preload_app = False  # Each worker imports the app itself, so no SQLite connection is shared across a fork
+
+# One pooled connection per thread (workers import the app after this file is read)
+os.environ.setdefault('DB_POOL_SIZE', str(threads))
+
+# === Hooks === #
+def post_fork(server, worker):
+    """With --preload, drop the connections the master opened while importing the app."""
+    module = sys.modules.get('app')
+    if module is None:
+        return
+    with module.app.app_context():
+        for engine in module.db.engines.values():
+            engine.dispose(close=False)
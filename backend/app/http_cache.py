@@ -0,0 +1,61 @@
+# ============================== #
+# CineMind Response Cache        #
+# ETags + rendered responses     #
+# ============================== #
+
+# Catalogue responses only change when the catalogue changes. Database triggers bump a single
+# version number on every write to a catalogue table, so (version, URL) identifies a response:
+# it is the ETag sent to clients and the key of the server-side cache of rendered bodies.
+
+# === Imports === #
+import hashlib
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+# === Settings === #
+DEFAULT_MAX_ENTRIES = 512  # Rendered responses kept in memory
+
+# === Helpers === #
+def request_key(path, args):
+    """Canonical cache key for a URL: query parameters sorted, so ?a=1&b=2 and ?b=2&a=1 share an entry."""
+    query = urlencode(sorted(args.items(multi=True)))
+    return f"{path}?{query}" if query else path
+
+def make_etag(version, key):
+    """Strong ETag for the response to `key` at a catalogue version."""
+    return hashlib.sha256(f"{version}\n{key}".encode('utf-8')).hexdigest()[:32]
+
+# === Cache === #
+class ResponseCache:
+    """Bounded LRU of rendered response bodies keyed by URL.
+
+    An entry is only returned for the catalogue version it was rendered at,
+    so a version bump invalidates every entry without having to clear them.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        """Return (body, mimetype) rendered at `version`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def put(self, key, version, body, mimetype):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (version, body, mimetype)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,147 @@
+# ============================== #
+# CineMind Instrumentation       #
+# Request timings + metrics      #
+# ============================== #
+
+# Every request collects its SQL queries and timings in a RequestStats object. When the request
+# ends, the stats go into a Server-Timing header, the Prometheus metrics below and, for slow
+# requests, the slow-request log. app.py wires this to the SQLAlchemy and Flask hooks.
+
+# === Imports === #
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# === Settings === #
+# Upper bounds (seconds) of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SLOWEST_STATEMENT_LENGTH = 300  # Characters of the slowest SQL statement kept for the slow-request log
+
+# === Per-request Stats === #
+class RequestStats:
+    """Timings collected while one request is handled."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.timings = {'db': 0.0, 'json': 0.0, 'gemini': 0.0}  # Seconds spent per activity
+        self.slowest_statement = (0.0, None)
+
+    def add_query(self, statement, duration):
+        self.queries += 1
+        self.timings['db'] += duration
+        if duration > self.slowest_statement[0]:
+            self.slowest_statement = (duration, ' '.join(statement.split())[:SLOWEST_STATEMENT_LENGTH])
+
+    def add_time(self, activity, duration):
+        self.timings[activity] = self.timings.get(activity, 0.0) + duration
+
+    @contextmanager
+    def timed(self, activity):
+        """Add the time spent in the `with` block to `activity`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(activity, time.perf_counter() - started)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total):
+        """Value of the Server-Timing header, durations in milliseconds."""
+        parts = [f'db;dur={self.timings["db"] * 1000:.2f};desc="{self.queries} queries"']
+        parts += [f'{activity};dur={duration * 1000:.2f}' for activity, duration in self.timings.items()
+                  if activity != 'db' and duration]
+        parts.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(parts)
+
+# === Metrics === #
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+class Metrics:
+    """Process-wide request metrics, rendered in the Prometheus text exposition format."""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests = {}   # (endpoint, method, status) -> count
+        self._endpoints = {}  # endpoint -> aggregated timings and histogram
+
+    def record(self, endpoint, method, status, duration, stats, slow=False):
+        with self._lock:
+            key = (endpoint, method, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+            totals = self._endpoints.get(endpoint)
+            if totals is None:
+                totals = self._endpoints[endpoint] = {
+                    'buckets': [0] * len(self.buckets), 'count': 0, 'sum': 0.0,
+                    'queries': 0, 'activities': {}, 'slow': 0,
+                }
+            position = bisect.bisect_left(self.buckets, duration)
+            if position < len(self.buckets):
+                totals['buckets'][position] += 1
+            totals['count'] += 1
+            totals['sum'] += duration
+            totals['queries'] += stats.queries
+            totals['slow'] += slow
+            for activity, seconds in stats.timings.items():
+                totals['activities'][activity] = totals['activities'].get(activity, 0.0) + seconds
+
+    def render(self):
+        """All metrics as Prometheus text."""
+        with self._lock:
+            requests = dict(self._requests)
+            endpoints = {endpoint: {**totals, 'buckets': list(totals['buckets']), 'activities': dict(totals['activities'])}
+                         for endpoint, totals in self._endpoints.items()}
+
+        lines = [
+            '# HELP cinemind_requests_total HTTP requests handled.',
+            '# TYPE cinemind_requests_total counter',
+        ]
+        for (endpoint, method, status), count in sorted(requests.items()):
+            lines.append(f'cinemind_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}')
+
+        lines += [
+            '# HELP cinemind_request_duration_seconds Time to handle a request.',
+            '# TYPE cinemind_request_duration_seconds histogram',
+        ]
+        for endpoint, totals in sorted(endpoints.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, totals['buckets']):
+                cumulative += count
+                lines.append(f'cinemind_request_duration_seconds_bucket{_labels(endpoint=endpoint, le=bound)} {cumulative}')
+            lines.append(f'cinemind_request_duration_seconds_bucket{_labels(endpoint=endpoint, le="+Inf")} {totals["count"]}')
+            lines.append(f'cinemind_request_duration_seconds_sum{_labels(endpoint=endpoint)} {totals["sum"]:.6f}')
+            lines.append(f'cinemind_request_duration_seconds_count{_labels(endpoint=endpoint)} {totals["count"]}')
+
+        lines += [
+            '# HELP cinemind_sql_queries_total SQL statements executed while handling requests.',
+            '# TYPE cinemind_sql_queries_total counter',
+        ]
+        lines += [f'cinemind_sql_queries_total{_labels(endpoint=endpoint)} {totals["queries"]}'
+                  for endpoint, totals in sorted(endpoints.items())]
+
+        lines += [
+            '# HELP cinemind_activity_seconds_total Time spent per activity (db, json, gemini) while handling requests.',
+            '# TYPE cinemind_activity_seconds_total counter',
+        ]
+        for endpoint, totals in sorted(endpoints.items()):
+            for activity, seconds in sorted(totals['activities'].items()):
+                lines.append(f'cinemind_activity_seconds_total{_labels(endpoint=endpoint, activity=activity)} {seconds:.6f}')
+
+        lines += [
+            '# HELP cinemind_slow_requests_total Requests slower than the slow-request threshold.',
+            '# TYPE cinemind_slow_requests_total counter',
+        ]
+        lines += [f'cinemind_slow_requests_total{_labels(endpoint=endpoint)} {totals["slow"]}'
+                  for endpoint, totals in sorted(endpoints.items())]
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,59 @@
+# ============================== #
+# CineMind Keyset Pagination     #
+# Opaque cursors for deep pages  #
+# ============================== #
+
+# Instead of OFFSET (which reads and throws away every row before the page), a cursor holds
+# the sort values of the last row returned, and the next page starts right after that row:
+#   ORDER BY popularity DESC, id DESC  ->  WHERE popularity < :p OR (popularity = :p AND id < :id)
+# so every page costs the same as the first one.
+
+# === Imports === #
+import base64
+import json
+from sqlalchemy import and_, false, or_
+
+# === Cursors === #
+def encode_cursor(sort_key, values):
+    """Opaque token for the row with these ORDER BY values, tied to the sort it was made for."""
+    payload = json.dumps([sort_key, list(values)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token, sort_key):
+    """Return the ORDER BY values stored in a cursor; ValueError if it is malformed or was made for another sort."""
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        cursor_sort_key, values = json.loads(payload)
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if cursor_sort_key != sort_key or not isinstance(values, list):
+        raise ValueError('Cursor does not match the requested sort order')
+    return values
+
+# === Conditions === #
+# SQLite sorts NULL before every other value, so NULLs come first ascending and last descending
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+def _after(column, value, descending):
+    """Rows whose `column` comes strictly after `value` in the sort order."""
+    if value is None:
+        return false() if descending else column.isnot(None)
+    if descending:
+        return or_(column < value, column.is_(None))
+    return column > value
+
+def after_condition(keys, values):
+    """WHERE clause selecting the rows that follow `values` for ORDER BY `keys` ([(column, descending)]).
+
+    The last key must be unique (the primary key) so the order is total.
+    """
+    conditions = []
+    for position, ((column, descending), value) in enumerate(zip(keys, values)):
+        ties = [_equal(tied_column, tied_value) for (tied_column, _), tied_value in zip(keys[:position], values[:position])]
+        conditions.append(and_(*ties, _after(column, value, descending)))
+    return or_(*conditions)
+
+def order_by(keys):
+    return [column.desc() if descending else column.asc() for column, descending in keys]
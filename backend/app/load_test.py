@@ -0,0 +1,201 @@
+# ============================== #
+# CineMind Load Test             #
+# Throughput vs worker processes #
+# ============================== #
+
+# Starts gunicorn (with the settings in gunicorn.conf.py) with 1, 2, 4, ... worker processes against
+# a synthetic catalogue, and drives each setup with concurrent keep-alive clients for a fixed time,
+# cycling through the check_query_plans endpoints. Reports requests per second, latency percentiles
+# and the speed-up over one worker, which should stay close to the number of workers while there are
+# free cores. The clients run on the same machine, so they compete with the workers for CPU.
+#
+# Usage (from backend/app):
+#   python load_test.py --movies 100000 --out load_100k.json
+#   python load_test.py --db /tmp/my_catalogue.db --workers 1 2 4 8 --clients 32 --duration 20
+
+# === Imports === #
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import synthetic_catalogue
+from benchmark_api import catalogue_size, git_commit, percentile, prepare_catalogue
+
+# === Settings === #
+DEFAULT_DURATION = 10  # Seconds of timed load per worker count
+DEFAULT_WARMUP = 3  # Seconds of untimed load first (each worker builds its own in-memory caches)
+DEFAULT_THREADS = 4  # Threads per worker process
+STARTUP_TIMEOUT = 120  # Seconds to wait for the server to answer
+
+# === Server === #
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def start_server(db_path, workers, threads, response_cache):
+    """Start gunicorn in the background; returns (process, port) once it answers."""
+    port = free_port()
+    env = {
+        **os.environ,
+        'DATABASE_URL': f"sqlite:///{os.path.abspath(db_path)}",
+        'SENTIMENT_ON_DEMAND': '0',  # Never call Gemini from a load test
+        'RESPONSE_CACHE_SIZE': os.environ.get('RESPONSE_CACHE_SIZE', '512') if response_cache else '0',
+        'BIND': f'127.0.0.1:{port}',
+        'WEB_CONCURRENCY': str(workers),
+        'GUNICORN_THREADS': str(threads),
+        'DB_POOL_SIZE': str(threads),
+    }
+    process = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'app:create_app()'],
+                               cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/')
+            if connection.getresponse().status == 200:
+                return process, port
+        except OSError:
+            time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError(f"gunicorn did not answer within {STARTUP_TIMEOUT} seconds")
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+# === Load === #
+def client_loop(port, urls, offset, seconds):
+    """Request `urls` in turn on one keep-alive connection; returns (latencies in ms, errors)."""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    latencies, errors = [], 0
+    deadline = time.time() + seconds
+    position = offset
+    while time.time() < deadline:
+        url = urls[position % len(urls)]
+        position += 1
+        started = time.perf_counter()
+        try:
+            connection.request('GET', url)
+            response = connection.getresponse()
+            response.read()
+            failed = response.status >= 500
+        except (OSError, http.client.HTTPException):
+            connection.close()  # Reconnects on the next request (e.g. after a worker was recycled)
+            failed = True
+        latencies.append((time.perf_counter() - started) * 1000)
+        errors += failed
+    connection.close()
+    return latencies, errors
+
+def apply_load(port, urls, clients, seconds):
+    """Run `clients` client processes for `seconds`; returns (latencies, errors, elapsed seconds)."""
+    with multiprocessing.Pool(clients) as pool:
+        started = time.perf_counter()
+        results = pool.starmap(client_loop, [(port, urls, client * 7, seconds) for client in range(clients)])
+        elapsed = time.perf_counter() - started
+    latencies = [latency for client_latencies, _ in results for latency in client_latencies]
+    return latencies, sum(errors for _, errors in results), elapsed
+
+def endpoint_urls(db_path):
+    """Every check_query_plans endpoint, filled with ids from the catalogue."""
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.abspath(db_path)}"
+    from check_query_plans import ENDPOINTS, sample_ids
+    from app import app
+
+    with app.app_context():
+        ids = sample_ids()
+    return [url_template.format(**ids) for url_template, _ in ENDPOINTS]
+
+def run(db_path, worker_counts, threads, clients, duration, warmup, response_cache):
+    urls = endpoint_urls(db_path)
+    results = []
+    for workers in worker_counts:
+        process, port = start_server(db_path, workers, threads, response_cache)
+        try:
+            apply_load(port, urls, clients, warmup)
+            latencies, errors, elapsed = apply_load(port, urls, clients, duration)
+        finally:
+            stop_server(process)
+
+        rps = len(latencies) / elapsed
+        baseline = results[0]['rps'] / results[0]['workers'] if results else rps / workers
+        result = {
+            'workers': workers,
+            'requests': len(latencies),
+            'errors': errors,
+            'rps': round(rps, 1),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'speedup': round(rps / baseline, 2),  # Over the first (smallest) worker count, per worker
+        }
+        results.append(result)
+        print(f"{'✓' if not errors else '⚠'} {workers:>3} workers   {result['rps']:>9.1f} req/s   "
+              f"p50 {result['p50_ms']:>8.2f} ms   p95 {result['p95_ms']:>8.2f} ms   "
+              f"speed-up {result['speedup']:>5.2f}x   {errors} errors")
+    return results
+
+def main():
+    cores = multiprocessing.cpu_count()
+    parser = argparse.ArgumentParser(description="Measure CineMind API throughput under gunicorn as worker processes are added.")
+    parser.add_argument("--movies", type=int, default=10_000, help="Size of the generated catalogue")
+    parser.add_argument("--seed", type=int, default=synthetic_catalogue.DEFAULT_SEED)
+    parser.add_argument("--db", help="Load test this database instead of a generated one")
+    parser.add_argument("--workers", type=int, nargs='+', help="Worker counts to try (default: 1, 2, 4, ... up to the number of cores)")
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS, help="Threads per worker")
+    parser.add_argument("--clients", type=int, help="Concurrent client connections (default: 2 per core)")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Seconds of timed load per worker count")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP)
+    parser.add_argument("--response-cache", action="store_true", help="Keep the in-memory response cache enabled")
+    parser.add_argument("--out", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    worker_counts = args.workers or [2 ** power for power in range(cores.bit_length()) if 2 ** power <= cores]
+    clients = args.clients or 2 * cores
+
+    db_path = prepare_catalogue(args)
+    print(f"Load testing {db_path} with {clients} clients ({cores} cores)\n")
+    results = run(db_path, worker_counts, args.threads, clients, args.duration, args.warmup, args.response_cache)
+
+    best = max(results, key=lambda result: result['rps'])
+    print("\n=== Summary ===")
+    print(f"Best throughput: {best['rps']} req/s with {best['workers']} workers")
+    print(f"Requests failed: {sum(result['errors'] for result in results)}")
+
+    if args.out:
+        report = {
+            'meta': {
+                'commit': git_commit(),
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'movies': catalogue_size(db_path),
+                'cores': cores,
+                'threads': args.threads,
+                'clients': clients,
+                'duration': args.duration,
+                'response_cache': args.response_cache,
+                'python': platform.python_version(),
+            },
+            'workers': results,
+        }
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Results saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# ============================== #
+# CineMind Review Store          #
+# Compressed review text         #
+# ============================== #
+
+# Review text is by far the largest value stored per movie, and only the movie page and the sentiment
+# summaries read it. It is kept out of the movies row, in movie_reviews, zlib-compressed: list queries
+# and scans over movies no longer drag it through SQLite's page cache, and the text takes a fraction
+# of the space. Each row also stores the sha256 of the text that sentiment summaries are keyed on, so a
+# stored summary can be checked without decompressing anything.
+# zlib (standard library) rather than zstd: TMDB reviews are short English prose, where the two compress
+# about as well, and no extra dependency is needed.
+
+# === Imports === #
+import zlib
+
+import sentiment  # reviews_hash: the content hash summaries are stored with
+
+# === Settings === #
+COMPRESSION_LEVEL = 9  # Reviews are written once per ingestion and read many times
+
+# === Codec === #
+def compress(text):
+    return zlib.compress(text.encode('utf-8'), COMPRESSION_LEVEL)
+
+def decompress(body):
+    return zlib.decompress(body).decode('utf-8')
+
+def review_row(movie_id, text):
+    """(movie_id, body, reviews_hash) values of a movie_reviews row, or None when there is no review text."""
+    if not text:
+        return None
+    return movie_id, compress(text), sentiment.reviews_hash(text)
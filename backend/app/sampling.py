@@ -0,0 +1,140 @@
+# ============================== #
+# CineMind Random Sampling       #
+# k random movies in O(k)        #
+# ============================== #
+
+# /explore shows a few random movies. ORDER BY RANDOM() gives every row a random key and sorts the
+# whole table; instead, the movie ids are kept in a dense array and k distinct positions are drawn
+# directly: Floyd's algorithm for uniform samples, and Vose's alias method for samples weighted by
+# popularity (built once per catalogue version, then O(1) per draw).
+# Filters (e.g. "has a poster") are boolean flags per movie; each combination of filters gets its own
+# dense pool of matching positions the first time it is asked for.
+
+# === Imports === #
+import threading
+import numpy as np
+
+# === Settings === #
+WEIGHTED_ATTEMPTS = 20  # Weighted draws per requested movie before repeats give up (then uniform fill-in)
+
+# === Alias Tables === #
+def alias_table(weights):
+    """Vose's alias method: (probability, alias) arrays for drawing index i with probability weights[i] / sum."""
+    size = len(weights)
+    scaled = weights * (size / weights.sum())
+    small = np.flatnonzero(scaled < 1.0).tolist()
+    large = np.flatnonzero(scaled >= 1.0).tolist()
+    scaled = scaled.tolist()  # Plain lists: element access in the loop below is much faster than on arrays
+    probability = [1.0] * size
+    alias = list(range(size))
+    while small and large:
+        less, more = small.pop(), large.pop()
+        probability[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= 1.0 - scaled[less]
+        (small if scaled[more] < 1.0 else large).append(more)
+    return np.asarray(probability), np.asarray(alias)  # Leftovers keep probability 1 (rounding error only)
+
+# === Pools === #
+class Pool:
+    """Positions of the movies matching one combination of filters."""
+
+    def __init__(self, positions, weights):
+        self.positions = positions
+        self.weights = weights[positions]
+        self._alias = None
+
+    def __len__(self):
+        return len(self.positions)
+
+    def uniform(self, k, rng):
+        """k distinct pool indices, uniformly (Floyd's algorithm, then shuffled)."""
+        size = len(self.positions)
+        chosen, seen = [], set()
+        for j in range(size - k, size):
+            pick = int(rng.integers(j + 1))
+            if pick in seen:
+                pick = j
+            seen.add(pick)
+            chosen.append(pick)
+        rng.shuffle(chosen)
+        return chosen
+
+    def weighted(self, k, rng):
+        """k distinct pool indices, each draw proportional to its weight among the ones not drawn yet."""
+        if self._alias is None:
+            weights = np.where(self.weights > 0, self.weights, 0.0)
+            self._alias = alias_table(weights) if weights.sum() > 0 else False
+        if self._alias is False:
+            return self.uniform(k, rng)  # No weights at all
+
+        probability, alias = self._alias
+        chosen, seen = [], set()
+        for _ in range(WEIGHTED_ATTEMPTS * k):
+            if len(chosen) == k:
+                break
+            index = int(rng.integers(len(probability)))
+            pick = index if rng.random() < probability[index] else int(alias[index])
+            if pick not in seen:
+                seen.add(pick)
+                chosen.append(pick)
+        if len(chosen) < k:
+            # Fewer well-weighted movies than requested: fill up with the others
+            rest = [index for index in self.uniform(min(len(self.positions), k + len(seen)), rng) if index not in seen]
+            chosen += rest[:k - len(chosen)]
+        return chosen
+
+# === Sampler === #
+class MovieSampler:
+    """Random movies from an in-memory copy of the catalogue's ids, weights and filter flags.
+
+    The state is replaced as a whole on reload, so sampling never needs a lock.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()  # Serializes reloads
+        self.version = None  # Catalogue version the copy reflects
+        self._state = None
+
+    @property
+    def loaded(self):
+        return self._state is not None
+
+    @property
+    def filters(self):
+        return tuple(self._state['flags']) if self._state else ()
+
+    def load(self, movie_ids, weights, flags, version):
+        """Replace the copy: parallel sequences of ids and weights, and {filter name: booleans}."""
+        self._state = {
+            'ids': np.asarray(movie_ids, dtype=np.int64),
+            'weights': np.asarray([weight or 0.0 for weight in weights], dtype=np.float64),
+            'flags': {name: np.asarray(values, dtype=bool) for name, values in flags.items()},
+            'pools': {},
+        }
+        self.version = version
+
+    def pool(self, state, filters):
+        key = tuple(sorted(set(filters)))
+        pool = state['pools'].get(key)
+        if pool is None:
+            mask = np.ones(len(state['ids']), dtype=bool)
+            for name in key:
+                mask &= state['flags'][name]
+            pool = state['pools'][key] = Pool(np.flatnonzero(mask), state['weights'])
+        return pool
+
+    def sample(self, k, filters=(), weighted=False, seed=None):
+        """Up to k distinct random movie ids matching every filter; the same seed gives the same ids."""
+        state = self._state
+        if state is None:
+            return []
+        unknown = set(filters) - set(state['flags'])
+        if unknown:
+            raise ValueError(f"Unknown filter: {', '.join(sorted(unknown))}")
+
+        pool = self.pool(state, filters)
+        k = min(k, len(pool))
+        rng = np.random.default_rng(seed)
+        indices = pool.weighted(k, rng) if weighted else pool.uniform(k, rng)
+        return state['ids'][pool.positions[indices]].tolist()
@@ -0,0 +1,92 @@
+# ============================== #
+# CineMind Search Index          #
+# SQLite FTS5 movie search       #
+# ============================== #
+
+# The movies_fts table and the triggers that keep it in sync with movies and
+# movie_keywords are created by the Alembic migration in migration_project.
+# Each row uses the movie id as its rowid.
+
+# === Imports === #
+import re
+from sqlalchemy import column, func, literal_column, select, table, text
+
+# === Index Definition === #
+FTS_TABLE = 'movies_fts'
+
+movies_fts = table(
+    FTS_TABLE,
+    column('rowid'),
+    column('title'),
+    column('original_title'),
+    column('overview'),
+    column('tagline'),
+    column('keywords'),
+)
+
+# bm25 column weights, in table column order: a hit in the title counts far more than one in the overview
+COLUMN_WEIGHTS = (10.0, 5.0, 1.0, 2.0, 3.0)
+
+# Columns used for type-ahead suggestions
+TITLE_COLUMNS = ('title', 'original_title')
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+_index_available = None
+
+# === Helpers === #
+def is_available(session):
+    """Check (once) whether the FTS5 table exists, so callers can fall back to LIKE filtering."""
+    global _index_available
+    if _index_available is None:
+        found = session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {'name': FTS_TABLE},
+        ).first()
+        _index_available = found is not None
+    return _index_available
+
+def build_match_expression(search_text, columns=None):
+    """Turn free text into a safe FTS5 MATCH expression.
+
+    Every word is quoted (so FTS5 operators typed by the user are treated as text)
+    and prefix-matched, e.g. "star wa" -> "star"* AND "wa"*.
+    Returns None when the text contains no searchable words.
+    """
+    tokens = TOKEN_PATTERN.findall(search_text or '')
+    if not tokens:
+        return None
+
+    expression = ' AND '.join(f'"{token}"*' for token in tokens)
+    if columns:
+        expression = f"{{{' '.join(columns)}}} : ({expression})"
+    return expression
+
+def _match(expression):
+    return literal_column(FTS_TABLE).op('MATCH')(expression)
+
+def ranked_matches(expression):
+    """CTE of (movie_id, score) for every matching movie; lower score = more relevant.
+
+    The CTE is MATERIALIZED because bm25() only works inside the full-text query itself,
+    so SQLite must not merge it into an outer query (e.g. the GROUP BY of the genre filter).
+    """
+    score = func.bm25(literal_column(FTS_TABLE), *COLUMN_WEIGHTS)
+    return (select(movies_fts.c.rowid.label('movie_id'), score.label('score'))
+            .where(_match(expression))
+            .cte('search_matches')
+            .prefix_with('MATERIALIZED'))
+
+def suggest_titles(session, search_text, limit=5):
+    """Return [(movie_id, title)] for the best title matches, answered from the index alone."""
+    expression = build_match_expression(search_text, TITLE_COLUMNS)
+    if expression is None:
+        return []
+
+    rows = session.execute(
+        select(movies_fts.c.rowid, movies_fts.c.title)
+        .where(_match(expression))
+        .order_by(literal_column('rank'))
+        .limit(limit)
+    ).all()
+    return [(row[0], row[1]) for row in rows]
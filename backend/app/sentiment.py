@@ -0,0 +1,295 @@
+# ============================== #
+# CineMind Sentiment Summaries   #
+# Gemini prompt + summary cache  #
+# ============================== #
+
+# Summaries are stored per movie together with the hash of the reviews they were made from
+# and the version of the prompt/model that made them. A stored summary is only reused while
+# both still match, so changed reviews or a changed prompt lead to a fresh Gemini call.
+#
+# Summaries the API generates on demand go through a SummaryGenerator: concurrent requests for the
+# same movie share one streaming Gemini call (single flight), a bounded number of calls run at once,
+# and requests beyond the queue limit are shed instead of tying up server threads.
+
+# === Imports === #
+import hashlib
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# === Prompt === #
+SENTIMENT_MODEL = "gemini-2.0-flash-lite"
+
+SENTIMENT_INSTRUCTIONS = (
+    "Analyze the sentiment of the following movie reviews and provide a single plain-text summary of the overall sentiment. "
+    "Do not include any titles, headings, author names, or individual review analysis. Focus only on the overall sentiment "
+    "and key points expressed collectively in the reviews:\n\n"
+)
+
+# Changes automatically whenever the model or the instructions change, invalidating stored summaries
+PROMPT_VERSION = hashlib.sha256(f"{SENTIMENT_MODEL}\n{SENTIMENT_INSTRUCTIONS}".encode('utf-8')).hexdigest()[:16]
+
+MEMORY_CACHE_SIZE = 5000  # Summaries kept in process memory in front of the database table
+
+# Defaults for the bulk precomputation job
+DEFAULT_WORKERS = 4
+DEFAULT_REQUESTS_PER_MINUTE = 30  # Stay under the Gemini free-tier quota
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BACKOFF_SECONDS = 2.0
+
+# Defaults for summaries generated on demand by the API (per process)
+DEFAULT_MAX_GENERATING = 4  # Gemini calls running at once
+DEFAULT_MAX_QUEUED = 16  # Further movies waiting for a free call before requests are shed
+DEFAULT_DEADLINE_SECONDS = 30.0  # How long a request waits for its summary
+
+# === Helpers === #
+def build_prompt(reviews):
+    return f"{SENTIMENT_INSTRUCTIONS}{reviews}"
+
+def reviews_hash(reviews):
+    """Content hash of a movie's reviews text."""
+    return hashlib.sha256((reviews or '').encode('utf-8')).hexdigest()
+
+# === Cache === #
+class SummaryCache:
+    """Bounded in-memory LRU of summaries, plus hit/miss counters for the whole cache.
+
+    Entries are keyed by movie id and only returned when the reviews hash and prompt version match.
+    """
+
+    def __init__(self, max_size=MEMORY_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'store_hits': 0, 'misses': 0, 'generated': 0, 'errors': 0}
+
+    def count(self, counter):
+        with self._lock:
+            self.stats[counter] += 1
+
+    def get(self, movie_id, content_hash):
+        with self._lock:
+            entry = self._entries.get(movie_id)
+            if entry is None or entry[0] != content_hash or entry[1] != PROMPT_VERSION:
+                return None
+            self._entries.move_to_end(movie_id)
+            self.stats['memory_hits'] += 1
+            return entry[2]
+
+    def put(self, movie_id, content_hash, summary, prompt_version=PROMPT_VERSION):
+        with self._lock:
+            self._entries[movie_id] = (content_hash, prompt_version, summary)
+            self._entries.move_to_end(movie_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def snapshot(self):
+        """Counters plus hit ratio, for the stats endpoint."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self._entries)
+        lookups = stats['memory_hits'] + stats['store_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['memory_hits'] + stats['store_hits']) / lookups, 4) if lookups else None
+        stats['prompt_version'] = PROMPT_VERSION
+        return stats
+
+# === Bulk Generation === #
+class RateLimiter:
+    """Spaces calls evenly so that at most `per_minute` start in any minute, across all threads."""
+
+    def __init__(self, per_minute, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            self._sleep(slot - now)
+
+def summarize(client, reviews):
+    """One Gemini call; returns the stripped summary text."""
+    response = client.models.generate_content(model=SENTIMENT_MODEL, contents=build_prompt(reviews))
+    return response.text.strip()
+
+def summarize_with_retry(client, reviews, limiter, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                         backoff_seconds=DEFAULT_BACKOFF_SECONDS, sleep=time.sleep):
+    """Call Gemini with exponential backoff (plus jitter) between failed attempts.
+
+    Returns (summary, None) on success or (None, last error message) once attempts run out.
+    """
+    for attempt in range(1, max_attempts + 1):
+        limiter.wait()
+        try:
+            return summarize(client, reviews), None
+        except Exception as e:
+            if attempt == max_attempts:
+                return None, str(e)
+            sleep(backoff_seconds * 2 ** (attempt - 1) * (1 + random.random() / 2))
+
+def generate_summaries(client, jobs, workers=DEFAULT_WORKERS, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                       max_attempts=DEFAULT_MAX_ATTEMPTS, backoff_seconds=DEFAULT_BACKOFF_SECONDS, sleep=time.sleep):
+    """Summarize (movie_id, reviews) jobs on a bounded thread pool.
+
+    `jobs` is consumed lazily and at most 2 x `workers` jobs are in flight, so reviews are never all
+    held in memory. Yields (movie_id, reviews_hash, summary, error) as each job finishes, in
+    completion order, so the caller can persist results straight away.
+    """
+    limiter = RateLimiter(requests_per_minute, sleep=sleep)
+
+    def run(movie_id, reviews):
+        summary, error = summarize_with_retry(client, reviews, limiter, max_attempts, backoff_seconds, sleep)
+        return movie_id, reviews_hash(reviews), summary, error
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for movie_id, reviews in jobs:
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(run, movie_id, reviews))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+# === On-Demand Generation === #
+class Overloaded(Exception):
+    """Too many summaries are being generated or waiting already; the request should be retried later."""
+
+class DeadlineExceeded(Exception):
+    """The summary was not ready before the caller's deadline."""
+
+def summarize_stream(client, reviews):
+    """One streaming Gemini call; yields the summary text in chunks as they arrive."""
+    for chunk in client.models.generate_content_stream(model=SENTIMENT_MODEL, contents=build_prompt(reviews)):
+        if chunk.text:
+            yield chunk.text
+
+class Flight:
+    """One summary being generated, shared by every request waiting for it."""
+
+    def __init__(self, deadline):
+        self.deadline = deadline  # Latest deadline of the requests waiting (time.monotonic)
+        self.chunks = []
+        self.summary = None
+        self.error = None
+        self.done = False
+        self._changed = threading.Condition()
+
+    def join(self, deadline):
+        with self._changed:
+            self.deadline = max(self.deadline, deadline)
+
+    def add(self, text):
+        with self._changed:
+            self.chunks.append(text)
+            self._changed.notify_all()
+
+    def finish(self, summary=None, error=None):
+        with self._changed:
+            self.summary, self.error, self.done = summary, error, True
+            self._changed.notify_all()
+
+    def stream(self, deadline):
+        """Yield the text chunks from the first one, as they arrive.
+
+        Raises the generation's error, or DeadlineExceeded when no new chunk arrives before `deadline`.
+        """
+        position = 0
+        while True:
+            with self._changed:
+                while position == len(self.chunks) and not self.done:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise DeadlineExceeded('The summary is still being generated')
+                    self._changed.wait(remaining)
+                chunks, done, error = self.chunks[position:], self.done, self.error
+            position += len(chunks)
+            yield from chunks
+            if done:
+                if error is not None:
+                    raise error
+                return
+
+    def result(self, deadline):
+        """The finished summary; raises like stream()."""
+        for _ in self.stream(deadline):
+            pass
+        return self.summary
+
+class SummaryGenerator:
+    """Generates summaries for API requests on a small pool of threads.
+
+    A request for a summary that is already being generated joins that call instead of starting
+    another. At most `max_generating` Gemini calls run at once and up to `max_queued` more wait for
+    one; beyond that, submit() raises Overloaded. Queued calls whose requests have all passed their
+    deadline are dropped before reaching Gemini.
+    """
+
+    def __init__(self, max_generating=DEFAULT_MAX_GENERATING, max_queued=DEFAULT_MAX_QUEUED, clock=time.monotonic):
+        self.max_generating = max_generating
+        self.max_queued = max_queued
+        self._clock = clock
+        self._flights = {}
+        self._pool = None  # Started on the first call
+        self._lock = threading.Lock()
+        self.stats = {'started': 0, 'joined': 0, 'shed': 0, 'expired': 0}
+
+    def submit(self, key, generate, deadline, on_summary=None):
+        """Return the Flight for `key`, calling `generate()` (an iterable of text chunks) unless one is running.
+
+        `on_summary(summary)` runs on the generating thread once the whole summary is known, before
+        any waiting request sees it.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.join(deadline)
+                self.stats['joined'] += 1
+                return flight
+            if len(self._flights) >= self.max_generating + self.max_queued:
+                self.stats['shed'] += 1
+                raise Overloaded('Too many sentiment summaries are being generated; try again shortly')
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_generating, thread_name_prefix='sentiment')
+            flight = self._flights[key] = Flight(deadline)
+            self.stats['started'] += 1
+        self._pool.submit(self._run, key, flight, generate, on_summary)
+        return flight
+
+    def _run(self, key, flight, generate, on_summary):
+        try:
+            if self._clock() >= flight.deadline:
+                with self._lock:
+                    self.stats['expired'] += 1
+                raise DeadlineExceeded('No request is waiting for this summary any more')
+            for text in generate():
+                flight.add(text)
+            summary = ''.join(flight.chunks).strip()
+            if on_summary:
+                on_summary(summary)
+            flight.finish(summary)
+        except Exception as e:
+            flight.finish(error=e)
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    def snapshot(self):
+        """Counters plus the calls in flight, for the stats endpoint."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['in_flight'] = len(self._flights)
+        stats['max_generating'] = self.max_generating
+        stats['max_queued'] = self.max_queued
+        return stats
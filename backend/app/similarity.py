@@ -0,0 +1,141 @@
+# ============================== #
+# CineMind Similar Movies        #
+# Content-based neighbours       #
+# ============================== #
+
+# Every movie becomes a sparse vector of TF-IDF weighted features: its keywords, genres and cast
+# (the ingestion keeps the top-billed cast only). Rare features weigh more than common ones, so
+# sharing an unusual keyword or actor says more than sharing "Drama". Cosine similarity of two
+# movies is the dot product of their normalized vectors; the top neighbours of every movie are
+# computed offline with batched sparse matrix products and stored, so serving is one lookup.
+
+# === Imports === #
+# scipy is imported by the functions that build matrices, so the API does not load it at startup
+import numpy as np
+
+# === Settings === #
+# Share of each feature group in a movie's vector
+GROUP_WEIGHTS = {'keywords': 1.0, 'cast': 0.7, 'genres': 0.5}
+
+DEFAULT_NEIGHBOURS = 20  # Neighbours stored per movie
+DEFAULT_BATCH_SIZE = 128  # Movies multiplied against the whole catalogue at once
+MIN_SCORE = 0.01  # Weaker matches are not worth recommending
+
+# === Vectors === #
+def tfidf_block(pairs, positions, size):
+    """Row-normalized TF-IDF matrix (movies x features) from (movie_id, feature_id) pairs."""
+    import scipy.sparse as sp
+    rows, features = [], []
+    for movie_id, feature_id in pairs:
+        position = positions.get(movie_id)
+        if position is not None:
+            rows.append(position)
+            features.append(feature_id)
+    if not rows:
+        return sp.csr_matrix((size, 0), dtype=np.float32)
+
+    feature_ids, columns = np.unique(np.asarray(features), return_inverse=True)
+    block = sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (np.asarray(rows), columns)), shape=(size, len(feature_ids)))
+    block.sum_duplicates()
+    block.data[:] = 1.0  # A feature is present or not
+
+    document_frequency = np.bincount(block.indices, minlength=block.shape[1])
+    idf = np.log((1 + size) / (1 + document_frequency)) + 1  # Smoothed, as in scikit-learn
+    block = block @ sp.diags(idf.astype(np.float32))
+    return normalize_rows(block)
+
+def normalize_rows(matrix):
+    import scipy.sparse as sp
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sp.csr_matrix(sp.diags((1 / norms).astype(np.float32)) @ matrix)
+
+class FeatureMatrix:
+    """Unit-length feature vectors of every movie, one row per movie id."""
+
+    def __init__(self, movie_ids, groups):
+        """`groups` maps a GROUP_WEIGHTS name to its (movie_id, feature_id) pairs."""
+        import scipy.sparse as sp
+        self.ids = np.asarray(sorted(movie_ids), dtype=np.int64)
+        self.positions = {movie_id: position for position, movie_id in enumerate(self.ids.tolist())}
+        blocks = [tfidf_block(groups.get(name, ()), self.positions, len(self.ids)) * np.float32(np.sqrt(weight))
+                  for name, weight in GROUP_WEIGHTS.items()]
+        self.vectors = normalize_rows(sp.hstack(blocks, format='csr'))
+
+    def products(self, movie_ids, batch_size=DEFAULT_BATCH_SIZE):
+        """Yield (positions, similarity rows against every movie) for `movie_ids`, a batch at a time."""
+        positions = np.asarray([self.positions[movie_id] for movie_id in movie_ids if movie_id in self.positions], dtype=np.int64)
+        transposed = self.vectors.T.tocsc()
+        for start in range(0, len(positions), batch_size):
+            batch = positions[start:start + batch_size]
+            yield batch, (self.vectors[batch] @ transposed).tocsr()
+
+# === Neighbours === #
+def top_neighbours(indices, scores, k, exclude=None):
+    """The k best (column, score) of one sparse row, best first (ties by column), skipping `exclude`."""
+    keep = scores >= MIN_SCORE
+    if exclude is not None:
+        keep &= indices != exclude
+    indices, scores = indices[keep], scores[keep]
+    if len(scores) > k:
+        best = np.argpartition(-scores, k - 1)[:k]
+        indices, scores = indices[best], scores[best]
+    order = np.lexsort((indices, -scores))
+    return indices[order], scores[order]
+
+def neighbour_lists(matrix, movie_ids, k=DEFAULT_NEIGHBOURS, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield (movie_id, [(similar_id, score)]) for `movie_ids`."""
+    for batch, product in matrix.products(movie_ids, batch_size):
+        for row, position in enumerate(batch):
+            start, end = product.indptr[row], product.indptr[row + 1]
+            columns, scores = top_neighbours(product.indices[start:end], product.data[start:end], k, exclude=position)
+            yield int(matrix.ids[position]), [(int(matrix.ids[column]), float(score)) for column, score in zip(columns, scores)]
+
+def merge_neighbours(current, candidates, k=DEFAULT_NEIGHBOURS):
+    """A stored list updated with new (similar_id: score) candidates."""
+    merged = dict(current)
+    merged.update(candidates)
+    return sorted(merged.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+def incremental_update(matrix, changed_ids, stored, k=DEFAULT_NEIGHBOURS, batch_size=DEFAULT_BATCH_SIZE):
+    """Neighbour lists to rewrite after `changed_ids` were added, edited or deleted.
+
+    `stored` maps movie id -> its current list. The changed movies get fresh lists, and so do the
+    movies whose list included a changed movie (it may have dropped out, and the next best movie
+    has to take its place). Any other movie gets a new list only if a changed movie now ranks in
+    its top k. Lists of untouched movies keep the IDF weights of their last build (rebuild fully
+    now and then).
+    """
+    changed = set(changed_ids)
+    lists = {}
+    candidates = {}  # movie id -> {changed movie id: score}
+    losing = {movie_id for movie_id, neighbours in stored.items()
+              if movie_id not in changed and any(similar_id in changed for similar_id, _ in neighbours)}
+
+    # Lowest stored score of each full list: candidates below it cannot get in
+    threshold = np.zeros(len(matrix.ids), dtype=np.float32)
+    for movie_id, neighbours in stored.items():
+        position = matrix.positions.get(movie_id)
+        if position is not None and len(neighbours) >= k:
+            threshold[position] = neighbours[-1][1]
+
+    for batch, product in matrix.products(sorted(changed), batch_size):
+        for row, position in enumerate(batch):
+            start, end = product.indptr[row], product.indptr[row + 1]
+            columns, scores = product.indices[start:end], product.data[start:end]
+            movie_id = int(matrix.ids[position])
+
+            best_columns, best_scores = top_neighbours(columns, scores, k, exclude=position)
+            lists[movie_id] = [(int(matrix.ids[column]), float(score)) for column, score in zip(best_columns, best_scores)]
+
+            # Symmetric similarity: this movie may now belong in the lists of the movies it resembles
+            qualifies = (scores >= MIN_SCORE) & (scores > threshold[columns]) & (columns != position)
+            for column, score in zip(columns[qualifies], scores[qualifies]):
+                candidates.setdefault(int(matrix.ids[column]), {})[movie_id] = float(score)
+
+    # One more pass of products over the losing rows (movies no longer in the matrix are skipped)
+    lists.update(neighbour_lists(matrix, sorted(losing), k, batch_size))
+
+    for movie_id in set(candidates) - changed - losing:
+        lists[movie_id] = merge_neighbours(stored.get(movie_id, []), candidates[movie_id], k)
+    return lists
@@ -0,0 +1,225 @@
+# ============================== #
+# CineMind Synthetic Catalogue   #
+# Benchmark database generator   #
+# ============================== #
+
+# Builds a SQLite catalogue of any size with the real schema (created by running the Alembic
+# migrations) and TMDB-like data: every movie has genres, keywords, a 10-person cast, countries
+# and languages. Actors and keywords are drawn from Zipf-distributed pools, so a few are linked
+# to a lot of movies and most to very few, as in the real catalogue.
+# The same --movies / --seed always produce the same data.
+#
+# Usage (from backend/app):
+#   python synthetic_catalogue.py --movies 100000 --out /tmp/cinemind_100k.db
+
+# === Imports === #
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+
+import review_store  # Reviews are stored compressed, in their own table
+
+# === Settings === #
+MIGRATION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'migration_project')
+IMAGE_BASE_URL = "https://image.tmdb.org/t/p/original"
+
+DEFAULT_SEED = 42
+BATCH_SIZE = 5000  # Movies written per transaction
+
+CAST_PER_MOVIE = 10  # Same cast limit as the ingestion
+GENRES_PER_MOVIE = (1, 3)
+KEYWORDS_PER_MOVIE = (3, 15)
+COUNTRIES_PER_MOVIE = (1, 2)
+LANGUAGES_PER_MOVIE = (1, 3)
+REVIEWS_PER_MOVIE = (0, 5)
+
+# Pool sizes relative to the number of movies
+ACTORS_PER_MOVIE = 2.0
+CHARACTERS_PER_MOVIE = 4.0
+KEYWORDS_PER_MOVIE_POOL = 0.3
+ZIPF_EXPONENT = 0.6  # Top actor in a few percent of movies, the long tail in one or two
+
+GENRES = [
+    "Action", "Adventure", "Animation", "Comedy", "Crime", "Documentary", "Drama", "Family", "Fantasy", "History",
+    "Horror", "Music", "Mystery", "Romance", "Science Fiction", "TV Movie", "Thriller", "War", "Western",
+]
+COUNTRIES = [
+    ("United States of America", "US"), ("United Kingdom", "GB"), ("France", "FR"), ("Germany", "DE"), ("Japan", "JP"),
+    ("Canada", "CA"), ("India", "IN"), ("South Korea", "KR"), ("Spain", "ES"), ("Italy", "IT"), ("Australia", "AU"),
+    ("China", "CN"), ("Mexico", "MX"), ("Brazil", "BR"), ("Sweden", "SE"),
+]
+LANGUAGES = [
+    ("English", "en"), ("Français", "fr"), ("Deutsch", "de"), ("日本語", "ja"), ("Español", "es"), ("Italiano", "it"),
+    ("हिन्दी", "hi"), ("한국어/조선말", "ko"), ("普通话", "zh"), ("Português", "pt"), ("svenska", "sv"), ("Pусский", "ru"),
+]
+ORIGINAL_LANGUAGE_WEIGHTS = [60, 6, 4, 8, 6, 3, 5, 4, 2, 1, 1, 0]
+
+WORDS = (
+    "last night city dark star river shadow king queen war love storm road home ghost secret island fire ice "
+    "blood moon sun heart game dream silent lost golden iron broken wild red black white empire hunter legend "
+    "rising fall return edge world house garden winter summer ocean desert mountain forest machine signal "
+    "promise stranger journey frontier kingdom harbor station echo mirror crown paper glass velvet thunder "
+    "midnight morning tomorrow yesterday circle code angel devil hollow crimson silver dragon wolf raven"
+).split()
+FIRST_NAMES = "Ava Ben Chloe Daniel Emma Felix Grace Hugo Isla Jack Kai Lena Mateo Nora Omar Priya Quinn Rosa Sam Tara Uma Victor Wen Yusuf Zoe".split()
+LAST_NAMES = "Anders Brooks Chen Diaz Evans Fischer Garcia Hayes Ito Jensen Kim Lopez Moreau Novak Okafor Patel Rossi Silva Tanaka Weber".split()
+
+# === Helpers === #
+def zipf_weights(size):
+    """Cumulative weights for drawing from a pool where rank r is picked in proportion to 1 / r^ZIPF_EXPONENT."""
+    return list(itertools.accumulate(1.0 / rank ** ZIPF_EXPONENT for rank in range(1, size + 1)))
+
+def pick(rng, pool_ids, cum_weights, count):
+    """Up to `count` distinct ids from a Zipf-weighted pool."""
+    return list(dict.fromkeys(rng.choices(pool_ids, cum_weights=cum_weights, k=count)))
+
+def phrase(rng, low, high):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+def person_name(rng, index):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}"
+
+def create_schema(db_path):
+    """Create (or upgrade) the database with the real schema via Alembic: tables, indexes, search index, triggers.
+
+    Runs in a separate process, as the migration environment puts migration_project (and its app.py) on sys.path.
+    """
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.abspath(db_path)}")
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=MIGRATION_DIR, env=env, check=True)
+
+def drop_triggers(cursor):
+    """Drop every trigger and return their CREATE statements.
+
+    The search index and cache triggers would otherwise fire for every inserted row;
+    the search index is rebuilt in one statement at the end instead.
+    """
+    triggers = cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'").fetchall()
+    for name, _ in triggers:
+        cursor.execute(f"DROP TRIGGER {name}")
+    return [sql for _, sql in triggers]
+
+# === Generator === #
+def movie_row(rng, movie_id):
+    """(movies row, reviews text or None)."""
+    title = phrase(rng, 1, 4).title()
+    if rng.random() < 0.15:
+        title = f"{title} {rng.randint(2, 5)}"
+    release_date = f"{rng.randint(1950, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" if rng.random() > 0.01 else None
+    budget = rng.choice([0, rng.randint(1, 300) * 1_000_000])
+    reviews = "\n\n".join(
+        f"Author: {rng.choice(FIRST_NAMES).lower()}{rng.randint(1, 999)}\n{phrase(rng, 30, 200).capitalize()}."
+        for _ in range(rng.randint(*REVIEWS_PER_MOVIE))
+    ) or None
+    posters = ",".join(f"{IMAGE_BASE_URL}/p{movie_id}_{index}.jpg" for index in range(rng.randint(1, 8)))
+    return (
+        movie_id, title, title if rng.random() < 0.8 else phrase(rng, 1, 4).title(), phrase(rng, 20, 60).capitalize() + ".",
+        budget, int(budget * rng.uniform(0, 4)), release_date, rng.randint(70, 200) if rng.random() > 0.02 else None,
+        "Released", phrase(rng, 3, 8).capitalize() + ".", round(rng.lognormvariate(2.5, 1.2), 3),
+        round(rng.uniform(3, 9), 1), int(rng.lognormvariate(5, 2)),
+        rng.choices([code for _, code in LANGUAGES], weights=ORIGINAL_LANGUAGE_WEIGHTS)[0],
+        f"https://example.com/movies/{movie_id}", posters, f"{IMAGE_BASE_URL}/b{movie_id}.jpg",
+        f"https://www.youtube.com/watch?v=v{movie_id}", f"{IMAGE_BASE_URL}/p{movie_id}_0.jpg",
+        f"https://www.youtube.com/watch?v=t{movie_id}",
+    ), reviews
+
+def generate(db_path, movies, seed=DEFAULT_SEED):
+    """Create `db_path` and fill it with `movies` synthetic movies."""
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    create_schema(db_path)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = OFF")  # Throwaway database: nothing to recover on a crash
+    conn.execute("PRAGMA synchronous = OFF")
+    cursor = conn.cursor()
+    triggers = drop_triggers(cursor)
+
+    # Lookup pools
+    actor_count = max(100, int(movies * ACTORS_PER_MOVIE))
+    character_count = max(100, int(movies * CHARACTERS_PER_MOVIE))
+    keyword_count = max(100, int(movies * KEYWORDS_PER_MOVIE_POOL))
+
+    cursor.executemany("INSERT INTO genres (genre_id, genre_name) VALUES (?, ?)", enumerate(GENRES, 1))
+    cursor.executemany("INSERT INTO production_countries (country_id, country_name, iso_code) VALUES (?, ?, ?)",
+                       [(index, name, code) for index, (name, code) in enumerate(COUNTRIES, 1)])
+    cursor.executemany("INSERT INTO spoken_languages (language_id, language_name, iso_code) VALUES (?, ?, ?)",
+                       [(index, name, code) for index, (name, code) in enumerate(LANGUAGES, 1)])
+    cursor.executemany("INSERT INTO keywords (keyword_id, keyword_name) VALUES (?, ?)",
+                       ((index, f"{phrase(rng, 1, 2)} {index}") for index in range(1, keyword_count + 1)))
+    cursor.executemany(
+        "INSERT INTO cast (actor_id, name, gender, popularity, profile_path, biography) VALUES (?, ?, ?, ?, ?, ?)",
+        ((index, person_name(rng, index), rng.choice([0, 1, 2]), round(rng.lognormvariate(1, 1.3), 3),
+          f"{IMAGE_BASE_URL}/a{index}.jpg" if rng.random() < 0.8 else None,
+          phrase(rng, 20, 120).capitalize() + "." if rng.random() < 0.6 else None)
+         for index in range(1, actor_count + 1)),
+    )
+    cursor.executemany("INSERT INTO characters (character_id, name) VALUES (?, ?)",
+                       ((index, person_name(rng, index)) for index in range(1, character_count + 1)))
+    conn.commit()
+
+    actor_ids, actor_weights = range(1, actor_count + 1), zipf_weights(actor_count)
+    keyword_ids, keyword_weights = range(1, keyword_count + 1), zipf_weights(keyword_count)
+    genre_ids, genre_weights = range(1, len(GENRES) + 1), zipf_weights(len(GENRES))
+
+    # Movies and their links, in batches
+    for batch_start in range(1, movies + 1, BATCH_SIZE):
+        batch = range(batch_start, min(batch_start + BATCH_SIZE, movies + 1))
+        rows = {table: [] for table in ("movies", "movie_reviews", "movie_genre", "movie_keywords", "movies_cast",
+                                        "movie_production_countries", "movie_spoken_languages")}
+        for movie_id in batch:
+            movie, reviews = movie_row(rng, movie_id)
+            rows["movies"].append(movie)
+            if reviews:
+                rows["movie_reviews"].append(review_store.review_row(movie_id, reviews))
+            rows["movie_genre"] += [(movie_id, genre_id) for genre_id in pick(rng, genre_ids, genre_weights, rng.randint(*GENRES_PER_MOVIE))]
+            rows["movie_keywords"] += [(movie_id, keyword_id) for keyword_id in pick(rng, keyword_ids, keyword_weights, rng.randint(*KEYWORDS_PER_MOVIE))]
+            rows["movies_cast"] += [(movie_id, actor_id, rng.randint(1, character_count)) for actor_id in pick(rng, actor_ids, actor_weights, CAST_PER_MOVIE)]
+            rows["movie_production_countries"] += [(movie_id, index) for index in rng.sample(range(1, len(COUNTRIES) + 1), rng.randint(*COUNTRIES_PER_MOVIE))]
+            rows["movie_spoken_languages"] += [(movie_id, index) for index in rng.sample(range(1, len(LANGUAGES) + 1), rng.randint(*LANGUAGES_PER_MOVIE))]
+
+        cursor.executemany(f"INSERT INTO movies VALUES ({', '.join('?' * 20)})", rows.pop("movies"))
+        for table, table_rows in rows.items():
+            if not table_rows:
+                continue
+            cursor.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * len(table_rows[0]))})", table_rows)
+        conn.commit()
+        print(f"  {batch[-1]} / {movies} movies")
+
+    # Search index in one pass, then the triggers and planner statistics
+    cursor.execute("""
+        INSERT INTO movies_fts (rowid, title, original_title, overview, tagline, keywords)
+        SELECT m.id, m.title, m.original_title, m.overview, m.tagline,
+               (SELECT group_concat(k.keyword_name, ' ')
+                FROM movie_keywords mk JOIN keywords k ON k.keyword_id = mk.keyword_id
+                WHERE mk.movie_id = m.id)
+        FROM movies m
+    """)
+    for sql in triggers:
+        cursor.execute(sql)
+    cursor.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+
+    print(f"✓ Generated {movies} movies in {db_path} ({time.perf_counter() - started:.1f}s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic CineMind catalogue for benchmarks.")
+    parser.add_argument("--movies", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--out", required=True, help="Path of the SQLite database to create")
+    parser.add_argument("--force", action="store_true", help="Overwrite an existing database")
+    args = parser.parse_args()
+
+    if os.path.exists(args.out):
+        if not args.force:
+            parser.error(f"{args.out} already exists (use --force to overwrite)")
+        os.remove(args.out)
+    generate(args.out, args.movies, args.seed)
+
+if __name__ == "__main__":
+    main()
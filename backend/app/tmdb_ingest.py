@@ -0,0 +1,553 @@
+# ============================== #
+# CineMind TMDB Ingestion        #
+# Async movie import pipeline    #
+# ============================== #
+
+# Importable replacement for the fetch/insert helpers of cinemind_toolkit.ipynb.
+# All requests go through one pooled httpx.AsyncClient with a concurrency cap and a
+# requests-per-second limit, and the sub-requests of a movie (credits, keywords, images,
+# videos, reviews, cast biographies) are fetched in parallel.
+#
+# Usage (from backend/app):
+#   python tmdb_ingest.py --mode all --max-pages 5
+#   python tmdb_ingest.py --movie 438631
+#
+# base_url / transport can point the client at a local fake TMDB server for testing.
+
+# === Imports === #
+import argparse
+import asyncio
+import email.utils
+import math
+import os
+import random
+import sqlite3
+import time
+
+import httpx
+from dotenv import load_dotenv
+
+import review_store  # Reviews are stored compressed, in movie_reviews
+import sentiment  # reviews_hash, to compare reviews without reading the stored text
+
+# === Settings === #
+BASE_API_URL = "https://api.themoviedb.org/3/"
+IMAGE_BASE_URL = "https://image.tmdb.org/t/p/original"
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(basedir), '..', 'migration_project', 'cinema_migrations.db')
+
+DEFAULT_CONCURRENCY = 16          # Open requests at any time
+DEFAULT_REQUESTS_PER_SECOND = 40  # TMDB allows roughly 50 requests per second per IP
+MAX_RETRIES = 3                   # Retries for 429 / 5xx / network errors
+CAST_LIMIT = 10                   # Cast members stored per movie (as in the toolkit)
+DEFAULT_BATCH_SIZE = 50           # Movies written per database transaction
+MAX_TRENDING_PAGES = 500          # TMDB never serves more pages than this
+
+# === HTTP Client === #
+def retry_after_seconds(value):
+    """Seconds to wait from a Retry-After header (delay in seconds or HTTP date), or None when it can't be parsed."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(seconds, 0.0) if math.isfinite(seconds) else None
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        return None  # HTTP dates are always GMT; anything else is malformed
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+class AsyncRateLimiter:
+    """Spaces request starts evenly so no more than `per_second` start in any second."""
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+class TMDBClient:
+    """Shared, connection-pooled TMDB client. Use as `async with TMDBClient(api_key) as client:`."""
+
+    def __init__(self, api_key, base_url=BASE_API_URL, concurrency=DEFAULT_CONCURRENCY,
+                 requests_per_second=DEFAULT_REQUESTS_PER_SECOND, transport=None):
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"accept": "application/json", "Authorization": f"Bearer {api_key}"},
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            timeout=httpx.Timeout(15.0),
+            transport=transport,
+        )
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._limiter = AsyncRateLimiter(requests_per_second)
+        self.requests_made = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._http.aclose()
+
+    async def get(self, path, **params):
+        """GET a TMDB endpoint and return its JSON, or None on a non-retryable error.
+
+        429 responses honour Retry-After (seconds or an HTTP date); 5xx and network errors, and
+        Retry-After values that can't be parsed, are retried with backoff.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            async with self._semaphore:
+                await self._limiter.wait()
+                self.requests_made += 1
+                try:
+                    response = await self._http.get(path, params=params)
+                except httpx.TransportError as e:
+                    error, retry_after = str(e), None
+                else:
+                    if response.status_code == 200:
+                        return response.json()
+                    if response.status_code != 429 and response.status_code < 500:
+                        print(f"Error fetching {path}: {response.status_code}")
+                        return None
+                    error, retry_after = response.status_code, retry_after_seconds(response.headers.get("Retry-After"))
+
+            if attempt < MAX_RETRIES:
+                delay = retry_after if retry_after is not None else 0.5 * 2 ** attempt * (1 + random.random())
+                await asyncio.sleep(delay)
+
+        print(f"Error fetching {path}: {error} (gave up after {MAX_RETRIES + 1} attempts)")
+        return None
+
+# === Fetchers === #
+async def fetch_movie_details(client, movie_id):
+    """Fetch movie details from TMDB API."""
+    return await client.get(f"movie/{movie_id}", language="en-US")
+
+async def fetch_movie_credits(client, movie_id):
+    """Fetch the cast for a given TMDb movie ID."""
+    data = await client.get(f"movie/{movie_id}/credits", language="en-US")
+    return data.get("cast", []) if data else []
+
+async def fetch_movie_keywords(client, movie_id):
+    """Fetch keywords for a given TMDb movie ID."""
+    data = await client.get(f"movie/{movie_id}/keywords")
+    return data.get("keywords", []) if data else []
+
+async def fetch_all_images(client, movie_id):
+    """Fetch all poster and backdrop URLs for a given TMDb movie ID (one request for both)."""
+    data = await client.get(f"movie/{movie_id}/images") or {}
+    posters = [f"{IMAGE_BASE_URL}{img['file_path']}" for img in data.get("posters", [])]
+    backdrops = [f"{IMAGE_BASE_URL}{img['file_path']}" for img in data.get("backdrops", [])]
+    return posters, backdrops
+
+async def fetch_all_youtube_videos(client, movie_id):
+    """Fetch all YouTube video URLs plus the main trailer URL (one request for both)."""
+    data = await client.get(f"movie/{movie_id}/videos", language="en-US") or {}
+    youtube = [video for video in data.get("results", []) if video["site"].lower() == "youtube"]
+    videos = [f"https://www.youtube.com/watch?v={video['key']}" for video in youtube]
+    trailer = next((f"https://www.youtube.com/watch?v={video['key']}"
+                    for video in youtube if video["type"].lower() == "trailer"), None)
+    return videos, trailer
+
+async def get_movie_reviews(client, movie_id):
+    """Fetch reviews for a given TMDb movie ID, joined into the text stored in movie_reviews."""
+    data = await client.get(f"movie/{movie_id}/reviews", language="en-US")
+    reviews = data.get("results", []) if data else []
+    if not reviews:
+        return None
+    return "\n\n".join(f"Author: {review.get('author', 'Unknown')}\n{review.get('content', '')}" for review in reviews)
+
+async def fetch_biography(client, person_id):
+    if not person_id:
+        return None
+    data = await client.get(f"person/{person_id}", language="en-US")
+    return data.get("biography") if data else None
+
+async def fetch_cast_with_biographies(client, movie_id):
+    """Fetch the first CAST_LIMIT cast members and their biographies in parallel."""
+    cast = (await fetch_movie_credits(client, movie_id))[:CAST_LIMIT]
+    biographies = await asyncio.gather(*(fetch_biography(client, actor.get("id")) for actor in cast))
+    for actor, biography in zip(cast, biographies):
+        actor["biography"] = biography
+    return cast
+
+async def fetch_movie_media(client, movie_id):
+    """Fetch everything a movie row needs besides details and reviews, all sub-requests at once."""
+    (posters, backdrops), (videos, trailer), cast, keywords = await asyncio.gather(
+        fetch_all_images(client, movie_id),
+        fetch_all_youtube_videos(client, movie_id),
+        fetch_cast_with_biographies(client, movie_id),
+        fetch_movie_keywords(client, movie_id),
+    )
+    return {"posters": posters, "backdrops": backdrops, "videos": videos,
+            "keyvideo_url": trailer, "cast": cast, "keywords": keywords}
+
+async def fetch_trending_page(client, page):
+    return await client.get("trending/movie/week", language="en-US", page=page)
+
+# === Database === #
+MOVIE_COLUMNS = (
+    "id", "title", "original_title", "overview", "budget", "revenue",
+    "release_date", "runtime", "status", "tagline", "popularity",
+    "vote_average", "vote_count", "original_language", "homepage",
+    "poster_url", "backdrop_url", "video_url", "keyposter_url", "keyvideo_url",
+)
+
+# The columns compared to decide whether an existing movie changed (same as the toolkit);
+# the reviews are compared by their hash in movie_reviews
+COMPARED_COLUMNS = (
+    "title", "original_title", "overview", "budget", "revenue", "release_date", "runtime", "status",
+    "tagline", "popularity", "vote_average", "vote_count", "original_language", "homepage", "keyposter_url",
+)
+
+def keyposter_url(details):
+    return f"{IMAGE_BASE_URL}{details.get('poster_path')}" if details.get("poster_path") else None
+
+def comparable_values(details, reviews_text):
+    """The COMPARED_COLUMNS values TMDB currently reports for a movie, then the hash of its reviews (None without)."""
+    return (
+        details["title"], details["original_title"], details["overview"], details["budget"], details["revenue"],
+        details["release_date"], details["runtime"], details["status"], details["tagline"],
+        float(details.get("popularity", 0)), round(float(details.get("vote_average", 0)), 1), details["vote_count"],
+        details["original_language"], details["homepage"], keyposter_url(details),
+        sentiment.reviews_hash(reviews_text) if reviews_text else None,
+    )
+
+def movie_row(movie):
+    """Values for MOVIE_COLUMNS from a fetched movie (details + media)."""
+    details = movie["details"]
+    return (
+        details["id"], details["title"], details["original_title"],
+        details["overview"], details.get("budget", 0),
+        details.get("revenue", 0), details["release_date"],
+        details.get("runtime", 0), details.get("status", ""),
+        details.get("tagline", ""), float(details.get("popularity", 0)),  # Keep raw popularity value
+        round(float(details.get("vote_average", 0)), 1),  # Round to 1 decimal
+        details.get("vote_count", 0), details["original_language"],
+        details["homepage"],
+        ",".join(movie["posters"]) or None, ",".join(movie["backdrops"]) or None, ",".join(movie["videos"]) or None,
+        keyposter_url(details), movie["keyvideo_url"],
+    )
+
+# Lookup tables: table -> (id column, columns that identify a row)
+LOOKUP_TABLES = {
+    "genres": ("genre_id", ("genre_name",)),
+    "production_countries": ("country_id", ("country_name", "iso_code")),
+    "spoken_languages": ("language_id", ("language_name", "iso_code")),
+    "keywords": ("keyword_id", ("keyword_name",)),
+    "cast": ("actor_id", ("name",)),
+    "characters": ("character_id", ("name",)),
+}
+
+SQL_CHUNK_SIZE = 200  # Rows per IN (VALUES ...) lookup, well under SQLite's bound parameter limit
+
+def connect(db_path):
+    """Open the database tuned for bulk writes: WAL journal, relaxed fsync, big page cache."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode = WAL")    # Readers (the API) are not blocked while a batch is written
+    conn.execute("PRAGMA synchronous = NORMAL")  # Safe with WAL; fsync only at checkpoints
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")   # 64 MB page cache
+    conn.execute("PRAGMA foreign_keys = OFF")    # Same as the toolkit; rows are written parents first anyway
+    return conn
+
+def chunked(values, size=SQL_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def select_ids(cursor, table, key_tuples):
+    """{key tuple: id} for the rows of a lookup table that already exist."""
+    id_column, key_columns = LOOKUP_TABLES[table]
+    found = {}
+    row_placeholder = f"({', '.join('?' * len(key_columns))})"
+    for chunk in chunked(list(key_tuples)):
+        cursor.execute(
+            f"SELECT {id_column}, {', '.join(key_columns)} FROM {table} "
+            f"WHERE ({', '.join(key_columns)}) IN (VALUES {', '.join([row_placeholder] * len(chunk))})",
+            [value for key in chunk for value in key],
+        )
+        found.update({tuple(row[1:]): row[0] for row in cursor.fetchall()})
+    return found
+
+def resolve_ids(cursor, table, rows):
+    """Map every key of `rows` ({key tuple: {column: value}}) to its id in a lookup table.
+
+    One lookup for the existing rows, one executemany for the missing ones and one lookup
+    for their new ids, however many rows there are. Returns ({key: id}, set of keys that already existed).
+    """
+    existing = select_ids(cursor, table, rows)
+    missing = [key for key in rows if key not in existing]
+    if missing:
+        columns = list(rows[missing[0]])
+        cursor.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [tuple(rows[key][column] for column in columns) for key in missing],
+        )
+    ids = dict(existing)
+    ids.update(select_ids(cursor, table, missing))
+    return ids, set(existing)
+
+def actor_values(actor):
+    profile_path = f"{IMAGE_BASE_URL}{actor['profile_path']}" if actor.get("profile_path") else None
+    return {"name": actor.get("name"), "gender": actor.get("gender", 0), "popularity": actor.get("popularity", 0.0),
+            "profile_path": profile_path, "biography": actor.get("biography")}
+
+def write_movies(cursor, movies):
+    """Write a batch of fetched movies and all their related data with set-based statements.
+
+    Entities are de-duplicated in memory first, so each table is touched by a fixed number of
+    statements per batch instead of a SELECT and an INSERT per genre/keyword/actor/...
+    """
+    movies = list({movie["details"]["id"]: movie for movie in movies}.values())
+
+    # Movies: upsert, so an existing row is updated in place (and the search index triggers see an UPDATE)
+    update_columns = ", ".join(f"{column} = excluded.{column}" for column in MOVIE_COLUMNS if column != "id")
+    cursor.executemany(
+        f"INSERT INTO movies ({', '.join(MOVIE_COLUMNS)}) VALUES ({', '.join('?' * len(MOVIE_COLUMNS))}) "
+        f"ON CONFLICT(id) DO UPDATE SET {update_columns}",
+        [movie_row(movie) for movie in movies],
+    )
+
+    # Reviews: compressed upsert, or no row at all for movies without any
+    reviews = [review_store.review_row(movie["details"]["id"], movie["reviews"]) for movie in movies]
+    cursor.executemany(
+        "INSERT INTO movie_reviews (movie_id, body, reviews_hash) VALUES (?, ?, ?) "
+        "ON CONFLICT(movie_id) DO UPDATE SET body = excluded.body, reviews_hash = excluded.reviews_hash "
+        "WHERE reviews_hash != excluded.reviews_hash",
+        [row for row in reviews if row is not None],
+    )
+    cursor.executemany("DELETE FROM movie_reviews WHERE movie_id = ?",
+                       [(movie["details"]["id"],) for movie, row in zip(movies, reviews) if row is None])
+
+    # Gather every lookup entity of the batch, keyed the way the toolkit matched them
+    entities = {table: {} for table in LOOKUP_TABLES}
+    for movie in movies:
+        details = movie["details"]
+        for genre in details.get("genres", []):
+            entities["genres"][(genre["name"],)] = {"genre_name": genre["name"]}
+        for country in details.get("production_countries", []):
+            key = (country["name"], country["iso_3166_1"])
+            entities["production_countries"][key] = {"country_name": key[0], "iso_code": key[1]}
+        for language in details.get("spoken_languages", []):
+            key = (language["name"], language["iso_639_1"])
+            entities["spoken_languages"][key] = {"language_name": key[0], "iso_code": key[1]}
+        for keyword in movie["keywords"]:
+            entities["keywords"][(keyword.get("name"),)] = {"keyword_name": keyword.get("name")}
+        for actor in movie["cast"]:
+            entities["cast"][(actor.get("name"),)] = actor_values(actor)
+            character_name = actor.get("character", "Unknown")
+            entities["characters"][(character_name,)] = {"name": character_name}
+
+    ids = {}
+    for table, rows in entities.items():
+        ids[table], existed = resolve_ids(cursor, table, rows)
+        if table == "cast" and existed:
+            # Update existing actor records if we have more information
+            cursor.executemany("""
+                UPDATE cast SET
+                    gender = COALESCE(?, gender),
+                    popularity = COALESCE(?, popularity),
+                    profile_path = COALESCE(?, profile_path),
+                    biography = COALESCE(?, biography)
+                WHERE actor_id = ?
+            """, [(rows[key]["gender"], rows[key]["popularity"], rows[key]["profile_path"], rows[key]["biography"], ids["cast"][key])
+                  for key in existed])
+
+    # Join tables
+    links = {"movie_genre": [], "movie_production_countries": [], "movie_spoken_languages": [], "movie_keywords": [], "movies_cast": []}
+    for movie in movies:
+        details = movie["details"]
+        movie_id = details["id"]
+        links["movie_genre"] += [(movie_id, ids["genres"][(genre["name"],)]) for genre in details.get("genres", [])]
+        links["movie_production_countries"] += [(movie_id, ids["production_countries"][(country["name"], country["iso_3166_1"])])
+                                                for country in details.get("production_countries", [])]
+        links["movie_spoken_languages"] += [(movie_id, ids["spoken_languages"][(language["name"], language["iso_639_1"])])
+                                            for language in details.get("spoken_languages", [])]
+        links["movie_keywords"] += [(movie_id, ids["keywords"][(keyword.get("name"),)]) for keyword in movie["keywords"]]
+        links["movies_cast"] += [(movie_id, ids["cast"][(actor.get("name"),)], ids["characters"][(actor.get("character", "Unknown"),)])
+                                 for actor in movie["cast"]]
+
+    join_columns = {
+        "movie_genre": "(movie_id, genre_id)",
+        "movie_production_countries": "(movie_id, country_id)",
+        "movie_spoken_languages": "(movie_id, language_id)",
+        "movie_keywords": "(movie_id, keyword_id)",
+        "movies_cast": "(movie_id, actor_id, character_id)",
+    }
+    for table, rows in links.items():
+        if rows:
+            placeholders = ", ".join("?" * len(rows[0]))
+            cursor.executemany(f"INSERT INTO {table} {join_columns[table]} VALUES ({placeholders}) ON CONFLICT DO NOTHING", rows)
+
+class BatchWriter:
+    """Buffers fetched movies and writes them `batch_size` at a time, one transaction per batch."""
+
+    def __init__(self, conn, batch_size=DEFAULT_BATCH_SIZE):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.pending = []
+        self.written = 0
+
+    def add(self, movie):
+        self.pending.append(movie)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        with self.conn:  # Commits the whole batch, or rolls it back on error
+            write_movies(self.conn.cursor(), self.pending)
+        self.written += len(self.pending)
+        print(f"  Wrote batch of {len(self.pending)} movies ({self.written} total)")
+        self.pending = []
+
+def existing_movies(cursor, movie_ids):
+    """{id: COMPARED_COLUMNS values + reviews hash} for the given ids that are already stored."""
+    if not movie_ids:
+        return {}
+    placeholders = ','.join('?' * len(movie_ids))
+    cursor.execute(f"SELECT id, {', '.join(COMPARED_COLUMNS)}, "
+                   f"(SELECT reviews_hash FROM movie_reviews WHERE movie_id = movies.id) "
+                   f"FROM movies WHERE id IN ({placeholders})", list(movie_ids))
+    return {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+
+# === Pipeline === #
+async def fetch_if_changed(client, movie_id, stored):
+    """Fetch a movie; media is only fetched when it is new or its details/reviews changed.
+
+    Returns (status, movie) where status is 'new', 'updated', 'unchanged' or 'failed'.
+    """
+    details, reviews = await asyncio.gather(fetch_movie_details(client, movie_id), get_movie_reviews(client, movie_id))
+    if not details:
+        return "failed", {"id": movie_id}
+
+    movie = {"details": details, "reviews": reviews}
+    if stored is not None and stored == comparable_values(details, reviews):
+        return "unchanged", movie
+
+    movie.update(await fetch_movie_media(client, movie_id))
+    return ("new" if stored is None else "updated"), movie
+
+def describe(movie):
+    details = movie.get("details") or {}
+    release_year = details["release_date"][:4] if details.get("release_date") else 'N/A'
+    return f"{details.get('title', '?')} ({release_year}) [ID: {details.get('id', movie.get('id'))}]"
+
+async def ingest_movies(client, writer, movie_ids, counts):
+    """Fetch a list of movies concurrently and hand new/changed ones to the batch writer as they arrive."""
+    stored = existing_movies(writer.conn.cursor(), movie_ids)
+    tasks = [fetch_if_changed(client, movie_id, stored.get(movie_id)) for movie_id in movie_ids]
+
+    for next_done in asyncio.as_completed(tasks):
+        status, movie = await next_done
+        counts[status] += 1
+        if status in ("new", "updated"):
+            writer.add(movie)
+            print(f"{'✓ Added new movie' if status == 'new' else '↻ Updated existing movie'}: {describe(movie)}")
+        elif status == "unchanged":
+            print(f"• Movie already exists (no changes): {describe(movie)}")
+        else:
+            print(f"⚠ Failed to fetch details for movie ID {movie['id']}")
+
+async def ingest_trending(api_key, db_path=DEFAULT_DB_PATH, mode="all", max_pages=MAX_TRENDING_PAGES,
+                          batch_size=DEFAULT_BATCH_SIZE, **client_options):
+    """Async counterpart of the toolkit's fetch_trending_movies_enhanced(mode).
+
+    mode: 'all' processes every trending page (up to max_pages), 'first' the first movie, 'random' one random movie.
+    Returns the summary counts.
+    """
+    counts = {"new": 0, "updated": 0, "unchanged": 0, "failed": 0}
+    conn = connect(db_path)
+    writer = BatchWriter(conn, batch_size)
+    print(f"Starting to fetch trending movies in {mode} mode...\n")
+
+    try:
+        async with TMDBClient(api_key, **client_options) as client:
+            first_page = await fetch_trending_page(client, 1)
+            if not first_page:
+                return counts
+            total_pages = min(first_page["total_pages"], max_pages, MAX_TRENDING_PAGES)
+
+            if mode in ("first", "random"):
+                movies = first_page["results"]
+                chosen = movies[0] if mode == "first" else random.choice(movies)
+                await ingest_movies(client, writer, [chosen["id"]], counts)
+                return counts
+
+            # Listing pages are cheap, so fetch the next one while the current one is being ingested
+            page_data = first_page
+            for page in range(1, total_pages + 1):
+                print(f"\nProcessing page {page}/{total_pages}...")
+                next_page = asyncio.ensure_future(fetch_trending_page(client, page + 1)) if page < total_pages else None
+                await ingest_movies(client, writer, [movie["id"] for movie in page_data["results"]], counts)
+                if next_page is None:
+                    break
+                page_data = await next_page
+                if not page_data:
+                    break
+
+            print(f"\nTMDB requests made: {client.requests_made}")
+    finally:
+        writer.flush()
+        conn.close()
+        print("\n=== Summary ===")
+        print(f"New movies added: {counts['new']}")
+        print(f"Existing movies updated: {counts['updated']}")
+        print(f"Existing movies unchanged: {counts['unchanged']}")
+        print(f"Failed: {counts['failed']}")
+
+    return counts
+
+async def ingest_specific_movies(api_key, movie_ids, db_path=DEFAULT_DB_PATH, batch_size=DEFAULT_BATCH_SIZE, **client_options):
+    """Fetch and store specific TMDB movie ids (new ones are added, changed ones updated)."""
+    counts = {"new": 0, "updated": 0, "unchanged": 0, "failed": 0}
+    conn = connect(db_path)
+    writer = BatchWriter(conn, batch_size)
+    try:
+        async with TMDBClient(api_key, **client_options) as client:
+            await ingest_movies(client, writer, list(movie_ids), counts)
+    finally:
+        writer.flush()
+        conn.close()
+    return counts
+
+# === Command Line === #
+def main():
+    parser = argparse.ArgumentParser(description="Import trending movies from TMDB into the CineMind database.")
+    parser.add_argument("--mode", choices=("all", "first", "random"), default="all")
+    parser.add_argument("--max-pages", type=int, default=MAX_TRENDING_PAGES)
+    parser.add_argument("--movie", type=int, action="append", help="Import specific TMDB movie ids instead of trending")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Movies written per transaction")
+    parser.add_argument("--rps", type=float, default=DEFAULT_REQUESTS_PER_SECOND, help="Maximum requests per second")
+    parser.add_argument("--base-url", default=BASE_API_URL, help="TMDB API base URL (e.g. a local fake server)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    api_key = os.getenv("TMDB_API_KEY")
+    if not api_key:
+        raise EnvironmentError("Failed to load TMDB_API_KEY from .env file")
+
+    client_options = {"base_url": args.base_url, "concurrency": args.concurrency, "requests_per_second": args.rps}
+    if args.movie:
+        asyncio.run(ingest_specific_movies(api_key, args.movie, db_path=args.db, batch_size=args.batch_size, **client_options))
+    else:
+        asyncio.run(ingest_trending(api_key, db_path=args.db, mode=args.mode, max_pages=args.max_pages,
+                                    batch_size=args.batch_size, **client_options))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# ============================== #
+# CineMind Sentiment Tests       #
+# On-demand generation limits    #
+# ============================== #
+
+# Single-flight coalescing, load shedding, deadlines and streaming of /movies/<id>/sentiment,
+# driven by concurrent requests against a slow fake Gemini client.
+#
+# Usage (from backend, after `pip install -r requirements-dev.txt` in the repository root):
+#   python -m pytest tests
+
+# === Imports === #
+import importlib
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend/app to the path for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+
+import sentiment
+
+# === Fake Client === #
+class FakeClient:
+    """Stands in for the Gemini client: every call takes `delay` seconds and streams its answer in
+    `chunks` pieces. Counts the calls it receives, per prompt.
+    """
+
+    def __init__(self, delay=0.5, chunks=4):
+        self.delay = delay
+        self.chunks = chunks
+        self.calls = []
+        self.models = self  # Mirrors client.models.generate_content_stream(...)
+        self._lock = threading.Lock()
+
+    def generate_content_stream(self, model, contents):
+        with self._lock:
+            self.calls.append(contents)
+        for index in range(self.chunks):
+            time.sleep(self.delay / self.chunks)
+            yield SimpleNamespace(text=f"part {index} ")
+
+def run_concurrently(function, arguments):
+    """Call `function` with each argument on its own thread, all at once; returns the results in order."""
+    results = [None] * len(arguments)
+    barrier = threading.Barrier(len(arguments))
+
+    def run(index, argument):
+        barrier.wait()
+        results[index] = function(argument)
+
+    threads = [threading.Thread(target=run, args=(index, argument)) for index, argument in enumerate(arguments)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+# === Summary Generator === #
+def fake_generate(client, reviews):
+    return lambda: sentiment.summarize_stream(client, reviews)
+
+def test_concurrent_submits_share_one_call():
+    client = FakeClient()
+    generator = sentiment.SummaryGenerator(max_generating=2, max_queued=0)
+    deadline = time.monotonic() + 5
+
+    flights = run_concurrently(lambda _: generator.submit('movie', fake_generate(client, 'reviews'), deadline), range(10))
+
+    assert len({id(flight) for flight in flights}) == 1
+    assert {flight.result(deadline) for flight in flights} == {'part 0 part 1 part 2 part 3'}
+    assert len(client.calls) == 1
+    assert generator.snapshot()['joined'] == 9
+
+def test_submits_beyond_the_limits_are_shed():
+    client = FakeClient()
+    generator = sentiment.SummaryGenerator(max_generating=1, max_queued=1)
+    deadline = time.monotonic() + 5
+
+    generator.submit(1, fake_generate(client, 'one'), deadline)
+    generator.submit(2, fake_generate(client, 'two'), deadline)
+    with pytest.raises(sentiment.Overloaded):
+        generator.submit(3, fake_generate(client, 'three'), deadline)
+    assert generator.snapshot()['shed'] == 1
+
+def test_waiting_past_the_deadline_raises():
+    client = FakeClient(delay=0.5)
+    generator = sentiment.SummaryGenerator()
+
+    flight = generator.submit('movie', fake_generate(client, 'reviews'), time.monotonic() + 5)
+    with pytest.raises(sentiment.DeadlineExceeded):
+        flight.result(time.monotonic() + 0.05)
+    assert flight.result(time.monotonic() + 5) == 'part 0 part 1 part 2 part 3'  # The call carried on
+
+def test_queued_calls_nobody_waits_for_are_dropped():
+    client = FakeClient(delay=0.3)
+    generator = sentiment.SummaryGenerator(max_generating=1, max_queued=1)
+
+    running = generator.submit(1, fake_generate(client, 'one'), time.monotonic() + 5)
+    expired = generator.submit(2, fake_generate(client, 'two'), time.monotonic() + 0.05)  # Over before a slot frees up
+
+    running.result(time.monotonic() + 5)
+    with pytest.raises(sentiment.DeadlineExceeded):
+        expired.result(time.monotonic() + 5)
+    assert client.calls == [sentiment.build_prompt('one')]
+    assert generator.snapshot()['expired'] == 1
+
+# === Endpoint === #
+@pytest.fixture(scope='module')
+def app_module(tmp_path_factory):
+    """The app against a fresh database holding three movies with reviews."""
+    db_path = tmp_path_factory.mktemp('sentiment') / 'cinemind.db'
+    os.environ['DATABASE_URL'] = f"sqlite:///{db_path}"  # The app reads it at import time
+    os.environ['SENTIMENT_ON_DEMAND'] = '1'
+    module = importlib.import_module('app')
+
+    with module.app.app_context():
+        module.db.create_all()
+        for movie_id in (1, 2, 3):
+            module.db.session.add(module.Movie(id=movie_id, title=f'Movie {movie_id}'))
+            module.db.session.flush()
+            _, body, content_hash = module.review_store.review_row(movie_id, f'Reviews of movie {movie_id}')
+            module.db.session.add(module.MovieReview(movie_id=movie_id, body=body, reviews_hash=content_hash))
+        module.db.session.commit()
+    return module
+
+@pytest.fixture
+def client(app_module, monkeypatch):
+    """A fresh fake Gemini client, generator and summary cache for each test, with no stored summaries."""
+    fake = FakeClient()
+    monkeypatch.setattr(app_module, 'gemini_client', lambda: fake)
+    monkeypatch.setattr(app_module, 'sentiment_cache', sentiment.SummaryCache())
+    monkeypatch.setattr(app_module, 'summary_generator', sentiment.SummaryGenerator(max_generating=2, max_queued=1))
+    monkeypatch.setitem(app_module.app.config, 'SENTIMENT_DEADLINE', 5.0)
+    with app_module.app.app_context():
+        app_module.SentimentSummary.query.delete()
+        app_module.db.session.commit()
+    return fake
+
+def get_sentiment(app_module, movie_id, query=''):
+    response = app_module.app.test_client().get(f'/movies/{movie_id}/sentiment{query}')
+    return response.status_code, response.get_data(as_text=True)
+
+def test_concurrent_requests_make_one_call_per_movie(app_module, client):
+    results = run_concurrently(lambda movie_id: get_sentiment(app_module, movie_id), [1, 2] * 8)
+
+    assert {status for status, _ in results} == {200}
+    assert sorted(client.calls) == [sentiment.build_prompt('Reviews of movie 1'), sentiment.build_prompt('Reviews of movie 2')]
+
+    # Later requests are answered from the stored summary
+    assert get_sentiment(app_module, 1)[0] == 200
+    assert len(client.calls) == 2
+
+def test_requests_beyond_the_limits_get_503(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module, 'summary_generator', sentiment.SummaryGenerator(max_generating=1, max_queued=1))
+
+    statuses = sorted(status for status, _ in run_concurrently(lambda movie_id: get_sentiment(app_module, movie_id), [1, 2, 3]))
+
+    assert statuses == [200, 200, 503]
+    assert len(client.calls) == 2
+
+def test_requests_past_the_deadline_get_504(app_module, client):
+    app_module.app.config['SENTIMENT_DEADLINE'] = 0.1
+
+    status, _ = get_sentiment(app_module, 1)
+    assert status == 504
+
+    # The call carried on and stored its summary
+    app_module.app.config['SENTIMENT_DEADLINE'] = 5.0
+    time.sleep(client.delay)
+    assert get_sentiment(app_module, 1)[0] == 200
+    assert len(client.calls) == 1
+
+def test_streamed_summary_arrives_in_chunks(app_module, client):
+    results = run_concurrently(lambda movie_id: get_sentiment(app_module, movie_id, '?stream=1'), [1, 1])
+
+    for status, body in results:
+        assert status == 200
+        assert body.count('event: chunk') == client.chunks
+        assert 'event: done' in body and 'part 0 part 1 part 2 part 3' in body
+    assert len(client.calls) == 1
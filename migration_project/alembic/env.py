@@ -29,6 +29,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = db.metadata
 
+# Tables managed by hand-written migrations rather than the models
+# (the FTS5 search index and its shadow tables); autogenerate should leave them alone
+UNMANAGED_TABLE_PREFIXES = ("movies_fts",)
+
+
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return not name.startswith(UNMANAGED_TABLE_PREFIXES)
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -53,6 +63,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -80,7 +91,8 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
-            render_as_batch = True # SQLite support - enables ALTER TABLE operations
+            render_as_batch = True, # SQLite support - enables ALTER TABLE operations
+            include_name=include_name,
         )
 
         with context.begin_transaction():
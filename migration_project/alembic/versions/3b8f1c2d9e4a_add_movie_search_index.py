@@ -0,0 +1,104 @@
+"""Add movie full-text search index
+
+Revision ID: 3b8f1c2d9e4a
+Revises: 166c10fc379d
+Create Date: 2026-10-18 10:12:41.228193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8f1c2d9e4a'
+down_revision: Union[str, None] = '166c10fc379d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Rebuilds the index rows of the movies in `movie_ids` (an SQL list or subquery) from movies + their keyword names.
+# Deleting first keeps the triggers safe for the REPLACE INTO statements used by the toolkit.
+def refresh_rows_sql(movie_ids):
+    return f"""
+        DELETE FROM movies_fts WHERE rowid IN ({movie_ids});
+        INSERT INTO movies_fts (rowid, title, original_title, overview, tagline, keywords)
+        SELECT m.id, m.title, m.original_title, m.overview, m.tagline,
+               (SELECT group_concat(k.keyword_name, ' ')
+                FROM movie_keywords mk JOIN keywords k ON k.keyword_id = mk.keyword_id
+                WHERE mk.movie_id = m.id)
+        FROM movies m WHERE m.id IN ({movie_ids});
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # remove_diacritics lets "amelie" match "Amélie"; the prefix indexes make type-ahead queries cheap
+    op.execute("""
+        CREATE VIRTUAL TABLE movies_fts USING fts5(
+            title, original_title, overview, tagline, keywords,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+
+    op.execute(f"""
+        CREATE TRIGGER movies_fts_insert AFTER INSERT ON movies BEGIN
+            {refresh_rows_sql('new.id')}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER movies_fts_update AFTER UPDATE OF title, original_title, overview, tagline ON movies BEGIN
+            {refresh_rows_sql('new.id')}
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER movies_fts_delete AFTER DELETE ON movies BEGIN
+            DELETE FROM movies_fts WHERE rowid = old.id;
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER movies_fts_keyword_insert AFTER INSERT ON movie_keywords BEGIN
+            {refresh_rows_sql('new.movie_id')}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER movies_fts_keyword_delete AFTER DELETE ON movie_keywords BEGIN
+            {refresh_rows_sql('old.movie_id')}
+        END
+    """)
+
+    # Keyword names are part of the indexed text: renaming a keyword, or repointing a movie's keyword
+    # row, refreshes every movie concerned
+    op.execute(f"""
+        CREATE TRIGGER movies_fts_keyword_update AFTER UPDATE ON movie_keywords BEGIN
+            {refresh_rows_sql('old.movie_id, new.movie_id')}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER movies_fts_keyword_rename AFTER UPDATE OF keyword_name ON keywords BEGIN
+            {refresh_rows_sql('SELECT movie_id FROM movie_keywords WHERE keyword_id = new.keyword_id')}
+        END
+    """)
+
+    # Index the movies that already exist
+    op.execute("""
+        INSERT INTO movies_fts (rowid, title, original_title, overview, tagline, keywords)
+        SELECT m.id, m.title, m.original_title, m.overview, m.tagline,
+               (SELECT group_concat(k.keyword_name, ' ')
+                FROM movie_keywords mk JOIN keywords k ON k.keyword_id = mk.keyword_id
+                WHERE mk.movie_id = m.id)
+        FROM movies m
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS movies_fts_keyword_rename")
+    op.execute("DROP TRIGGER IF EXISTS movies_fts_keyword_update")
+    op.execute("DROP TRIGGER IF EXISTS movies_fts_keyword_delete")
+    op.execute("DROP TRIGGER IF EXISTS movies_fts_keyword_insert")
+    op.execute("DROP TRIGGER IF EXISTS movies_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS movies_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS movies_fts_insert")
+    op.execute("DROP TABLE IF EXISTS movies_fts")
@@ -1,5 +1,5 @@
 import os
 
 class Config:
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///cinema_migrations.db'
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///cinema_migrations.db')  # DATABASE_URL points migrations at another database
     SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
@@ -13,16 +13,22 @@ class Cast(db.Model):
 
     characters_played = db.relationship('Characters', secondary='movies_cast', backref='actors')
 
+    __table_args__ = (db.Index('ix_cast_name', 'name'),)
+
 class Genres(db.Model):
     __tablename__ = 'genres'
     genre_id = db.Column(db.Integer, primary_key=True)
     genre_name = db.Column(db.String(255), nullable=False)
 
+    __table_args__ = (db.Index('ix_genres_genre_name', 'genre_name'),)
+
 class Keywords(db.Model):
     __tablename__ = 'keywords'
     keyword_id = db.Column(db.Integer, primary_key=True)
     keyword_name = db.Column(db.String(255), nullable=False)
 
+    __table_args__ = (db.Index('ix_keywords_keyword_name', 'keyword_name'),)
+
 class Movie(db.Model):
     __tablename__ = 'movies'
     id = db.Column(db.Integer, primary_key=True)
@@ -43,7 +49,6 @@ class Movie(db.Model):
     poster_url = db.Column(db.Text)
     backdrop_url = db.Column(db.Text)
     video_url = db.Column(db.Text)
-    reviews = db.Column(db.Text)
     keyposter_url = db.Column(db.Text)
     keyvideo_url = db.Column(db.Text)
 
@@ -54,53 +59,143 @@ class Movie(db.Model):
 
     cast_members = db.relationship('Cast', secondary='movies_cast', backref='movie_appearances')
     characters = db.relationship('Characters', secondary='movies_cast', backref='movie_appearances')
+
+    # Sort orders of /movies and /results, and the original language filter (by popularity, the default sort)
+    __table_args__ = (
+        db.Index('ix_movies_popularity', 'popularity'),
+        db.Index('ix_movies_vote_average', 'vote_average'),
+        db.Index('ix_movies_vote_count', 'vote_count'),
+        db.Index('ix_movies_runtime', 'runtime'),
+        db.Index('ix_movies_release_date', 'release_date'),
+        db.Index('ix_movies_title', 'title'),
+        db.Index('ix_movies_original_language_popularity', 'original_language', 'popularity'),
+    )
     
 
 
+class SentimentSummary(db.Model):
+    __tablename__ = 'sentiment_summaries'
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), primary_key=True)
+    reviews_hash = db.Column(db.String(64), nullable=False)
+    prompt_version = db.Column(db.String(64), nullable=False)
+    summary = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime)
+
+    movie = db.relationship('Movie', backref=db.backref('sentiment_summary', uselist=False))
+
+
+class MovieReview(db.Model):
+    __tablename__ = 'movie_reviews'
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), primary_key=True)
+    body = db.Column(db.LargeBinary, nullable=False)  # zlib-compressed UTF-8 text
+    reviews_hash = db.Column(db.String(64), nullable=False)  # sha256 of the text, as in sentiment_summaries
+
+    movie = db.relationship('Movie', backref=db.backref('review', uselist=False))
+
+
+class MovieDocument(db.Model):
+    __tablename__ = 'movie_documents'
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), primary_key=True)
+    shape = db.Column(db.String(20), primary_key=True)
+    body = db.Column(db.Text, nullable=False)
+    built_at = db.Column(db.DateTime)
+
+    movie = db.relationship('Movie', backref='documents')
+
+
+class CatalogueVersion(db.Model):
+    __tablename__ = 'catalogue_version'
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    updated_at = db.Column(db.DateTime)
+
+
+class MovieChange(db.Model):
+    __tablename__ = 'movie_changes'
+    movie_id = db.Column(db.Integer, primary_key=True)
+    sequence = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (db.Index('ix_movie_changes_sequence', 'sequence'),)
+
+
+class SimilarMovie(db.Model):
+    __tablename__ = 'similar_movies'
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True)
+    similar_id = db.Column(db.Integer, db.ForeignKey('movies.id'), nullable=False)
+    score = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (db.Index('ix_similar_movies_similar_id', 'similar_id'),)
+
+
+class SimilarityBuild(db.Model):
+    __tablename__ = 'similarity_builds'
+    id = db.Column(db.Integer, primary_key=True)
+    sequence = db.Column(db.Integer, nullable=False)
+    movies = db.Column(db.Integer, nullable=False)
+    built_at = db.Column(db.DateTime)
+
+
 # Join tables
 class MovieGenre(db.Model):
     __tablename__ = 'movie_genre'
     movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), primary_key=True)
     genre_id = db.Column(db.Integer, db.ForeignKey('genres.genre_id'), primary_key=True)
 
+    __table_args__ = (db.Index('ix_movie_genre_genre_id_movie_id', 'genre_id', 'movie_id'),)
+
 class MovieKeywords(db.Model):
     __tablename__ = 'movie_keywords'
     movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), primary_key=True)
     keyword_id = db.Column(db.Integer, db.ForeignKey('keywords.keyword_id'), primary_key=True)
 
+    __table_args__ = (db.Index('ix_movie_keywords_keyword_id_movie_id', 'keyword_id', 'movie_id'),)
+
 class ProductionCountries(db.Model):
     __tablename__ = 'production_countries'
     country_id = db.Column(db.Integer, primary_key=True)
     country_name = db.Column(db.String(255), nullable=False)
     iso_code = db.Column(db.String(10))
 
+    __table_args__ = (db.Index('ix_production_countries_country_name_iso_code', 'country_name', 'iso_code'),)
+
 class MovieProductionCountries(db.Model):
     __tablename__ = 'movie_production_countries'
     movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), primary_key=True)
     country_id = db.Column(db.Integer, db.ForeignKey('production_countries.country_id'), primary_key=True)
 
+    __table_args__ = (db.Index('ix_movie_production_countries_country_id_movie_id', 'country_id', 'movie_id'),)
+
 class SpokenLanguages(db.Model):
     __tablename__ = 'spoken_languages'
     language_id = db.Column(db.Integer, primary_key=True)
     language_name = db.Column(db.String(255), nullable=False)
     iso_code = db.Column(db.String(10))
 
+    __table_args__ = (db.Index('ix_spoken_languages_language_name_iso_code', 'language_name', 'iso_code'),)
+
 class MovieSpokenLanguages(db.Model):
     __tablename__ = 'movie_spoken_languages'
     movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), primary_key=True)
     language_id = db.Column(db.Integer, db.ForeignKey('spoken_languages.language_id'), primary_key=True)
 
+    __table_args__ = (db.Index('ix_movie_spoken_languages_language_id_movie_id', 'language_id', 'movie_id'),)
+
 class Characters(db.Model):
     __tablename__ = 'characters'
     character_id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
 
+    __table_args__ = (db.Index('ix_characters_name', 'name'),)
+
 class MovieCast(db.Model):
     __tablename__ = 'movies_cast'
     movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), primary_key=True)
     actor_id = db.Column(db.Integer, db.ForeignKey('cast.actor_id'), primary_key=True)
     character_id = db.Column(db.Integer, db.ForeignKey('characters.character_id'), primary_key=True)
 
+    __table_args__ = (db.Index('ix_movies_cast_actor_id_movie_id', 'actor_id', 'movie_id'),)
+
     movie = db.relationship('Movie', foreign_keys=[movie_id], overlaps="cast_members,characters,movie_appearances")
     actor = db.relationship('Cast', foreign_keys=[actor_id], overlaps="characters_played,movie_appearances")
     character = db.relationship('Characters', foreign_keys=[character_id], overlaps="actors,movie_appearances")